@@ -0,0 +1,54 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional
+
+# Türkçe noktalı/noktasız i harflerinin tümü "i" kabul edilir. Diğer harflerin
+# büyük/küçük ve aksan farkları (ş/s, ç/c, ğ/g, ö/o, ü/u) ayrıca kaldırılır.
+_TURKCE_I = str.maketrans({'İ': 'i', 'I': 'i', 'ı': 'i'})
+_KELIME = re.compile(r'[^\W_]+')
+
+# Arama kutusunda yazma durduktan sonra sorgunun gönderileceği gecikme
+ARAMA_GECIKMESI_MS = 250
+
+
+def turkce_katla(metin: str) -> str:
+    """
+    Metni aramada karşılaştırılacak biçime getirir.
+
+    FTS5 tetikleyicilerindeki katlama (ı/İ -> i) ve unicode61 ayırıcısının
+    remove_diacritics 2 davranışı ile aynı sonucu verir.
+    """
+    if metin.isascii():
+        return metin.lower()
+    metin = metin.translate(_TURKCE_I).lower()
+    ayrik = unicodedata.normalize('NFKD', metin)
+    return ''.join(harf for harf in ayrik if not unicodedata.combining(harf))
+
+
+# Kelimeler çok tekrarlandığı için katlanmış halleri önbellekte tutulur
+_kelime_katla = lru_cache(maxsize=65536)(turkce_katla)
+
+
+def kelimelere_ayir(metin: str) -> List[str]:
+    return [_kelime_katla(kelime) for kelime in _KELIME.findall(metin)]
+
+
+def fts_sorgusu(metin: str) -> Optional[str]:
+    """
+    Kullanıcının yazdığı metni FTS5 MATCH ifadesine çevirir.
+
+    Her kelime önek olarak aranır ve tüm kelimelerin eşleşmesi gerekir.
+    Aranacak kelime yoksa None döner.
+    """
+    kelimeler = kelimelere_ayir(metin)
+    if not kelimeler:
+        return None
+    return ' '.join(f'"{kelime}"*' for kelime in kelimeler)
+
+
+def fts_katlama_ifadesi(sutun: str) -> str:
+    """
+    Tetikleyicilerde sütun değerini FTS tablosuna yazmadan önce katlayan SQL ifadesi.
+    """
+    return f"replace(replace({sutun}, 'ı', 'i'), 'İ', 'i')"
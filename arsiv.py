@@ -0,0 +1,246 @@
+import glob
+import os
+import re
+import sqlite3
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Arşiv dosyaları ana veritabanının yanında yıl başına bir dosyadır:
+# siparis_sistemi.db -> siparis_sistemi_arsiv_2023.db. Her dosya bağlantılara
+# arsiv_2023 şema adıyla eklenir (ATTACH).
+ARSIV_EKI = "_arsiv_"
+
+# SQLite bir bağlantıya en fazla 10 dosya ekleyebilir (SQLITE_MAX_ATTACHED) ve her
+# bağlantı tüm arşivleri ekler. Bu yüzden en yeni YILLIK_ARSIV_SINIRI yıl kendi
+# dosyasında tutulur; daha eski yıllar tek bir birikimli dosyada (…_arsiv_eski.db)
+# birleştirilir. Silinemeyen boş bir yıllık dosyayla birlikte de sınırın altında kalınır.
+YILLIK_ARSIV_SINIRI = 8
+ESKI_ARSIV = "eski"
+
+# Arşivde yalnızca siparişler ve kalemleri tutulur. Müşteri ve ürünler ana dosyada
+# kaldığından yabancı anahtar tanımlanmaz; indeksler ana dosyadakilerle aynı adı taşır.
+ARSIV_TABLOLARI: List[str] = [
+    '''
+    CREATE TABLE IF NOT EXISTS siparisler (
+        id INTEGER PRIMARY KEY,
+        siparis_no TEXT NOT NULL UNIQUE,
+        musteri_id INTEGER NOT NULL,
+        siparis_tarihi DATE NOT NULL,
+        teslim_tarihi DATE NOT NULL,
+        toplam_tutar DECIMAL(10,2) NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS siparis_detaylari (
+        id INTEGER PRIMARY KEY,
+        siparis_id INTEGER NOT NULL,
+        urun_id INTEGER NOT NULL,
+        adet INTEGER NOT NULL,
+        birim_fiyat DECIMAL(10,2) NOT NULL,
+        iskonto INTEGER NOT NULL DEFAULT 0,
+        toplam_fiyat DECIMAL(10,2) NOT NULL
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_siparisler_musteri_tarih ON siparisler (musteri_id, siparis_tarihi)",
+    "CREATE INDEX IF NOT EXISTS idx_siparisler_tarih ON siparisler (siparis_tarihi)",
+    "CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_siparis ON siparis_detaylari (siparis_id)",
+    # Ürün silinirken arşivde satılmış mı diye bakılır
+    "CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_urun ON siparis_detaylari (urun_id)",
+]
+
+# Sipariş ve kalemlerinin tek satırda birleşimi; her şema için ayrı birleştirilip
+# UNION ALL ile eklenir. Böylece WHERE koşulları her kola indirilir ve her dosyada
+# kendi indeksleriyle çözülür.
+_SATIR_SECIMI = '''
+    SELECT s.id, s.siparis_no, s.musteri_id, s.siparis_tarihi, s.teslim_tarihi, s.toplam_tutar,
+           sd.id AS detay_id, sd.urun_id, sd.adet, sd.birim_fiyat, sd.iskonto, sd.toplam_fiyat
+    FROM {sema}.siparisler s
+    LEFT JOIN {sema}.siparis_detaylari sd ON sd.siparis_id = s.id
+'''
+
+
+def arsiv_dosyasi(db_file: str, yil: Union[int, str]) -> str:
+    kok, uzanti = os.path.splitext(db_file)
+    return f"{kok}{ARSIV_EKI}{yil}{uzanti or '.db'}"
+
+
+def arsiv_semasi(yil: Union[int, str]) -> str:
+    return f"arsiv_{yil}"
+
+
+ESKI_SEMA = arsiv_semasi(ESKI_ARSIV)
+
+
+def arsivleri_sirala(arsivler: Dict[str, str]) -> Dict[str, str]:
+    """
+    Arşivleri yıllıklar yeniden eskiye, birikimli eski arşiv en sonda olacak şekilde sıralar.
+    """
+    return dict(sorted(arsivler.items(), key=lambda kayit: (kayit[0] != ESKI_SEMA, kayit[0]), reverse=True))
+
+
+def yillik_arsiv_yillari(arsivler: Dict[str, str]) -> List[int]:
+    """
+    Yıllık arşivlerin yıllarını yeniden eskiye döndürür; eski arşiv dahil edilmez.
+    """
+    return sorted((int(sema[len(arsiv_semasi("")):]) for sema in arsivler if sema != ESKI_SEMA), reverse=True)
+
+
+def arsivleri_bul(db_file: str) -> Dict[str, str]:
+    """
+    Veritabanının yanındaki arşiv dosyalarını şema adı -> dosya yolu olarak döndürür (bkz. arsivleri_sirala).
+    """
+    kok, uzanti = os.path.splitext(db_file)
+    desen = re.compile(re.escape(ARSIV_EKI) + rf"(\d{{4}}|{ESKI_ARSIV})" + re.escape(uzanti or '.db') + "$")
+    arsivler = {}
+    for yol in glob.glob(f"{glob.escape(kok)}{ARSIV_EKI}*"):
+        eslesme = desen.search(yol)
+        if eslesme:
+            arsivler[arsiv_semasi(eslesme.group(1))] = yol
+    return arsivleri_sirala(arsivler)
+
+
+def arsiv_olustur(yol: str) -> None:
+    """
+    Arşiv dosyasını ve tablolarını oluşturur; dosya varsa eksik tabloları tamamlar.
+    """
+    conn = sqlite3.connect(yol)
+    try:
+        for tanim in ARSIV_TABLOLARI:
+            conn.execute(tanim)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def arsivleri_bagla(conn: sqlite3.Connection, arsivler: Dict[str, str]) -> None:
+    """
+    Bağlantıyı verilen arşivlerle eşitler ve tüm siparişleri kapsayan geçici görünümleri yeniden kurar.
+
+    Önceden bağlı arşivler ayrılıp listedekiler yeniden eklenir; eski arşivde
+    birleştirilip silinen bir yılın dosyası açık kalmaz. Ana şemadaki görünümler ekli
+    şemalara başvuramadığı için görünümler TEMP'tir ve her bağlantıda ayrı kurulur.
+    İşlem dışında çağrılmalıdır (DETACH kısıtı).
+      tum_siparisler         ana ve arşiv siparişleri
+      tum_siparis_satirlari  sipariş başına kalem satırları (kalemsiz sipariş tek boş satır)
+    """
+    conn.execute("DROP VIEW IF EXISTS temp.tum_siparisler")
+    conn.execute("DROP VIEW IF EXISTS temp.tum_siparis_satirlari")
+    for satir in conn.execute("PRAGMA database_list").fetchall():
+        if satir[1].startswith(arsiv_semasi("")):
+            conn.execute(f"DETACH DATABASE {satir[1]}")
+    for sema, yol in arsivler.items():
+        conn.execute(f"ATTACH DATABASE ? AS {sema}", (yol,))
+    semalar = ['main', *arsivler]
+    conn.execute("CREATE TEMP VIEW tum_siparisler AS " +
+                 " UNION ALL ".join(f"SELECT * FROM {sema}.siparisler" for sema in semalar))
+    conn.execute("CREATE TEMP VIEW tum_siparis_satirlari AS " +
+                 " UNION ALL ".join(_SATIR_SECIMI.format(sema=sema) for sema in semalar))
+
+
+def gecmis_kaynaklari(arsivler: Dict[str, str]) -> Tuple[str, str]:
+    """
+    Geçmiş sorgularının okuyacağı sipariş ve sipariş satırı kaynaklarını döndürür.
+    Arşiv yoksa UNION ALL görünümleri yerine doğrudan ana tablolar okunur.
+    """
+    if arsivler:
+        return "tum_siparisler", "tum_siparis_satirlari"
+    return "main.siparisler", f"({_SATIR_SECIMI.format(sema='main')})"
+
+
+def _eski_arsivi_hazirla(db) -> str:
+    if ESKI_SEMA not in db.arsivler:
+        yol = arsiv_dosyasi(db.db_file, ESKI_ARSIV)
+        arsiv_olustur(yol)
+        db.arsiv_ekle(ESKI_SEMA, yol)
+    return ESKI_SEMA
+
+
+def yillik_arsivleri_birlestir(db, kalacak: int = YILLIK_ARSIV_SINIRI) -> List[int]:
+    """
+    En yeni `kalacak` yıl dışındaki yıllık arşivleri eski arşive taşır, dosyalarını
+    siler ve birleştirilen yılları döndürür.
+
+    Her yıl kendi yazma işleminde taşınır; yarıda kalan birleştirme yeniden
+    çalıştırıldığında eski arşive zaten yazılmış siparişler atlanır.
+    """
+    birlesenler = yillik_arsiv_yillari(db.arsivler)[kalacak:]
+    if not birlesenler:
+        return []
+    eski = _eski_arsivi_hazirla(db)
+    for yil in birlesenler:
+        sema = arsiv_semasi(yil)
+        with db.transaction(yazma=True) as conn:
+            for tablo in ('siparis_detaylari', 'siparisler'):
+                conn.execute(f"INSERT OR IGNORE INTO {eski}.{tablo} SELECT * FROM {sema}.{tablo}")
+                conn.execute(f"DELETE FROM {sema}.{tablo}")
+        yol = db.arsiv_cikar(sema)
+        try:
+            os.remove(yol)
+        except OSError:
+            # Dosya başka bir süreçte açıksa (Windows) silinemez; boş kalan dosya
+            # bir sonraki arşivlemede yeniden birleştirilip silinir
+            pass
+    return birlesenler
+
+
+def _hedef_arsiv(db, yil: int) -> str:
+    """
+    yil'in siparişlerinin taşınacağı arşiv şemasını döndürür; gerekirse dosyasını oluşturur.
+
+    Yıllık dosya yoksa ve sınır doluysa, tüm yıllıklardan eski bir yıl doğrudan eski
+    arşive yazılır; daha yeni bir yıl için en eski yıllık birleştirilerek yer açılır.
+    """
+    sema = arsiv_semasi(yil)
+    if sema in db.arsivler:
+        return sema
+    yillar = yillik_arsiv_yillari(db.arsivler)
+    if len(yillar) >= YILLIK_ARSIV_SINIRI:
+        if yil < yillar[-1]:
+            return _eski_arsivi_hazirla(db)
+        yillik_arsivleri_birlestir(db, YILLIK_ARSIV_SINIRI - 1)
+    yol = arsiv_dosyasi(db.db_file, yil)
+    arsiv_olustur(yol)
+    db.arsiv_ekle(sema, yol)
+    return sema
+
+
+def siparisleri_arsivle(db, sinir_tarihi: str,
+                        ilerleme: Optional[Callable[[int, int], None]] = None) -> Dict[int, int]:
+    """
+    sinir_tarihi'nden (YYYY-MM-DD, hariç) eski siparişleri yıllarına göre arşiv dosyalarına
+    taşır ve yıl -> taşınan sipariş sayısı döndürür. Yıllık dosya sayısı
+    YILLIK_ARSIV_SINIRI'nı aşmaz (bkz. _hedef_arsiv).
+
+    Her yıl kendi yazma işleminde taşınır. Özet tabloları ömür boyu toplamlardır;
+    taşınan siparişler özetlerden düşülmez. WAL kipinde dosyalar arası işlem atomik
+    olmadığından yarıda kalan bir taşıma aynı sınırla yeniden çalıştırılarak tamamlanır:
+    arşive zaten yazılmış siparişler atlanır. Yedek alınırken arşiv dosyaları
+    kilitli olduğundan taşıma yedeğin bitmesini bekler.
+    """
+    with db.transaction() as conn:
+        yillar = [int(satir[0]) for satir in conn.execute('''
+            SELECT DISTINCT substr(siparis_tarihi, 1, 4) FROM main.siparisler
+            WHERE siparis_tarihi < ?
+            ORDER BY 1
+        ''', (sinir_tarihi,))]
+
+    # Önceki çalıştırmalardan silinemeyen ya da sınırı aşan yıllıklar önce birleştirilir
+    yillik_arsivleri_birlestir(db)
+    tasinanlar = {}
+    for yil in yillar:
+        sema = _hedef_arsiv(db, yil)
+        aralik = (f"{yil}-01-01", min(sinir_tarihi, f"{yil + 1}-01-01"))
+        kosul = "siparis_tarihi >= ? AND siparis_tarihi < ?"
+        with db.transaction(yazma=True) as conn:
+            conn.execute(f'''
+                INSERT OR IGNORE INTO {sema}.siparis_detaylari
+                SELECT sd.* FROM main.siparisler s
+                JOIN main.siparis_detaylari sd ON sd.siparis_id = s.id
+                WHERE s.{kosul}
+            ''', aralik)
+            conn.execute(f"INSERT OR IGNORE INTO {sema}.siparisler SELECT * FROM main.siparisler WHERE {kosul}",
+                         aralik)
+            # Kalemler yabancı anahtarla birlikte silinir
+            tasinanlar[yil] = conn.execute(f"DELETE FROM main.siparisler WHERE {kosul}", aralik).rowcount
+        if ilerleme is not None:
+            ilerleme(yil, tasinanlar[yil])
+    return tasinanlar
@@ -0,0 +1,180 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence
+
+
+class BaglantiHavuzu:
+    """
+    SQLite bağlantılarını uzun ömürlü olarak yönetir.
+
+    Havuzu oluşturan iş parçacığı (arayüz) kendine ait kalıcı bir bağlantı kullanır.
+    Diğer iş parçacıkları sınırlı sayıdaki ortak bağlantıdan birini işlem süresince ödünç alır.
+    PRAGMA ayarları her bağlantı açılırken yalnızca bir kez uygulanır.
+    hazirlayici verilirse bağlantı her ödünç verilişinde, işlem başlamadan önce
+    onunla çağrılır (ör. yeni eklenen arşivleri bağlamak için).
+    salt_okunur verilirse dosya yalnızca okuma kipinde açılır; yazma denemeleri hata verir.
+    """
+    # İptal kontrolünün kaç SQLite sanal makine adımında bir çağrılacağı
+    IPTAL_KONTROL_ADIMI = 10000
+
+    def __init__(self, db_file: str, max_baglanti: int = 4,
+                 pragmalar: Sequence[str] = (), bekleme_suresi: float = 30.0,
+                 hazirlayici: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 salt_okunur: bool = False) -> None:
+        self.db_file = db_file
+        self.max_baglanti = max_baglanti
+        self.pragmalar = list(pragmalar)
+        self.bekleme_suresi = bekleme_suresi
+        self.hazirlayici = hazirlayici
+        self.salt_okunur = salt_okunur
+
+        self._sahip_thread = threading.get_ident()
+        self._ana_baglanti: Optional[sqlite3.Connection] = None
+        self._bostaki_baglantilar: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._tum_baglantilar: List[sqlite3.Connection] = []
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+
+    def _baglanti_ac(self) -> sqlite3.Connection:
+        """
+        Yeni bir bağlantı açar ve PRAGMA ayarlarını uygular.
+        """
+        # İşlemler transaction() içinde açıkça başlatıldığı için otomatik işlem kapatılır.
+        if self.salt_okunur:
+            conn = sqlite3.connect(f"{Path(self.db_file).absolute().as_uri()}?mode=ro", uri=True,
+                                   isolation_level=None, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        for pragma in self.pragmalar:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+    def _baglanti_al(self) -> sqlite3.Connection:
+        """
+        Çağıran iş parçacığı için bir bağlantı döndürür.
+        İş parçacığına bir iptal kontrolü tanımlıysa bağlantıya bağlanır.
+        """
+        conn = self._bos_baglanti_al()
+        if self.hazirlayici is not None:
+            try:
+                self.hazirlayici(conn)
+            except BaseException:
+                self._baglanti_birak(conn)
+                raise
+        iptal_kontrolu = getattr(self._yerel, 'iptal_kontrolu', None)
+        if iptal_kontrolu is not None:
+            # Kontrol True döndürdüğünde çalışan sorgu "interrupted" hatasıyla kesilir
+            conn.set_progress_handler(lambda: 1 if iptal_kontrolu() else 0, self.IPTAL_KONTROL_ADIMI)
+        return conn
+
+    def _bos_baglanti_al(self) -> sqlite3.Connection:
+        if threading.get_ident() == self._sahip_thread:
+            if self._ana_baglanti is None:
+                self._ana_baglanti = self._baglanti_ac()
+            return self._ana_baglanti
+
+        try:
+            return self._bostaki_baglantilar.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._kilit:
+            yeni_acilabilir = len(self._tum_baglantilar) < self.max_baglanti
+            if yeni_acilabilir:
+                conn = self._baglanti_ac()
+                self._tum_baglantilar.append(conn)
+                return conn
+
+        try:
+            return self._bostaki_baglantilar.get(timeout=self.bekleme_suresi)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Boşta veritabanı bağlantısı bulunamadı") from None
+
+    def _baglanti_birak(self, conn: sqlite3.Connection) -> None:
+        if getattr(self._yerel, 'iptal_kontrolu', None) is not None:
+            conn.set_progress_handler(None, 0)
+        if conn is not self._ana_baglanti:
+            self._bostaki_baglantilar.put(conn)
+
+    @contextmanager
+    def iptal_edilebilir(self, iptal_kontrolu: Callable[[], bool]) -> Iterator[None]:
+        """
+        Blok içinde bu iş parçacığının açtığı sorguları iptal edilebilir yapar.
+        iptal_kontrolu True döndürdüğünde çalışan sorgu kesilir.
+        """
+        self._yerel.iptal_kontrolu = iptal_kontrolu
+        try:
+            yield
+        finally:
+            self._yerel.iptal_kontrolu = None
+
+    @contextmanager
+    def baglanti(self) -> Iterator[sqlite3.Connection]:
+        """
+        İşlem başlatmadan bir bağlantı ödünç verir.
+
+        İşlem içinde çalışamayan komutlar (checkpoint, VACUUM vb.) için kullanılır.
+        Çağıran iş parçacığının açık bir işlemi varsa onun bağlantısı döndürülür.
+        """
+        if getattr(self._yerel, 'derinlik', 0):
+            yield self._yerel.baglanti
+            return
+
+        conn = self._baglanti_al()
+        try:
+            yield conn
+        finally:
+            self._baglanti_birak(conn)
+
+    @contextmanager
+    def transaction(self, yazma: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Bir işlem (transaction) açar ve bağlantıyı döndürür.
+
+        Blok hatasız biterse işlem onaylanır, hata olursa geri alınır.
+        İç içe çağrılar dıştaki işleme katılır; onay yalnızca en dışta yapılır.
+        Yazma yapacak işlemler yazma=True ile yazma kilidini baştan alır.
+        """
+        yerel = self._yerel
+        if getattr(yerel, 'derinlik', 0):
+            yerel.derinlik += 1
+            try:
+                yield yerel.baglanti
+            finally:
+                yerel.derinlik -= 1
+            return
+
+        conn = self._baglanti_al()
+        yerel.baglanti = conn
+        yerel.derinlik = 1
+        try:
+            conn.execute("BEGIN IMMEDIATE" if yazma else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            if conn.in_transaction:
+                conn.commit()
+        finally:
+            yerel.derinlik = 0
+            yerel.baglanti = None
+            self._baglanti_birak(conn)
+
+    def kapat(self) -> None:
+        """
+        Havuzdaki tüm bağlantıları kapatır.
+        """
+        with self._kilit:
+            if self._ana_baglanti is not None:
+                self._ana_baglanti.close()
+                self._ana_baglanti = None
+            for conn in self._tum_baglantilar:
+                conn.close()
+            self._tum_baglantilar.clear()
+            while not self._bostaki_baglantilar.empty():
+                self._bostaki_baglantilar.get_nowait()
@@ -0,0 +1,167 @@
+"""
+Veritabanı bakım ve toplu işlem komutları.
+
+Kullanım:
+    python bakim.py ice-aktar siparisler.csv --parca 5000
+    python bakim.py belgeler ekstre --baslangic 2025-01-01 --bitis 2025-01-31 --cikti ekstreler
+    python bakim.py belgeler siparis --musteri 12 15 --cikti formlar --isci 4
+    python bakim.py ozetler
+    python bakim.py arsivle --sinir 2024-01-01 --sikistir
+    python bakim.py yedekle --dizin yedekler --sakla 14 --tam
+    python bakim.py yedekler --dizin yedekler
+    python bakim.py geri-yukle yedekler/siparis_sistemi_20250101_120000
+"""
+import argparse
+import os
+import time
+
+from arsiv import ESKI_SEMA, arsiv_semasi, siparisleri_arsivle
+from database import Database
+from toplu_aktarim import siparisleri_ice_aktar
+from toplu_belgeler import BELGE_TURLERI, BelgeSonucu, belge_hedefleri, belgeleri_uret
+from yedekleme import YEDEKLEME_VARSAYILANLARI, yedek_al, yedegi_dogrula, yedekleri_listele, yedekten_geri_yukle
+
+
+def ice_aktar_komutu(db: Database, args: argparse.Namespace) -> None:
+    baslangic = time.perf_counter()
+    adet = siparisleri_ice_aktar(db, args.dosya, args.parca, args.ayrac)
+    sure = time.perf_counter() - baslangic
+    print(f"{adet} sipariş {sure:.1f} saniyede içe aktarıldı.")
+
+
+def belgeler_komutu(db: Database, args: argparse.Namespace) -> None:
+    hedefler = belge_hedefleri(db, args.tur, args.baslangic, args.bitis, args.musteri)
+    if not hedefler:
+        print("Üretilecek belge yok.")
+        return
+    print(f"{len(hedefler)} belge {args.isci or os.cpu_count()} süreçle üretiliyor...")
+
+    baslangic = time.perf_counter()
+    # Çıktıyı boğmamak için ilerleme yaklaşık yüzde birlik adımlarla yazılır
+    adim = max(1, len(hedefler) // 100)
+
+    def ilerleme(tamamlanan: int, toplam: int, sonuc: BelgeSonucu) -> None:
+        if tamamlanan % adim == 0 or tamamlanan == toplam:
+            sure = time.perf_counter() - baslangic
+            print(f"  {tamamlanan}/{toplam} ({tamamlanan / sure:.1f} belge/sn)", flush=True)
+
+    sonuclar = belgeleri_uret(db, args.tur, hedefler, args.cikti, args.baslangic, args.bitis,
+                              args.isci, ilerleme)
+    sure = time.perf_counter() - baslangic
+    yazilanlar = [sonuc for sonuc in sonuclar if sonuc.dosya]
+    sayfalar = sum(sonuc.sayfa for sonuc in yazilanlar)
+    print(f"{len(yazilanlar)} belge ({sayfalar} sayfa) {sure:.1f} saniyede {args.cikti} dizinine yazıldı "
+          f"({len(yazilanlar) / sure:.1f} belge/sn, {sayfalar / sure:.1f} sayfa/sn).")
+    if len(yazilanlar) < len(sonuclar):
+        print(f"{len(sonuclar) - len(yazilanlar)} hedefte yazılacak sipariş bulunamadı.")
+
+
+def ozetler_komutu(db: Database, args: argparse.Namespace) -> None:
+    baslangic = time.perf_counter()
+    duzeltmeler = db.ozetleri_yeniden_olustur()
+    sure = time.perf_counter() - baslangic
+    for tablo, adet in duzeltmeler.items():
+        print(f"  {tablo}: {adet} satır düzeltildi")
+    print(f"Özet tabloları {sure:.1f} saniyede uzlaştırıldı.")
+
+
+def arsivle_komutu(db: Database, args: argparse.Namespace) -> None:
+    baslangic = time.perf_counter()
+
+    def ilerleme(yil: int, adet: int) -> None:
+        # Yıllık dosyası olmayan eski yıllar birikimli eski arşive yazılır
+        yol = db.arsivler.get(arsiv_semasi(yil), db.arsivler.get(ESKI_SEMA))
+        print(f"  {yil}: {adet} sipariş {yol} dosyasına taşındı", flush=True)
+
+    tasinanlar = siparisleri_arsivle(db, args.sinir, ilerleme)
+    if not tasinanlar:
+        print(f"{args.sinir} tarihinden eski sipariş yok.")
+        return
+    print(f"{sum(tasinanlar.values())} sipariş {time.perf_counter() - baslangic:.1f} saniyede arşivlendi.")
+    if args.sikistir:
+        eski_boyut = os.path.getsize(db.db_file)
+        with db.havuz.baglanti() as conn:
+            conn.execute("VACUUM main")
+            # WAL kipinde dosya ancak checkpoint sonrasında küçülür
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        print(f"Veritabanı {eski_boyut / 1e6:.1f} MB -> {os.path.getsize(db.db_file) / 1e6:.1f} MB küçültüldü.")
+
+
+def yedekle_komutu(db: Database, args: argparse.Namespace) -> None:
+    sonuc = yedek_al(db.db_file, args.dizin, tam_dogrulama=args.tam, saklanacak=args.sakla)
+    print(f"Yedek {sonuc.sure:.1f} saniyede alındı ve doğrulandı: {sonuc.dizin} ({sonuc.boyut / 1e6:.1f} MB)")
+
+
+def yedekler_komutu(db: Database, args: argparse.Namespace) -> None:
+    yedekler = yedekleri_listele(db.db_file, args.dizin)
+    if not yedekler:
+        print(f"{args.dizin} dizininde yedek yok.")
+        return
+    for yedek in yedekler:
+        boyut = sum(os.path.getsize(os.path.join(yedek, ad)) for ad in os.listdir(yedek))
+        durum = "sağlam" if not yedegi_dogrula(yedek) else "BOZUK"
+        print(f"  {yedek}  {boyut / 1e6:.1f} MB  {durum}")
+
+
+def geri_yukle_komutu(args: argparse.Namespace) -> None:
+    # Veritabanı açılmaz: bozuk bir dosya da geri yüklenebilmeli ve havuz bağlantısı kalmamalıdır
+    for yol in yedekten_geri_yukle(args.yedek, args.db):
+        print(f"  {yol} geri yüklendi")
+    print(f"{args.yedek} yedeği geri yüklendi.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Veritabanı bakım komutları")
+    parser.add_argument('--db', default="siparis_sistemi.db", help="Veritabanı dosyası")
+    komutlar = parser.add_subparsers(dest='komut', required=True)
+
+    ice_aktar = komutlar.add_parser('ice-aktar', help="CSV dosyasından toplu sipariş aktarır")
+    ice_aktar.add_argument('dosya')
+    ice_aktar.add_argument('--parca', type=int, default=None, help="executemany parça boyutu")
+    ice_aktar.add_argument('--ayrac', default=',', help="CSV alan ayracı")
+    ice_aktar.set_defaults(islem=ice_aktar_komutu)
+
+    belgeler = komutlar.add_parser('belgeler', help="Ekstre veya sipariş formlarını paralel olarak PDF'e yazar")
+    belgeler.add_argument('tur', choices=BELGE_TURLERI)
+    belgeler.add_argument('--baslangic', help="İlk sipariş tarihi (YYYY-MM-DD, dahil)")
+    belgeler.add_argument('--bitis', help="Son sipariş tarihi (YYYY-MM-DD, dahil)")
+    belgeler.add_argument('--musteri', type=int, nargs='+', help="Yalnızca bu müşteri ID'leri")
+    belgeler.add_argument('--cikti', default="belgeler", help="Çıktı dizini")
+    belgeler.add_argument('--isci', type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    belgeler.set_defaults(islem=belgeler_komutu)
+
+    ozetler = komutlar.add_parser('ozetler', help="Satış özet tablolarını yeniden hesaplayıp uzlaştırır")
+    ozetler.set_defaults(islem=ozetler_komutu)
+
+    arsivle = komutlar.add_parser('arsivle', help="Eski siparişleri yıllık arşiv dosyalarına taşır")
+    arsivle.add_argument('--sinir', required=True, help="Bu tarihten (YYYY-MM-DD, hariç) eski siparişler taşınır")
+    arsivle.add_argument('--sikistir', action='store_true', help="Taşımadan sonra ana dosyayı VACUUM ile küçültür")
+    arsivle.set_defaults(islem=arsivle_komutu)
+
+    yedekle = komutlar.add_parser('yedekle', help="Veritabanının ve arşivlerin doğrulanmış çevrimiçi yedeğini alır")
+    yedekle.add_argument('--dizin', default=YEDEKLEME_VARSAYILANLARI['dizin'], help="Yedek dizini")
+    yedekle.add_argument('--sakla', type=int, default=YEDEKLEME_VARSAYILANLARI['saklanacak'],
+                         help="Tutulacak en fazla yedek sayısı (0: hepsi)")
+    yedekle.add_argument('--tam', action='store_true', help="quick_check yerine integrity_check ile doğrular")
+    yedekle.set_defaults(islem=yedekle_komutu)
+
+    yedekler = komutlar.add_parser('yedekler', help="Alınmış yedekleri listeler ve denetler")
+    yedekler.add_argument('--dizin', default=YEDEKLEME_VARSAYILANLARI['dizin'], help="Yedek dizini")
+    yedekler.set_defaults(islem=yedekler_komutu)
+
+    geri_yukle = komutlar.add_parser('geri-yukle', help="Veritabanını ve arşivleri bir yedekten geri yükler")
+    geri_yukle.add_argument('yedek', help="Yedek dizini (ör. yedekler/siparis_sistemi_20250101_120000)")
+
+    args = parser.parse_args()
+    if args.komut == 'geri-yukle':
+        geri_yukle_komutu(args)
+        return
+    db = Database(args.db)
+    try:
+        args.islem(db, args)
+    finally:
+        db.kapat()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,736 @@
+"""
+Veritabanı katmanı için performans ölçümleri.
+
+Her ölçüm geçici bir dizinde sentetik bir veritabanı oluşturur.
+
+Kullanım:
+    python benchmark.py baglanti --siparis 100000
+    python benchmark.py plan --siparis 20000
+    python benchmark.py toplu --satir 1000000
+    python benchmark.py fiyat --tekrar 2000
+    python benchmark.py sayfa --siparis 200000
+    python benchmark.py arama --urun 500000
+    python benchmark.py indeks --urun 500000
+    python benchmark.py gecmis --siparis 50000
+    python benchmark.py bellek --satir 1000000
+    python benchmark.py hesap --tekrar 20000
+    python benchmark.py ekstre --siparis 50000
+    python benchmark.py belgeler --siparis 20000
+    python benchmark.py sablon --tekrar 200
+    python benchmark.py analiz --satir 10000000
+    python benchmark.py ozet --siparis 200000
+    python benchmark.py arsiv --siparis 300000
+    python benchmark.py yedek --siparis 500000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, List
+
+from database import Database
+from fiyat_onbellegi import FiyatOnbellegi
+from ozetler import CIRO_KURUS
+from para import SiparisHesabi, bicimle
+from sema_gecisleri import sorgu_planlarini_dogrula
+
+
+def ornek_veritabani_olustur(db_file: str, siparis_sayisi: int, musteri_sayisi: int = 1000,
+                             urun_sayisi: int = 5000, kalem_sayisi: int = 3) -> Database:
+    """
+    Belirtilen büyüklükte sentetik müşteri, ürün ve sipariş verisi oluşturur.
+    """
+    db = Database(db_file)
+    rastgele = random.Random(42)
+    with db.transaction(yazma=True) as conn:
+        conn.executemany(
+            "INSERT INTO musteriler (id, ad, soyad, telefon, adres, grup) VALUES (?, ?, ?, ?, ?, ?)",
+            ((i, f"Ad{i}", f"Soyad{i}", f"0555{i:07d}", f"Adres {i}", "Standart")
+             for i in range(1, musteri_sayisi + 1))
+        )
+        conn.executemany(
+            "INSERT INTO urunler (id, kod, ad, fiyat) VALUES (?, ?, ?, ?)",
+            ((i, f"U{i:06d}", f"Ürün {i}", round(rastgele.uniform(10, 500), 2))
+             for i in range(1, urun_sayisi + 1))
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO musteri_fiyatlari (musteri_id, urun_id, ozel_fiyat) VALUES (?, ?, ?)",
+            ((rastgele.randint(1, musteri_sayisi), rastgele.randint(1, urun_sayisi),
+              round(rastgele.uniform(10, 500), 2)) for _ in range(musteri_sayisi * 10))
+        )
+        conn.executemany(
+            "INSERT INTO siparisler (id, siparis_no, musteri_id, siparis_tarihi, teslim_tarihi, toplam_tutar) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((i, str(i).zfill(6), rastgele.randint(1, musteri_sayisi),
+              f"{rastgele.randint(2020, 2025)}-{rastgele.randint(1, 12):02d}-{rastgele.randint(1, 28):02d}",
+              "2026-01-01", round(rastgele.uniform(100, 5000), 2))
+             for i in range(1, siparis_sayisi + 1))
+        )
+        conn.executemany(
+            "INSERT INTO siparis_detaylari (siparis_id, urun_id, adet, birim_fiyat, iskonto, toplam_fiyat) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((i, rastgele.randint(1, urun_sayisi), 1, 10.0, 0, 10.0)
+             for i in range(1, siparis_sayisi + 1) for _ in range(kalem_sayisi))
+        )
+        conn.execute("UPDATE sayaclar SET deger = ? WHERE ad = 'siparis_no'", (siparis_sayisi,))
+    # Siparişler doğrudan SQL ile eklendiği için özetler ayrıca hesaplanır
+    db.ozetleri_yeniden_olustur()
+    return db
+
+
+def olc(ad: str, fonksiyon: Callable[[], object], tekrar: int) -> float:
+    """
+    Fonksiyonu belirtilen sayıda çağırır ve saniyedeki çağrı sayısını yazdırır.
+    """
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        fonksiyon()
+    sure = time.perf_counter() - baslangic
+    hiz = tekrar / sure
+    print(f"{ad:<45} {hiz:>12,.0f} çağrı/sn")
+    return hiz
+
+
+def baglanti_olcumu(args: argparse.Namespace) -> None:
+    """
+    Her çağrıda bağlantı açmak ile bağlantı havuzunu aynı fiyat sorgusuyla karşılaştırır.
+
+    musteri_urun_fiyati_getir fiyat önbelleğinden yanıt verdiği için ölçülmez;
+    iki taraf da aynı iki SELECT'i çalıştırır, yalnızca bağlantının kaynağı değişir.
+    Havuz hem arayüz iş parçacığının kalıcı bağlantısıyla hem de bir işçi iş
+    parçacığının ödünç aldığı ortak bağlantıyla ölçülür.
+    """
+    with tempfile.TemporaryDirectory() as dizin:
+        db_file = os.path.join(dizin, "benchmark.db")
+        db = ornek_veritabani_olustur(db_file, args.siparis)
+        rastgele = random.Random(7)
+
+        def fiyat_sorgula(conn: sqlite3.Connection) -> float:
+            musteri_id, urun_id = rastgele.randint(1, 1000), rastgele.randint(1, 5000)
+            cursor = conn.cursor()
+            cursor.execute('SELECT ozel_fiyat FROM musteri_fiyatlari WHERE musteri_id = ? AND urun_id = ?',
+                           (musteri_id, urun_id))
+            ozel_fiyat = cursor.fetchone()
+            if ozel_fiyat:
+                return float(ozel_fiyat[0])
+            cursor.execute('SELECT fiyat FROM urunler WHERE id = ?', (urun_id,))
+            normal_fiyat = cursor.fetchone()
+            return float(normal_fiyat[0]) if normal_fiyat else 0.0
+
+        def yeni_baglantiyla() -> float:
+            # Havuzdan önceki yöntem: her çağrıda yeni bağlantı
+            conn = sqlite3.connect(db_file)
+            try:
+                return fiyat_sorgula(conn)
+            finally:
+                conn.close()
+
+        def havuzdan() -> float:
+            with db.transaction() as conn:
+                return fiyat_sorgula(conn)
+
+        once = olc("fiyat sorgusu (connect/çağrı)", yeni_baglantiyla, args.tekrar)
+        sonra = olc("fiyat sorgusu (havuz, arayüz bağlantısı)", havuzdan, args.tekrar)
+        sonuc = {}
+        isci = threading.Thread(target=lambda: sonuc.update(
+            hiz=olc("fiyat sorgusu (havuz, işçi bağlantısı)", havuzdan, args.tekrar)))
+        isci.start()
+        isci.join()
+        print(f"Hızlanma: arayüz {sonra / once:.1f}x, işçi {sonuc['hiz'] / once:.1f}x")
+        db.kapat()
+
+
+def plan_kontrolu(args: argparse.Namespace) -> None:
+    """
+    Şema geçişleriyle eklenen indekslerin sorgu planlarında kullanıldığını doğrular.
+    Bir indeks kullanılmıyorsa sıfırdan farklı çıkış koduyla biter.
+    """
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis)
+        with db.transaction(yazma=True) as conn:
+            conn.execute("ANALYZE")
+        with db.transaction() as conn:
+            hatalar = sorgu_planlarini_dogrula(conn)
+        db.kapat()
+    for hata in hatalar:
+        print(f"HATA: {hata}")
+    if hatalar:
+        sys.exit(1)
+    print("Tüm sorgu planları beklenen indeksleri kullanıyor.")
+
+
+def toplu_ekleme_olcumu(args: argparse.Namespace) -> None:
+    """
+    Sipariş başına ayrı işlemle eklemeyi siparisleri_toplu_ekle ile karşılaştırır.
+    """
+    kalem_sayisi = 5
+
+    def siparis_uret(adet: int):
+        rastgele = random.Random(3)
+        for _ in range(adet):
+            detaylar = [{'urun_id': rastgele.randint(1, 5000), 'adet': 1, 'birim_fiyat': 10.0,
+                         'iskonto': 0, 'toplam_fiyat': 10.0} for _ in range(kalem_sayisi)]
+            yield ({'musteri_id': rastgele.randint(1, 1000), 'siparis_tarihi': "2025-01-01",
+                    'teslim_tarihi': "2025-01-08", 'toplam_tutar': 50.0}, detaylar)
+
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), 0)
+
+        tek_tek = min(2000, args.satir // kalem_sayisi)
+        baslangic = time.perf_counter()
+        for bilgiler, detaylar in siparis_uret(tek_tek):
+            db.siparis_ekle(bilgiler, detaylar)
+        sure = time.perf_counter() - baslangic
+        print(f"{'siparis_ekle (sipariş başına işlem)':<45} {tek_tek * kalem_sayisi / sure:>12,.0f} satır/sn")
+
+        baslangic = time.perf_counter()
+        db.siparisleri_toplu_ekle(siparis_uret(args.satir // kalem_sayisi))
+        sure = time.perf_counter() - baslangic
+        print(f"{'siparisleri_toplu_ekle':<45} {args.satir / sure:>12,.0f} satır/sn "
+              f"({args.satir:,} satır {sure:.1f} sn)")
+        db.kapat()
+
+
+def fiyat_onbellegi_olcumu(args: argparse.Namespace) -> None:
+    """
+    200 satırlık bir siparişin müşteriler arasında yeniden fiyatlandırılmasını
+    önbellekli ve önbelleksiz olarak ölçer.
+    """
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), 1000)
+        rastgele = random.Random(11)
+        urun_idler = [rastgele.randint(1, 5000) for _ in range(200)]
+        musteriler = [rastgele.randint(1, 1000) for _ in range(20)]
+
+        def fiyatlandir() -> None:
+            db.musteri_urun_fiyatlari_getir(rastgele.choice(musteriler), urun_idler)
+
+        def onbelleksiz_fiyatlandir() -> None:
+            db.fiyat_onbellegi.temizle()
+            fiyatlandir()
+
+        once = olc("200 satır fiyatlandırma (önbelleksiz)", onbelleksiz_fiyatlandir, args.tekrar)
+        db.fiyat_onbellegi = FiyatOnbellegi()
+        sonra = olc("200 satır fiyatlandırma (önbellekli)", fiyatlandir, args.tekrar)
+        print(f"Hızlanma: {sonra / once:.1f}x  Önbellek: {db.fiyat_onbellegi.istatistikler()}")
+        db.kapat()
+
+
+def sayfalama_olcumu(args: argparse.Namespace) -> None:
+    """
+    İlk sayfa ile listenin sonundaki bir sayfanın maliyetini OFFSET ve
+    anahtar tabanlı sayfalama için karşılaştırır.
+    """
+    sayfa_boyutu = 500
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis)
+        derin_offset = args.siparis - sayfa_boyutu
+        with db.transaction() as conn:
+            derin_anahtar = conn.execute(
+                "SELECT siparis_tarihi, id FROM siparisler ORDER BY siparis_tarihi DESC, id DESC LIMIT 1 OFFSET ?",
+                (derin_offset - 1,)
+            ).fetchone()
+
+        def offset_sayfasi(offset: int) -> None:
+            with db.transaction() as conn:
+                conn.execute('''
+                    SELECT s.siparis_no, s.siparis_tarihi, m.ad || ' ' || m.soyad, s.toplam_tutar, s.teslim_tarihi
+                    FROM siparisler s JOIN musteriler m ON s.musteri_id = m.id
+                    ORDER BY s.siparis_tarihi DESC, s.id DESC LIMIT ? OFFSET ?
+                ''', (sayfa_boyutu, offset)).fetchall()
+
+        tekrar = max(1, args.tekrar // 100)
+        olc("OFFSET ilk sayfa", lambda: offset_sayfasi(0), tekrar)
+        olc(f"OFFSET {derin_offset:,}. satırdan sayfa", lambda: offset_sayfasi(derin_offset), tekrar)
+        olc("keyset ilk sayfa", lambda: db.siparisleri_sayfali_getir(sayfa_boyutu=sayfa_boyutu), tekrar)
+        olc("keyset son sayfa", lambda: db.siparisleri_sayfali_getir(
+            son_anahtar=tuple(derin_anahtar), sayfa_boyutu=sayfa_boyutu), tekrar)
+        db.kapat()
+
+
+def arama_olcumu(args: argparse.Namespace) -> None:
+    """
+    FTS5 ürün aramasını tüm ürünleri okuyup Python'da süzmeyle karşılaştırır.
+    """
+    aramalar = ["12345", "ürün 4321", "URUN 9", "u", "ı", "x"]
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), 1000, urun_sayisi=args.urun)
+
+        def eski_arama(metin: str) -> list:
+            # Tabloyu doldurup her satırın hücrelerinde küçük harfle arama
+            metin = metin.lower()
+            return [u for u in db.urunleri_getir() if metin in u.kod.lower() or metin in u.ad.lower()]
+
+        def sure_ms(fonksiyon: Callable[[], object], tekrar: int) -> float:
+            baslangic = time.perf_counter()
+            for _ in range(tekrar):
+                fonksiyon()
+            return (time.perf_counter() - baslangic) / tekrar * 1000
+
+        tekrar = max(1, args.tekrar // 1000)
+        print(f"{'arama':<15} {'sonuç':>6} {'süzme (ms)':>12} {'FTS5 (ms)':>12}")
+        for metin in aramalar:
+            sonuc = len(db.urun_ara(metin))
+            eski = sure_ms(lambda: eski_arama(metin), 1)
+            yeni = sure_ms(lambda: db.urun_ara(metin), tekrar)
+            print(f"{metin!r:<15} {sonuc:>6} {eski:>12.1f} {yeni:>12.2f}")
+        db.kapat()
+
+
+def urun_indeksi_olcumu(args: argparse.Namespace) -> None:
+    """
+    Bellekteki ürün dizininin kurulma süresini, tuş başına arama süresini ve
+    artımlı güncelleme maliyetini ölçer.
+    """
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), 1000, urun_sayisi=args.urun)
+        baslangic = time.perf_counter()
+        db.urun_indeksini_olustur()
+        print(f"Dizin kurulumu: {len(db.urun_indeksi):,} ürün {time.perf_counter() - baslangic:.2f} sn")
+
+        tekrar = max(1, args.tekrar // 100)
+        print(f"{'arama':<15} {'sonuç':>6} {'dizin (µs)':>12} {'FTS5 (µs)':>12}")
+        yazilan = "ÜRÜN 4321"
+        for uzunluk in range(1, len(yazilan) + 1):
+            metin = yazilan[:uzunluk]
+            sonuc = len(db.urun_indeksi.ara(metin))
+            baslangic = time.perf_counter()
+            for _ in range(tekrar):
+                db.urun_indeksi.ara(metin)
+            dizin_sure = (time.perf_counter() - baslangic) / tekrar * 1e6
+            baslangic = time.perf_counter()
+            db.urun_ara(metin)
+            fts_sure = (time.perf_counter() - baslangic) * 1e6
+            print(f"{metin!r:<15} {sonuc:>6} {dizin_sure:>12,.0f} {fts_sure:>12,.0f}")
+
+        baslangic = time.perf_counter()
+        for i in range(100):
+            urun_id = db.urun_ekle({'kod': f"YENI{i}", 'ad': f"Işıklı Ürün {i}", 'fiyat': 1.0})
+            db.urun_sil(urun_id)
+        print(f"urun_ekle + urun_sil (dizin dahil): {(time.perf_counter() - baslangic) * 10:.2f} ms")
+        db.kapat()
+
+
+def gecmis_olcumu(args: argparse.Namespace) -> None:
+    """
+    Çok siparişli müşterilerin geçmişini GROUP_CONCAT metnini bölerek okuma ile
+    kalemleri kayıt olarak gruplayan musteri_siparisleri_getir arasında karşılaştırır.
+
+    Kayıtlı okuma hız için değil, kalemleri metin yerine alanlarıyla (SiparisKalemi)
+    taşımak için yapılır. Süre çoğunlukla kalem satırlarının okunmasına gider;
+    sipariş yerine kalem başına satır döndüğü için GROUP_CONCAT'tan biraz yavaştır
+    (~0.8x). Ölçüm bu bedelin büyüklüğünü izlemek içindir.
+    """
+    musteri_sayisi = 4
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis,
+                                      musteri_sayisi=musteri_sayisi)
+
+        def eski_gecmis() -> None:
+            # Eski yöntem: ürünler metin olarak birleştirilip ekranda virgülden bölünür
+            with db.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT s.*, m.ad, m.soyad, m.telefon, m.adres,
+                           GROUP_CONCAT(
+                               u.kod || ' - ' || u.ad || ' (' || sd.adet || ' adet)'
+                               || ' Fiyat: ' || sd.toplam_fiyat || ' ₺'
+                           ) AS urunler
+                    FROM siparisler s
+                    JOIN musteriler m ON s.musteri_id = m.id
+                    JOIN siparis_detaylari sd ON s.id = sd.siparis_id
+                    JOIN urunler u ON sd.urun_id = u.id
+                    WHERE s.musteri_id = ?
+                    GROUP BY s.id
+                    ORDER BY s.siparis_tarihi DESC
+                ''', (1,))
+                columns = [description[0] for description in cursor.description]
+                siparisler = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            for siparis in siparisler:
+                [urun.strip() for urun in siparis['urunler'].split(',') if urun.strip()]
+
+        def yeni_gecmis() -> None:
+            for siparis in db.musteri_siparisleri_getir(1):
+                [kalem.etiket() for kalem in siparis.kalemler]
+
+        print(f"Müşteri başına ~{args.siparis // musteri_sayisi:,} sipariş, sipariş başına 3 kalem")
+        tekrar = max(1, args.tekrar // 2000)
+        eski_gecmis()  # sayfa önbelleğini ısıt
+        once = olc("GROUP_CONCAT + split", eski_gecmis, tekrar)
+        sonra = olc("musteri_siparisleri_getir (kayıtlar)", yeni_gecmis, tekrar)
+        print(f"Oran (kayıtlar / GROUP_CONCAT): {sonra / once:.1f}x")
+        db.kapat()
+
+
+def bellek_olcumu(args: argparse.Namespace) -> None:
+    """
+    Ürün listesini satır başına sözlük olarak okumak ile kayıt olarak
+    (urunleri_getir) okumanın bellek ve süre maliyetini karşılaştırır.
+    """
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), 1000, urun_sayisi=args.satir)
+
+        def sozluk_olarak_oku() -> List[dict]:
+            # Eski yöntem: her satır için sütun adlarıyla yeni bir sözlük
+            with db.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT * FROM urunler ORDER BY kod')
+                columns = [description[0] for description in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        print(f"{'yöntem':<30} {'bellek (MB)':>12} {'bayt/satır':>12} {'süre (sn)':>10}")
+        for ad, oku in (("dict(zip(columns, row))", sozluk_olarak_oku),
+                        ("urunleri_getir (Urun)", db.urunleri_getir)):
+            baslangic = time.perf_counter()
+            oku()
+            sure = time.perf_counter() - baslangic
+            # Bellek ayrı bir okumada ölçülür; izleme süreyi yavaşlatır
+            tracemalloc.start()
+            satirlar = oku()
+            bellek = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"{ad:<30} {bellek / 1e6:>12,.1f} {bellek / len(satirlar):>12,.0f} {sure:>10.2f}")
+            del satirlar
+        db.kapat()
+
+
+def hesap_olcumu(args: argparse.Namespace) -> None:
+    """
+    Sipariş formunda bir satır düzenlendiğinde toplamların yeniden hesaplanmasını
+    karşılaştırır: tüm satır metinlerini float() ile okumak ile kuruş modelinde
+    yalnızca değişen satırı güncellemek.
+    """
+    for satir_sayisi in (10, 100, 1000):
+        hesap = SiparisHesabi(kdv_orani=20, genel_iskonto_orani=5)
+        for i in range(satir_sayisi):
+            hesap.satir_ekle(i, 1999 + i, adet=3, iskonto=10)
+        hucreler = [bicimle(satir.toplam) for satir in hesap.satirlar]
+
+        def metinden_topla() -> None:
+            # Eski yöntem: her değişiklikte tüm toplam hücreleri metinden okunur
+            ara_toplam = sum(float(hucre.replace("₺", "").strip()) for hucre in hucreler)
+            iskonto_sonrasi = ara_toplam - ara_toplam * 0.05
+            f"{iskonto_sonrasi + iskonto_sonrasi * 0.2:.2f} ₺"
+
+        def modelde_guncelle() -> None:
+            hesap.satiri_guncelle(satir_sayisi // 2, adet=4)
+            bicimle(hesap.genel_toplam)
+
+        def satir_satir_fiyatla() -> None:
+            # Eski yöntem: her satırın fiyatı değişince tüm hücreler yeniden toplanır (O(n²))
+            for i in range(satir_sayisi):
+                hucreler[i] = bicimle(hesap.satirlar[i].toplam)
+                metinden_topla()
+
+        fiyatlar = {i: 2500 + i for i in range(satir_sayisi)}
+
+        def tek_geciste_fiyatla() -> None:
+            for satir in hesap.satirlar:
+                hesap.satiri_guncelle(satir.urun_id, liste_fiyati=satir.birim_fiyat)
+            hesap.fiyatlari_uygula(fiyatlar)
+            bicimle(hesap.genel_toplam)
+
+        print(f"{satir_sayisi} satırlı sipariş")
+        once = olc("  tüm hücreleri float() ile topla", metinden_topla, args.tekrar)
+        sonra = olc("  SiparisHesabi.satiri_guncelle", modelde_guncelle, args.tekrar)
+        print(f"  Hızlanma: {sonra / once:.1f}x")
+        tekrar = max(1, args.tekrar // satir_sayisi)
+        once = olc("  müşteri değişimi: satır satır", satir_satir_fiyatla, tekrar)
+        sonra = olc("  müşteri değişimi: fiyatlari_uygula", tek_geciste_fiyatla, tekrar)
+        print(f"  Hızlanma: {sonra / once:.1f}x")
+
+
+def ekstre_olcumu(args: argparse.Namespace) -> None:
+    """
+    Tek müşterinin tüm siparişlerinden çok sayfalı ekstre üretir; süreyi,
+    sayfa sayısını ve en yüksek Python bellek kullanımını ölçer.
+    """
+    from pdf_belgesi import ekstre_olustur
+
+    with tempfile.TemporaryDirectory() as dizin:
+        # Tüm siparişler tek müşteriye ait; satır sayısı siparis x kalem
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis, musteri_sayisi=1)
+        satir_sayisi = db.musteri_kalem_sayisi(1)
+        hedef = os.path.join(dizin, "ekstre.pdf")
+
+        def olustur() -> int:
+            siparisler = db.sayfalari_akit(db.musteri_siparisleri_sayfali_getir, musteri_id=1)
+            ilk = db.musteri_siparisleri_sayfali_getir(1, sayfa_boyutu=1)[0][0]
+            return ekstre_olustur(hedef, ilk, siparisler, satir_sayisi, ilk.siparis_no)
+
+        baslangic = time.perf_counter()
+        sayfa = olustur()
+        sure = time.perf_counter() - baslangic
+        # Bellek ayrı bir üretimde ölçülür; izleme süreyi yavaşlatır
+        tracemalloc.start()
+        olustur()
+        en_yuksek = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{satir_sayisi:,} satır, {sayfa:,} sayfa, {os.path.getsize(hedef) / 1e6:.1f} MB PDF")
+        print(f"Süre: {sure:.2f} sn ({satir_sayisi / sure:,.0f} satır/sn)")
+        print(f"En yüksek Python belleği: {en_yuksek / 1e6:.1f} MB")
+        db.kapat()
+
+
+def belgeler_olcumu(args: argparse.Namespace) -> None:
+    """
+    Müşteri ekstrelerini tek süreçle ve tüm çekirdeklerle üretip belge/sn karşılaştırır.
+    """
+    from toplu_belgeler import belgeleri_uret
+
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis, musteri_sayisi=500)
+        musteriler = db.donem_musterileri()
+        print(f"{len(musteriler)} ekstre, {args.siparis * 3:,} kalem")
+
+        sureler = {}
+        for isci_sayisi in sorted({1, os.cpu_count() or 1}):
+            baslangic = time.perf_counter()
+            sonuclar = belgeleri_uret(db, 'ekstre', musteriler, os.path.join(dizin, f"cikti{isci_sayisi}"),
+                                      isci_sayisi=isci_sayisi)
+            sure = sureler[isci_sayisi] = time.perf_counter() - baslangic
+            sayfalar = sum(sonuc.sayfa for sonuc in sonuclar)
+            print(f"  {isci_sayisi:2d} süreç: {sure:6.2f} sn ({len(sonuclar) / sure:.1f} belge/sn, "
+                  f"{sayfalar / sure:.1f} sayfa/sn)")
+        if len(sureler) > 1:
+            print(f"  Hızlanma: {sureler[1] / sureler[max(sureler)]:.1f}x")
+        db.kapat()
+
+
+def sablon_olcumu(args: argparse.Namespace) -> None:
+    """
+    Tek siparişlik formların belge başına üretim süresini yazı tipi ve logo
+    önbelleği temizlenerek ve önbellek kullanılarak karşılaştırır.
+    """
+    import io
+
+    import pdf_belgesi
+
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), 100)
+        siparis = db.siparis_getir(1)
+        db.kapat()
+
+    def olustur() -> None:
+        pdf_belgesi.ekstre_olustur(io.BytesIO(), siparis, [siparis], len(siparis.kalemler), siparis.siparis_no)
+
+    def onbelleksiz() -> None:
+        pdf_belgesi.fontlari_kaydet.cache_clear()
+        pdf_belgesi._logo_goruntusu.cache_clear()
+        olustur()
+
+    tekrar = max(1, args.tekrar // 10)
+    once = olc("  belge: yazı tipi ve logo her seferinde", onbelleksiz, tekrar)
+    sonra = olc("  belge: süreç önbelleği", olustur, tekrar)
+    print(f"  Hızlanma: {sonra / once:.1f}x")
+
+
+def analiz_olcumu(args: argparse.Namespace) -> None:
+    """
+    Satış kalemlerini NumPy dizilerine yükleme ve her rapor boyutunda vektörel
+    gruplama sürelerini ölçer; müşteri cirosunu satır satır Python ile toplamakla karşılaştırır.
+    """
+    from satis_analizi import RAPOR_BOYUTLARI, satis_verisi_yukle
+
+    with tempfile.TemporaryDirectory() as dizin:
+        baslangic = time.perf_counter()
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.satir // 5,
+                                      musteri_sayisi=10_000, urun_sayisi=50_000, kalem_sayisi=5)
+        print(f"Veritabanı {time.perf_counter() - baslangic:.1f} sn'de oluşturuldu")
+
+        baslangic = time.perf_counter()
+        veri = satis_verisi_yukle(db)
+        yukleme = time.perf_counter() - baslangic
+        bellek = sum(dizi.nbytes for dizi in (veri.gun, veri.musteri_id, veri.urun_id,
+                                               veri.adet, veri.iskonto, veri.tutar))
+        print(f"{len(veri):,} kalem {yukleme:.2f} sn'de yüklendi ({bellek / 1e6:.0f} MB dizi)")
+
+        for ad, (baslik, grupla) in RAPOR_BOYUTLARI.items():
+            baslangic = time.perf_counter()
+            rapor = grupla(veri)
+            sure = time.perf_counter() - baslangic
+            print(f"  {baslik:<15} {len(rapor.anahtar):>9,} grup {sure * 1000:9.1f} ms")
+
+        # Karşılaştırma: aynı kalemler üzerinde satır satır sözlükle toplama
+        musteri_id, tutar = veri.musteri_id.tolist(), veri.tutar.tolist()
+        baslangic = time.perf_counter()
+        toplamlar = {}
+        for musteri, kalem_tutari in zip(musteri_id, tutar):
+            toplamlar[musteri] = toplamlar.get(musteri, 0) + kalem_tutari
+        python_suresi = time.perf_counter() - baslangic
+        baslangic = time.perf_counter()
+        RAPOR_BOYUTLARI['musteri'][1](veri)
+        numpy_suresi = time.perf_counter() - baslangic
+        print(f"Müşteri cirosu: Python döngüsü {python_suresi * 1000:.0f} ms, "
+              f"NumPy {numpy_suresi * 1000:.1f} ms ({python_suresi / numpy_suresi:.0f}x)")
+        db.kapat()
+
+def ozet_olcumu(args: argparse.Namespace) -> None:
+    """
+    Müşteri toplamını siparişleri tarayarak hesaplamak ile özet tablosundan okumayı
+    karşılaştırır ve özetlerin sipariş eklemeye getirdiği ek maliyeti ölçer.
+    """
+    musteri_sayisi = 20
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis,
+                                      musteri_sayisi=musteri_sayisi)
+        rastgele = random.Random(11)
+
+        def taramayla() -> None:
+            with db.transaction() as conn:
+                conn.execute(f'''
+                    SELECT COUNT(DISTINCT s.id), SUM({CIRO_KURUS}), MAX(s.siparis_tarihi)
+                    FROM siparisler s
+                    LEFT JOIN siparis_detaylari sd ON sd.siparis_id = s.id
+                    WHERE s.musteri_id = ?
+                ''', (rastgele.randint(1, musteri_sayisi),)).fetchone()
+
+        def ozetten() -> None:
+            db.musteri_ozeti_getir(rastgele.randint(1, musteri_sayisi))
+
+        print(f"Müşteri başına ~{args.siparis // musteri_sayisi:,} sipariş")
+        tekrar = max(1, args.tekrar // 100)
+        once = olc("müşteri toplamı: sipariş taraması", taramayla, tekrar)
+        sonra = olc("müşteri toplamı: musteri_ozeti_getir", ozetten, tekrar)
+        print(f"Hızlanma: {sonra / once:.0f}x")
+
+        def siparis_uret(adet: int):
+            for _ in range(adet):
+                detaylar = [{'urun_id': rastgele.randint(1, 5000), 'adet': 1, 'birim_fiyat': 10.0,
+                             'iskonto': 0, 'toplam_fiyat': 10.0} for _ in range(3)]
+                yield ({'musteri_id': rastgele.randint(1, musteri_sayisi), 'siparis_tarihi': "2025-06-01",
+                        'teslim_tarihi': "2025-06-08", 'toplam_tutar': 30.0}, detaylar)
+
+        tek_tek = 500
+        baslangic = time.perf_counter()
+        for bilgiler, detaylar in siparis_uret(tek_tek):
+            db.siparis_ekle(bilgiler, detaylar)
+        sure = time.perf_counter() - baslangic
+        print(f"{'siparis_ekle (özetlerle)':<45} {tek_tek / sure:>12,.0f} sipariş/sn")
+
+        baslangic = time.perf_counter()
+        duzeltmeler = db.ozetleri_yeniden_olustur()
+        sure = time.perf_counter() - baslangic
+        print(f"Uzlaştırma {sure:.2f} sn, düzeltilen satır: {sum(duzeltmeler.values())}")
+        db.kapat()
+
+def arsiv_olcumu(args: argparse.Namespace) -> None:
+    """
+    2025 öncesi siparişleri yıllık arşivlere taşımadan önce ve sonra sipariş listesini
+    (yalnızca ana dosya) ve müşteri geçmişini (arşivler dahil) okuma sürelerini karşılaştırır.
+    """
+    from arsiv import siparisleri_arsivle
+
+    with tempfile.TemporaryDirectory() as dizin:
+        db_file = os.path.join(dizin, "benchmark.db")
+        db = ornek_veritabani_olustur(db_file, args.siparis, musteri_sayisi=100)
+        tekrar = max(1, args.tekrar // 2000)
+
+        def liste() -> None:
+            db.tum_siparisleri_getir()
+
+        def gecmis() -> None:
+            db.musteri_siparisleri_getir(1)
+
+        print(f"Ana dosya: {os.path.getsize(db_file) / 1e6:.1f} MB")
+        liste_once = olc("tum_siparisleri_getir (arşivsiz)", liste, tekrar)
+        gecmis_once = olc("musteri_siparisleri_getir (arşivsiz)", gecmis, tekrar)
+
+        baslangic = time.perf_counter()
+        tasinanlar = siparisleri_arsivle(db, "2025-01-01")
+        print(f"{sum(tasinanlar.values()):,} sipariş {len(tasinanlar)} arşive "
+              f"{time.perf_counter() - baslangic:.1f} sn'de taşındı")
+        with db.havuz.baglanti() as conn:
+            conn.execute("VACUUM main")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        print(f"Ana dosya: {os.path.getsize(db_file) / 1e6:.1f} MB")
+
+        liste_sonra = olc("tum_siparisleri_getir (arşivli)", liste, tekrar)
+        gecmis_sonra = olc("musteri_siparisleri_getir (arşivli)", gecmis, tekrar)
+        print(f"Sipariş listesi: {liste_sonra / liste_once:.1f}x, müşteri geçmişi: {gecmis_sonra / gecmis_once:.2f}x")
+        db.kapat()
+
+
+def yedek_olcumu(args: argparse.Namespace) -> None:
+    """
+    Çevrimiçi yedek sürerken siparis_ekle gecikmesini yedeksiz duruma göre ölçer.
+    """
+    import threading
+    from yedekleme import yedek_al
+
+    with tempfile.TemporaryDirectory() as dizin:
+        db = ornek_veritabani_olustur(os.path.join(dizin, "benchmark.db"), args.siparis)
+        print(f"Veritabanı: {os.path.getsize(db.db_file) / 1e6:.1f} MB")
+        rastgele = random.Random(13)
+
+        def siparis_gir(bitti: Callable[[], bool]) -> List[float]:
+            sureler = []
+            while not bitti():
+                detaylar = [{'urun_id': rastgele.randint(1, 5000), 'adet': 1, 'birim_fiyat': 10.0,
+                             'iskonto': 0, 'toplam_fiyat': 10.0} for _ in range(3)]
+                baslangic = time.perf_counter()
+                db.siparis_ekle({'musteri_id': rastgele.randint(1, 1000), 'siparis_tarihi': "2025-06-01",
+                                 'teslim_tarihi': "2025-06-08", 'toplam_tutar': 30.0}, detaylar)
+                sureler.append(time.perf_counter() - baslangic)
+                time.sleep(0.001)
+            return sureler
+
+        def yazdir(ad: str, sureler: List[float]) -> None:
+            sureler = sorted(sureler)
+            print(f"{ad:<45} {len(sureler):>6} sipariş, ortanca {sureler[len(sureler) // 2] * 1e3:.2f} ms, "
+                  f"p99 {sureler[int(len(sureler) * 0.99)] * 1e3:.2f} ms, en kötü {sureler[-1] * 1e3:.1f} ms")
+
+        bitis = time.perf_counter() + 2
+        yazdir("siparis_ekle (yedeksiz)", siparis_gir(lambda: time.perf_counter() > bitis))
+
+        sonuc = []
+        yedekleyici = threading.Thread(target=lambda: sonuc.append(
+            yedek_al(db.db_file, os.path.join(dizin, "yedekler"), adim_beklemesi=0.005)))
+        yedekleyici.start()
+        yazdir("siparis_ekle (yedek sürerken)", siparis_gir(lambda: not yedekleyici.is_alive()))
+        yedekleyici.join()
+        if sonuc:
+            print(f"Yedek {sonuc[0].sure:.1f} sn'de alındı ve doğrulandı ({sonuc[0].boyut / 1e6:.1f} MB)")
+        db.kapat()
+
+
+OLCUMLER = {
+    'baglanti': baglanti_olcumu,
+    'plan': plan_kontrolu,
+    'toplu': toplu_ekleme_olcumu,
+    'fiyat': fiyat_onbellegi_olcumu,
+    'sayfa': sayfalama_olcumu,
+    'arama': arama_olcumu,
+    'indeks': urun_indeksi_olcumu,
+    'gecmis': gecmis_olcumu,
+    'bellek': bellek_olcumu,
+    'hesap': hesap_olcumu,
+    'ekstre': ekstre_olcumu,
+    'belgeler': belgeler_olcumu,
+    'sablon': sablon_olcumu,
+    'analiz': analiz_olcumu,
+    'ozet': ozet_olcumu,
+    'arsiv': arsiv_olcumu,
+    'yedek': yedek_olcumu,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Veritabanı performans ölçümleri")
+    parser.add_argument('olcum', choices=sorted(OLCUMLER))
+    parser.add_argument('--siparis', type=int, default=100_000, help="Sentetik sipariş sayısı")
+    parser.add_argument('--tekrar', type=int, default=20_000, help="Ölçüm başına çağrı sayısı")
+    parser.add_argument('--urun', type=int, default=500_000, help="Aramada sentetik ürün sayısı")
+    parser.add_argument('--satir', type=int, default=1_000_000, help="Toplu eklemede sipariş satırı sayısı")
+    args = parser.parse_args()
+    OLCUMLER[args.olcum](args)
+
+
+if __name__ == "__main__":
+    main()
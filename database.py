@@ -1,20 +1,172 @@
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from arama import fts_sorgusu
+from arsiv import arsiv_olustur, arsivleri_bagla, arsivleri_bul, arsivleri_sirala, gecmis_kaynaklari
+from baglanti_havuzu import BaglantiHavuzu
+from depolama import BakimZamanlayicisi, depolama_ayarlari, pragma_listesi
+from fiyat_onbellegi import FiyatOnbellegi
+from kayitlar import (K, GunlukSatis, Musteri, MusteriOzeti, MusteriSiparisi, Siparis, SiparisDetay,
+                      Urun, UrunOzeti, satir_fabrikasi, siparis_satiri, sutunlar)
+from ozetler import CIRO_KURUS, ozetlerden_dusulerek, ozetlere_ekle, ozetleri_yeniden_olustur
+from sema_gecisleri import gecisleri_uygula, mevcut_surum
+from urun_arama_indeksi import UrunAramaIndeksi
 
 class Database:
-    def __init__(self, db_file: str = "siparis_sistemi.db") -> None:
+    # Depolama profilinden bağımsız olarak her bağlantıya uygulanan ayarlar
+    PRAGMALAR = (
+        "busy_timeout = 5000",
+        "foreign_keys = ON",
+    )
+    SIPARIS_NO_HANE = 6
+    TOPLU_PARCA_BOYUTU = 5000
+    SORGU_PARCA_BOYUTU = 500
+    # Aramada tabloya yüklenecek en fazla eşleşme
+    ARAMA_SONUC_SINIRI = 200
+    # Bundan fazla eşleşen aramalar puanlanmaz; ilk eşleşmeler döndürülür
+    ARAMA_SIRALAMA_SINIRI = 5000
+    # Sayfalı listelerde sıralama adı -> tekil sıralama anahtarı (sütunlar).
+    # Anahtarlar indeksli olduğundan derin sayfalar da ilk sayfa kadar ucuzdur;
+    # yalnızca musteri_adi birleştirilen tablodan geldiği için indekssizdir.
+    SIPARIS_SIRALAMALARI = {
+        'siparis_no': ("s.siparis_no",),
+        'siparis_tarihi': ("s.siparis_tarihi", "s.id"),
+        'musteri_adi': ("m.ad", "m.soyad", "s.id"),
+        'toplam_tutar': ("s.toplam_tutar", "s.id"),
+        'teslim_tarihi': ("s.teslim_tarihi", "s.id"),
+    }
+    MUSTERI_SIRALAMALARI = {
+        'ad': ("ad", "soyad", "id"),
+        'id': ("id",),
+    }
+    URUN_SIRALAMALARI = {
+        'kod': ("kod",),
+        'ad': ("ad", "id"),
+        'fiyat': ("fiyat", "id"),
+    }
+    # Sipariş listesi satırı; sütunlar kayitlar.Siparis alanlarıyla aynı sıradadır
+    SIPARIS_SECIMI = '''
+        s.id,
+        s.siparis_no,
+        s.musteri_id,
+        m.ad || ' ' || m.soyad AS musteri_adi,
+        s.siparis_tarihi,
+        s.teslim_tarihi,
+        s.toplam_tutar
+    '''
+    # Geçmiş sorgularında sipariş satırları (k, bkz. arsiv.gecmis_kaynaklari) ve urunler (u)
+    # üzerinden okunan sipariş + kalem satırı; kayitlar.siparis_satiri bu sırayı bekler
+    SIPARIS_SATIRI_SECIMI = '''
+        k.id, k.siparis_no, k.musteri_id, k.siparis_tarihi, k.teslim_tarihi, k.toplam_tutar,
+        k.detay_id, k.urun_id, u.kod, u.ad, k.adet, k.birim_fiyat, k.iskonto, k.toplam_fiyat
+    '''
+
+    def __init__(self, db_file: str = "siparis_sistemi.db", max_baglanti: int = 4,
+                 depolama: Optional[Dict[str, Any]] = None, salt_okunur: bool = False) -> None:
         """
-        Veritabanı bağlantısı kurar ve tabloları oluşturur.
+        Veritabanı bağlantı havuzunu kurar, tabloları oluşturur, bekleyen şema
+        geçişlerini uygular ve WAL kipindeyse arka plan bakım zamanlayıcısını başlatır.
+
+        Yanındaki arşiv dosyaları geçişlerden sonra bulunur ve her bağlantıya
+        ilk kullanımında eklenir; geçmiş sorguları arşivleri de okur.
+
+        salt_okunur verilirse (ör. belge üreten işçi süreçleri) dosya yalnızca okuma
+        kipinde açılır; tablo oluşturma, geçişler ve bakım atlanır. Şema önceden
+        yazılabilir bir bağlantıyla kurulmuş olmalıdır.
         """
         self.db_file = db_file
-        self.create_tables()
+        self.fiyat_onbellegi = FiyatOnbellegi()
+        self.urun_indeksi = UrunAramaIndeksi()
+        self.depolama = depolama or depolama_ayarlari()
+        pragmalar = list(self.PRAGMALAR) + pragma_listesi(self.depolama)
+        if salt_okunur:
+            # Günlük kipi dosyaya yazılır; okuyucu dosyadaki kipi kullanır
+            pragmalar = [pragma for pragma in pragmalar if not pragma.startswith("journal_mode")]
+        self.salt_okunur = salt_okunur
+        # Arşiv görünümleri geçişlerden sonra kurulur; tablo yeniden adlandırmaları
+        # geçici görünümleri de yeniden yazdığı için geçişler sırasında bulunmamalıdır
+        self.arsivler: Dict[str, str] = {}
+        self._arsiv_surumu: Optional[int] = None
+        self._bagli_arsiv_surumleri: Dict[int, int] = {}
+        self.havuz = BaglantiHavuzu(db_file, max_baglanti=max_baglanti, pragmalar=pragmalar,
+                                    hazirlayici=self._arsivleri_bagla, salt_okunur=salt_okunur)
+        if salt_okunur:
+            with self.transaction() as conn:
+                self.sema_surumu = mevcut_surum(conn)
+        else:
+            self.create_tables()
+            self.sema_surumu = gecisleri_uygula(self)
+        self.arsivler = arsivleri_bul(db_file)
+        if not salt_okunur:
+            # Sonradan eklenen arşiv indeksleri eski arşivlerde de kurulur
+            for yol in self.arsivler.values():
+                arsiv_olustur(yol)
+        self._arsiv_surumu = 0
+
+        self.bakim_zamanlayicisi = None
+        if self.depolama['journal_mode'].upper() == 'WAL' and not salt_okunur:
+            self.bakim_zamanlayicisi = BakimZamanlayicisi(self.havuz, self.depolama)
+            self.bakim_zamanlayicisi.start()
+
+    @contextmanager
+    def transaction(self, yazma: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Havuzdan bir bağlantı alıp işlem (transaction) içinde kullanıma verir.
+        """
+        with self.havuz.transaction(yazma=yazma) as conn:
+            yield conn
+
+    def _arsivleri_bagla(self, conn: sqlite3.Connection) -> None:
+        surum = self._arsiv_surumu
+        if surum is None or self._bagli_arsiv_surumleri.get(id(conn)) == surum:
+            return
+        arsivleri_bagla(conn, self.arsivler)
+        self._bagli_arsiv_surumleri[id(conn)] = surum
+
+    def arsiv_ekle(self, sema: str, yol: str) -> None:
+        """
+        Yeni oluşturulan bir arşiv dosyasını kaydeder; her bağlantı onu bir sonraki kullanımında ekler.
+        """
+        self.arsivler = arsivleri_sirala({**self.arsivler, sema: yol})
+        self._arsiv_surumu += 1
+
+    def arsiv_cikar(self, sema: str) -> str:
+        """
+        Eski arşivde birleştirilen bir arşivi kayıttan çıkarır ve dosya yolunu döndürür;
+        her bağlantı onu bir sonraki kullanımında ayırır.
+        """
+        yol = self.arsivler[sema]
+        self.arsivler = {ad: dosya for ad, dosya in self.arsivler.items() if ad != sema}
+        self._arsiv_surumu += 1
+        return yol
+
+    def kapat(self) -> None:
+        """
+        Bakım zamanlayıcısını durdurur ve açık veritabanı bağlantılarını kapatır.
+        """
+        if self.bakim_zamanlayicisi is not None:
+            self.bakim_zamanlayicisi.durdur()
+            self.bakim_zamanlayicisi = None
+        if not self.salt_okunur:
+            try:
+                with self.havuz.baglanti() as conn:
+                    conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+        self.havuz.kapat()
 
     def create_tables(self) -> None:
         """
         Gerekli tabloları veritabanında oluşturur.
+
+        Buradaki tanımlar temel şemadır (sürüm 0); sonraki değişiklikler
+        sema_gecisleri.GECISLER içinde sürümlü geçişler olarak tutulur.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
             
             # Müşteriler tablosu
@@ -83,8 +235,6 @@ class Database:
                     UNIQUE(musteri_id, urun_id)
                 )
             ''')
-            
-            conn.commit()
 
     # Müşteri işlemleri
 
@@ -92,7 +242,7 @@ class Database:
         """
         Yeni müşteri ekler ve eklenen kaydın ID'sini döndürür.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO musteriler (ad, soyad, telefon, adres, email, grup, notlar)
@@ -112,7 +262,7 @@ class Database:
         """
         Belirtilen ID'li müşteriyi günceller.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE musteriler 
@@ -128,26 +278,44 @@ class Database:
                 musteri_bilgileri.get('notlar'),
                 musteri_id
             ))
-            conn.commit()
 
     def musteri_sil(self, musteri_id: int) -> None:
         """
-        Belirtilen ID'li müşteriyi siler.
+        Belirtilen ID'li müşteriyi ve ona ait özel fiyatları siler.
+        Siparişi olan bir müşteri silinemez; ValueError verilir. Yabancı anahtarlar
+        arşivleri göremediği için siparişlere arşivler dahil bakılır.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM tum_siparisler WHERE musteri_id = ? LIMIT 1', (musteri_id,))
+            if cursor.fetchone():
+                raise ValueError("Bu müşterinin siparişleri olduğu için silinemez.")
             cursor.execute('DELETE FROM musteriler WHERE id = ?', (musteri_id,))
-            conn.commit()
+        self.fiyat_onbellegi.musteriyi_gecersiz_kil(musteri_id)
 
-    def musterileri_getir(self) -> List[Dict[str, Any]]:
+    def musterileri_getir(self) -> List[Musteri]:
         """
         Tüm müşterileri getirir.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM musteriler ORDER BY ad, soyad')
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            cursor.row_factory = satir_fabrikasi(Musteri)
+            cursor.execute(f'SELECT {sutunlar(Musteri)} FROM musteriler ORDER BY ad, soyad')
+            return cursor.fetchall()
+
+    def musterileri_sayfali_getir(self, siralama: str = 'ad', son_anahtar: Optional[Tuple] = None,
+                                  sayfa_boyutu: int = 500, azalan: bool = False) -> Tuple[List[Musteri], Optional[Tuple]]:
+        """
+        Müşteri listesinin bir sayfasını ve sonraki sayfanın anahtarını getirir.
+        """
+        return self._sayfa_getir(Musteri, sutunlar(Musteri), "musteriler", self.MUSTERI_SIRALAMALARI,
+                                 siralama, son_anahtar, sayfa_boyutu, azalan)
+
+    def musteri_ara(self, arama_metni: str, limit: Optional[int] = None) -> List[Musteri]:
+        """
+        Ad, soyad, telefon ve adreste arama yapar; en iyi eşleşen müşterileri getirir.
+        """
+        return self._tam_metin_ara("musteriler", Musteri, arama_metni, limit)
 
     # Ürün işlemleri
 
@@ -155,7 +323,7 @@ class Database:
         """
         Yeni ürün ekler ve eklenen kaydın ID'sini döndürür.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO urunler (kod, ad, fiyat)
@@ -165,13 +333,16 @@ class Database:
                 urun_bilgileri['ad'],
                 urun_bilgileri['fiyat']
             ))
-            return cursor.lastrowid
+            urun_id = cursor.lastrowid
+            urun = self._urun_satiri(cursor, urun_id)
+        self.urun_indeksi.ekle(urun)
+        return urun_id
 
     def urun_guncelle(self, urun_id: int, urun_bilgileri: Dict[str, Any]) -> None:
         """
         Belirtilen ID'li ürünü günceller.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE urunler 
@@ -183,154 +354,667 @@ class Database:
                 urun_bilgileri['fiyat'],
                 urun_id
             ))
-            conn.commit()
+            urun = self._urun_satiri(cursor, urun_id)
+        self.fiyat_onbellegi.urunu_gecersiz_kil(urun_id)
+        if urun is not None:
+            self.urun_indeksi.ekle(urun)
 
     def urun_sil(self, urun_id: int) -> None:
         """
-        Belirtilen ID'li ürünü siler.
+        Belirtilen ID'li ürünü ve ona ait özel fiyatları siler.
+        Siparişlerde (arşivdekiler dahil) kullanılmış bir ürün silinemez; ValueError verilir.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
+            # Yabancı anahtar yalnızca ana dosyadaki kalemleri görür
+            cursor.execute('SELECT 1 FROM tum_siparis_satirlari WHERE urun_id = ? LIMIT 1', (urun_id,))
+            if cursor.fetchone():
+                raise ValueError("Bu ürün siparişlerde kullanıldığı için silinemez.")
             cursor.execute('DELETE FROM urunler WHERE id = ?', (urun_id,))
-            conn.commit()
+        self.fiyat_onbellegi.urunu_gecersiz_kil(urun_id)
+        self.urun_indeksi.sil(urun_id)
 
-    def urunleri_getir(self) -> List[Dict[str, Any]]:
+    def _urun_satiri(self, cursor: sqlite3.Cursor, urun_id: int) -> Optional[Urun]:
+        cursor.row_factory = satir_fabrikasi(Urun)
+        cursor.execute(f'SELECT {sutunlar(Urun)} FROM urunler WHERE id = ?', (urun_id,))
+        return cursor.fetchone()
+
+    def urun_indeksini_olustur(self) -> None:
+        """
+        Bellekteki ürün arama dizinini veritabanındaki ürünlerle kurar.
+        Uygulama açılışında bir kez, arka planda çağrılır.
+        """
+        self.urun_indeksi.yukle(self.urunleri_getir)
+
+    def urunleri_getir(self) -> List[Urun]:
         """
         Tüm ürünleri getirir.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM urunler ORDER BY kod')
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            cursor.row_factory = satir_fabrikasi(Urun)
+            cursor.execute(f'SELECT {sutunlar(Urun)} FROM urunler ORDER BY kod')
+            return cursor.fetchall()
+
+    def urunleri_sayfali_getir(self, siralama: str = 'kod', son_anahtar: Optional[Tuple] = None,
+                               sayfa_boyutu: int = 500, azalan: bool = False) -> Tuple[List[Urun], Optional[Tuple]]:
+        """
+        Ürün listesinin bir sayfasını ve sonraki sayfanın anahtarını getirir.
+        """
+        return self._sayfa_getir(Urun, sutunlar(Urun), "urunler", self.URUN_SIRALAMALARI,
+                                 siralama, son_anahtar, sayfa_boyutu, azalan)
+
+    def urun_ara(self, arama_metni: str, limit: Optional[int] = None) -> List[Urun]:
+        """
+        Ürün kodu ve adında arama yapar; en iyi eşleşen ürünleri getirir.
+        """
+        return self._tam_metin_ara("urunler", Urun, arama_metni, limit)
+
+    # Arama
+
+    def _tam_metin_ara(self, tablo: str, kayit_tipi: Type[K], arama_metni: str,
+                       limit: Optional[int]) -> List[K]:
+        """
+        Tablonun FTS5 dizininde arama yapar.
+
+        Her kelime önek olarak aranır; Türkçe büyük/küçük harf (İ/ı/I/i) ve aksan
+        farkları yok sayılır. Sonuçlar bm25 puanına göre sıralanır ve yalnızca
+        ilk limit kadar kayıt okunur. Tek harf gibi çok geniş aramalarda tüm
+        eşleşmeleri puanlamak yerine dizindeki ilk eşleşmeler döndürülür.
+        """
+        sorgu = fts_sorgusu(arama_metni)
+        if sorgu is None:
+            return []
+        fts = f"{tablo}_fts"
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM {fts} WHERE {fts} MATCH ? LIMIT ?)",
+                (sorgu, self.ARAMA_SIRALAMA_SINIRI + 1)
+            )
+            puanla = cursor.fetchone()[0] <= self.ARAMA_SIRALAMA_SINIRI
+            cursor.row_factory = satir_fabrikasi(kayit_tipi)
+            cursor.execute(f'''
+                SELECT {sutunlar(kayit_tipi, 't.')}
+                FROM (
+                    SELECT rowid, {"rank" if puanla else "rowid"} AS sira FROM {fts}
+                    WHERE {fts} MATCH ?
+                    {"ORDER BY rank" if puanla else ""}
+                    LIMIT ?
+                ) f
+                JOIN {tablo} t ON t.id = f.rowid
+                ORDER BY f.sira
+            ''', (sorgu, limit or self.ARAMA_SONUC_SINIRI))
+            return cursor.fetchall()
+
+    # Sayfalama
+
+    def _sayfa_getir(self, kayit_tipi: Type[K], secim: str, kaynak: str,
+                     siralamalar: Dict[str, Tuple[str, ...]], siralama: str,
+                     son_anahtar: Optional[Tuple], sayfa_boyutu: int,
+                     azalan: bool) -> Tuple[List[K], Optional[Tuple]]:
+        """
+        Anahtar tabanlı (keyset) sayfalama ile bir sayfa getirir.
+
+        OFFSET yerine son görülen kaydın sıralama anahtarından devam edildiği için
+        sayfanın maliyeti derinliğinden bağımsızdır. Dönen anahtar bir sonraki çağrıya
+        son_anahtar olarak verilir; son sayfada None döner.
+        secim, kayit_tipi alanlarını aynı sırayla seçmelidir.
+        """
+        if siralama not in siralamalar:
+            raise ValueError(f"Geçersiz sıralama: {siralama}")
+        anahtar = siralamalar[siralama]
+        anahtar_listesi = ", ".join(anahtar)
+        yon = "DESC" if azalan else "ASC"
+
+        kosul = ""
+        parametreler: List[Any] = []
+        if son_anahtar is not None:
+            kosul = f"WHERE ({anahtar_listesi}) {'<' if azalan else '>'} ({', '.join('?' * len(anahtar))})"
+            parametreler.extend(son_anahtar)
+        parametreler.append(sayfa_boyutu)
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            # Sıralama anahtarı seçimin sonuna eklenir ve satırlardan ayrılarak döndürülür
+            cursor.execute(f'''
+                SELECT {secim}, {anahtar_listesi}
+                FROM {kaynak}
+                {kosul}
+                ORDER BY {", ".join(f"{sutun} {yon}" for sutun in anahtar)}
+                LIMIT ?
+            ''', parametreler)
+            rows = cursor.fetchall()
+
+        kayit_yap = kayit_tipi._make
+        satirlar = [kayit_yap(row[:-len(anahtar)]) for row in rows]
+        sonraki_anahtar = tuple(rows[-1][-len(anahtar):]) if len(rows) == sayfa_boyutu else None
+        return satirlar, sonraki_anahtar
+
+    def sayfalari_akit(self, sayfa_getir: Callable[..., Tuple[List[K], Optional[Tuple]]],
+                       **kwargs: Any) -> Iterator[K]:
+        """
+        Sayfalı bir getiricinin tüm kayıtlarını sabit bellekle akıtır.
+
+        Örnek: for siparis in db.sayfalari_akit(db.siparisleri_sayfali_getir, sayfa_boyutu=1000)
+        """
+        son_anahtar = None
+        while True:
+            satirlar, son_anahtar = sayfa_getir(son_anahtar=son_anahtar, **kwargs)
+            yield from satirlar
+            if son_anahtar is None:
+                return
 
     # Sipariş işlemleri
 
-    def siparis_ekle(self, siparis_bilgileri: Dict[str, Any], siparis_detaylari: List[Dict[str, Any]]) -> int:
+    def siparis_ekle(self, siparis_bilgileri: Dict[str, Any],
+                     siparis_detaylari: List[Dict[str, Any]]) -> Tuple[int, str]:
+        """
+        Yeni sipariş ve sipariş detaylarını ekler; sipariş ID'sini ve numarasını döndürür.
+
+        Sipariş numarası verilmemişse aynı işlem içinde sayaçtan ayrılır.
+        siparis_bilgileri değiştirilmez; işlem geri alınırsa ayrılan numara hiçbir yerde kalmaz.
+        """
+        return self._siparisleri_yaz([(siparis_bilgileri, siparis_detaylari)])[0]
+
+    def siparisleri_toplu_ekle(self, siparisler: Iterable[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+                               parca_boyutu: Optional[int] = None) -> List[int]:
+        """
+        (siparis_bilgileri, siparis_detaylari) çiftlerini tek bir işlemde ekler
+        ve sipariş ID'lerini ekleme sırasıyla döndürür.
+
+        Siparişler parca_boyutu kadarlık parçalar halinde okunur; her parçanın
+        detay satırları tek bir executemany çağrısıyla yazılır. Girdi bir üreteç
+        olabilir, bu durumda bellek kullanımı parça boyutuyla sınırlı kalır.
+        Özet tabloları her parçadan sonra aynı işlem içinde güncellenir.
+        Hata olursa hiçbir sipariş eklenmez. Girdi sözlükleri değiştirilmez.
+        """
+        return [siparis_id for siparis_id, _ in self._siparisleri_yaz(siparisler, parca_boyutu)]
+
+    def _siparisleri_yaz(self, siparisler: Iterable[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+                         parca_boyutu: Optional[int] = None) -> List[Tuple[int, str]]:
         """
-        Yeni sipariş ve sipariş detaylarını ekler, sipariş ID'sini döndürür.
+        Siparişleri ekler ve (sipariş ID'si, sipariş numarası) çiftlerini döndürür.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        parca_boyutu = parca_boyutu or self.TOPLU_PARCA_BOYUTU
+        eklenenler: List[Tuple[int, str]] = []
+        kalanlar = iter(siparisler)
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO siparisler (
-                    siparis_no, musteri_id, siparis_tarihi, 
-                    teslim_tarihi, toplam_tutar
-                )
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                siparis_bilgileri['siparis_no'],
-                siparis_bilgileri['musteri_id'],
-                siparis_bilgileri['siparis_tarihi'],
-                siparis_bilgileri['teslim_tarihi'],
-                siparis_bilgileri['toplam_tutar']
-            ))
-            siparis_id = cursor.lastrowid
+            while True:
+                parca = list(islice(kalanlar, parca_boyutu))
+                if not parca:
+                    break
 
-            for detay in siparis_detaylari:
-                cursor.execute('''
+                # Dışarıdan verilen numaralar önce sayaca işlenir, eksikler ardından blok halinde ayrılır
+                verilen_numaralar = [int(b['siparis_no']) for b, _ in parca
+                                     if b.get('siparis_no') and str(b['siparis_no']).isdigit()]
+                if verilen_numaralar:
+                    self._siparis_sayacini_ilerlet(cursor, max(verilen_numaralar))
+                numarasiz_sayisi = sum(1 for b, _ in parca if not b.get('siparis_no'))
+                ayrilan_numaralar = iter(self._siparis_numaralari_ayir(cursor, numarasiz_sayisi)
+                                         if numarasiz_sayisi else ())
+
+                detay_satirlari = []
+                for siparis_bilgileri, siparis_detaylari in parca:
+                    siparis_no = siparis_bilgileri.get('siparis_no') or next(ayrilan_numaralar)
+                    cursor.execute('''
+                        INSERT INTO siparisler (
+                            siparis_no, musteri_id, siparis_tarihi, 
+                            teslim_tarihi, toplam_tutar
+                        )
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (
+                        siparis_no,
+                        siparis_bilgileri['musteri_id'],
+                        siparis_bilgileri['siparis_tarihi'],
+                        siparis_bilgileri['teslim_tarihi'],
+                        siparis_bilgileri['toplam_tutar']
+                    ))
+                    siparis_id = cursor.lastrowid
+                    eklenenler.append((siparis_id, siparis_no))
+                    detay_satirlari.extend((
+                        siparis_id,
+                        detay['urun_id'],
+                        detay['adet'],
+                        detay['birim_fiyat'],
+                        detay['iskonto'],
+                        detay['toplam_fiyat']
+                    ) for detay in siparis_detaylari)
+
+                cursor.executemany('''
                     INSERT INTO siparis_detaylari (
                         siparis_id, urun_id, adet, 
                         birim_fiyat, iskonto, toplam_fiyat
                     )
                     VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    siparis_id,
-                    detay['urun_id'],
-                    detay['adet'],
-                    detay['birim_fiyat'],
-                    detay['iskonto'],
-                    detay['toplam_fiyat']
-                ))
-            conn.commit()
-            return siparis_id
-
-    def musteri_siparisleri_getir(self, musteri_id: int) -> List[Dict[str, Any]]:
-        """
-        Belirtilen müşteriye ait siparişleri detaylarıyla birlikte getirir.
-        """
-        with sqlite3.connect(self.db_file) as conn:
+                ''', detay_satirlari)
+                # Yazma kilidi tutulduğu için parçanın ID'leri ardışıktır
+                ozetlere_ekle(conn, "s.id BETWEEN ? AND ?", (eklenenler[-len(parca)][0], eklenenler[-1][0]))
+        return eklenenler
+
+    def musteri_siparisleri_getir(self, musteri_id: int) -> List[MusteriSiparisi]:
+        """
+        Belirtilen müşteriye ait siparişleri kalemleriyle birlikte, yeniden eskiye getirir.
+
+        Sipariş ve kalem satırları tek sorguda, sipariş sırasıyla okunur ve
+        Python'da siparişe göre gruplanır; metin birleştirme yapılmaz.
+        Müşteri bilgileri bir kez okunur ve tüm siparişlerde paylaşılır.
+        Arşivlenmiş siparişler de okunur.
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT s.*, m.ad, m.soyad, m.telefon, m.adres,
-                       GROUP_CONCAT(
-                           u.kod || ' - ' || u.ad || ' (' || sd.adet || ' adet)' 
-                           || ' Fiyat: ' || sd.toplam_fiyat || ' ₺'
-                       ) AS urunler
-                FROM siparisler s
-                JOIN musteriler m ON s.musteri_id = m.id
-                JOIN siparis_detaylari sd ON s.id = sd.siparis_id
-                JOIN urunler u ON sd.urun_id = u.id
-                WHERE s.musteri_id = ?
-                GROUP BY s.id
-                ORDER BY s.siparis_tarihi DESC
+            musteri = self._musteri_bilgileri(cursor, musteri_id)
+            if musteri is None:
+                return []
+            _, satirlar = gecmis_kaynaklari(self.arsivler)
+            cursor.row_factory = siparis_satiri
+            cursor.execute(f'''
+                SELECT {self.SIPARIS_SATIRI_SECIMI}
+                FROM {satirlar} k
+                LEFT JOIN urunler u ON u.id = k.urun_id
+                WHERE k.musteri_id = ?
+                ORDER BY k.siparis_tarihi DESC, k.id DESC, k.detay_id
             ''', (musteri_id,))
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return self._siparislere_grupla(cursor, musteri)
+
+    def musteri_siparisleri_sayfali_getir(self, musteri_id: int, son_anahtar: Optional[Tuple] = None,
+                                          sayfa_boyutu: int = 500, baslangic: Optional[str] = None,
+                                          bitis: Optional[str] = None) -> Tuple[List[MusteriSiparisi], Optional[Tuple]]:
+        """
+        Müşterinin siparişlerini kalemleriyle birlikte sayfa sayfa, yeniden eskiye getirir.
+
+        Sayfa sipariş sayısıyla sınırlanır; bir siparişin kalemleri hiçbir zaman
+        iki sayfaya bölünmez. Uzun ekstreler sayfalari_akit ile sabit bellekle okunur.
+        baslangic/bitis verilirse yalnızca bu tarihler arasındaki (dahil) siparişler gelir.
+        """
+        kosul, parametreler = self._tarih_kosulu(baslangic, bitis)
+        parametreler[:0] = [musteri_id, musteri_id]
+        if son_anahtar is not None:
+            kosul += " AND (siparis_tarihi, id) < (?, ?)"
+            parametreler.extend(son_anahtar)
+        parametreler.append(sayfa_boyutu)
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            musteri = self._musteri_bilgileri(cursor, musteri_id)
+            if musteri is None:
+                return [], None
+            # Dış musteri_id koşulu her arşive indirilip indeksle çözülür;
+            # sayfanın siparişleri ise alt sorguda tüm şemalar üzerinden seçilir
+            siparis_kaynagi, satirlar = gecmis_kaynaklari(self.arsivler)
+            cursor.row_factory = siparis_satiri
+            cursor.execute(f'''
+                SELECT {self.SIPARIS_SATIRI_SECIMI}
+                FROM {satirlar} k
+                LEFT JOIN urunler u ON u.id = k.urun_id
+                WHERE k.musteri_id = ? AND k.id IN (
+                    SELECT id FROM {siparis_kaynagi}
+                    WHERE musteri_id = ? {kosul}
+                    ORDER BY siparis_tarihi DESC, id DESC
+                    LIMIT ?
+                )
+                ORDER BY k.siparis_tarihi DESC, k.id DESC, k.detay_id
+            ''', parametreler)
+            siparisler = self._siparislere_grupla(cursor, musteri)
+
+        son = siparisler[-1] if len(siparisler) == sayfa_boyutu else None
+        return siparisler, (son.siparis_tarihi, son.id) if son else None
+
+    def musteri_kalem_sayisi(self, musteri_id: int, baslangic: Optional[str] = None,
+                             bitis: Optional[str] = None) -> int:
+        """
+        Müşterinin siparişlerindeki toplam kalem sayısını döndürür; tarih aralığı isteğe bağlıdır.
+        """
+        kosul, parametreler = self._tarih_kosulu(baslangic, bitis)
+        with self.transaction() as conn:
+            return conn.execute(f'''
+                SELECT COUNT(*) FROM tum_siparis_satirlari
+                WHERE musteri_id = ? AND detay_id IS NOT NULL {kosul}
+            ''', [musteri_id, *parametreler]).fetchone()[0]
+
+    def siparis_getir(self, siparis_id: int) -> Optional[MusteriSiparisi]:
+        """
+        Tek bir siparişi kalemleri ve müşteri bilgileriyle birlikte getirir.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT musteri_id FROM tum_siparisler WHERE id = ?', (siparis_id,))
+            satir = cursor.fetchone()
+            if satir is None:
+                return None
+            musteri = self._musteri_bilgileri(cursor, satir[0])
+            if musteri is None:
+                return None
+            _, satirlar = gecmis_kaynaklari(self.arsivler)
+            cursor.row_factory = siparis_satiri
+            cursor.execute(f'''
+                SELECT {self.SIPARIS_SATIRI_SECIMI}
+                FROM {satirlar} k
+                LEFT JOIN urunler u ON u.id = k.urun_id
+                WHERE k.id = ?
+                ORDER BY k.detay_id
+            ''', (siparis_id,))
+            siparisler = self._siparislere_grupla(cursor, musteri)
+            return siparisler[0] if siparisler else None
+
+    def donem_musterileri(self, baslangic: Optional[str] = None, bitis: Optional[str] = None) -> List[int]:
+        """
+        Tarih aralığında siparişi olan müşterilerin ID'lerini artan sırayla döndürür.
+        """
+        kosul, parametreler = self._tarih_kosulu(baslangic, bitis)
+        with self.transaction() as conn:
+            return [satir[0] for satir in conn.execute(f'''
+                SELECT DISTINCT musteri_id FROM tum_siparisler
+                WHERE 1 = 1 {kosul}
+                ORDER BY musteri_id
+            ''', parametreler)]
+
+    def donem_siparisleri(self, baslangic: Optional[str] = None, bitis: Optional[str] = None,
+                          musteri_idler: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Tarih aralığındaki siparişlerin ID'lerini döndürür; isteğe bağlı olarak müşterilerle sınırlanır.
+        """
+        kosul, parametreler = self._tarih_kosulu(baslangic, bitis)
+        if musteri_idler is not None:
+            musteri_idler = list(musteri_idler)
+            kosul += f" AND musteri_id IN ({', '.join('?' * len(musteri_idler))})"
+            parametreler.extend(musteri_idler)
+        with self.transaction() as conn:
+            return [satir[0] for satir in conn.execute(f'''
+                SELECT id FROM tum_siparisler
+                WHERE 1 = 1 {kosul}
+                ORDER BY siparis_tarihi, id
+            ''', parametreler)]
+
+    def satis_kalemlerini_akit(self, baslangic: Optional[str] = None, bitis: Optional[str] = None,
+                               parca_boyutu: int = 100_000) -> Iterator[List[Tuple[int, int, int, int, int, int]]]:
+        """
+        Satış analizi için kalemleri (gün, müşteri_id, ürün_id, adet, iskonto, tutar) satırları
+        olarak parça parça akıtır. Gün 1970-01-01'den bu yana geçen gün sayısı, tutar kalemin
+        kuruş cinsinden cirosudur (bkz. ozetler.CIRO_KURUS).
+        Arşivlenmiş kalemler dahildir; tüm parçalar tek bir okuma işleminden gelir.
+        """
+        kosul, parametreler = self._tarih_kosulu(baslangic, bitis)
+        with self.transaction() as conn:
+            cursor = conn.execute(f'''
+                SELECT CAST(julianday(siparis_tarihi) - 2440587.5 AS INTEGER), musteri_id, urun_id,
+                       adet, iskonto, {CIRO_KURUS}
+                FROM tum_siparis_satirlari sd
+                WHERE detay_id IS NOT NULL {kosul}
+            ''', parametreler)
+            while True:
+                parca = cursor.fetchmany(parca_boyutu)
+                if not parca:
+                    return
+                yield parca
+
+    def musteri_gruplari_getir(self) -> Dict[int, str]:
+        """
+        Müşteri ID'si -> grup eşlemesini döndürür.
+        """
+        with self.transaction() as conn:
+            return dict(conn.execute('SELECT id, grup FROM musteriler'))
+
+    def musteri_adlari_getir(self, musteri_idler: Iterable[int]) -> Dict[int, str]:
+        """
+        Verilen müşterilerin "Ad Soyad" etiketlerini döndürür; silinmiş müşteriler sonuçta yer almaz.
+        """
+        musteri_idler = list(musteri_idler)
+        with self.transaction() as conn:
+            return dict(conn.execute(f'''
+                SELECT id, ad || ' ' || soyad FROM musteriler
+                WHERE id IN ({', '.join('?' * len(musteri_idler))})
+            ''', musteri_idler))
+
+    def urun_etiketleri_getir(self, urun_idler: Iterable[int]) -> Dict[int, str]:
+        """
+        Verilen ürünlerin "Kod - Ad" etiketlerini döndürür; silinmiş ürünler sonuçta yer almaz.
+        """
+        urun_idler = list(urun_idler)
+        with self.transaction() as conn:
+            return dict(conn.execute(f'''
+                SELECT id, kod || ' - ' || ad FROM urunler
+                WHERE id IN ({', '.join('?' * len(urun_idler))})
+            ''', urun_idler))
+
+    @staticmethod
+    def _tarih_kosulu(baslangic: Optional[str], bitis: Optional[str],
+                      sutun: str = 'siparis_tarihi') -> Tuple[str, List[Any]]:
+        """
+        İsteğe bağlı tarih aralığı için "AND ..." koşulunu ve parametrelerini üretir.
+        Tarihler YYYY-MM-DD biçimindedir ve sınırlar dahildir.
+        """
+        kosul, parametreler = "", []
+        if baslangic is not None:
+            kosul += f" AND {sutun} >= ?"
+            parametreler.append(baslangic)
+        if bitis is not None:
+            kosul += f" AND {sutun} <= ?"
+            parametreler.append(bitis)
+        return kosul, parametreler
+
+    def _musteri_bilgileri(self, cursor: sqlite3.Cursor, musteri_id: int) -> Optional[Tuple]:
+        cursor.execute('SELECT ad, soyad, telefon, adres FROM musteriler WHERE id = ?', (musteri_id,))
+        return cursor.fetchone()
+
+    def _siparislere_grupla(self, cursor: sqlite3.Cursor, musteri: Tuple) -> List[MusteriSiparisi]:
+        """
+        Sipariş sırasıyla gelen satırları MusteriSiparisi kayıtlarına toplar.
+        İmlecin row_factory'si siparis_satiri olmalıdır; kalemler yeniden sarılmaz.
+        """
+        siparisler = []
+        for _, satirlar in groupby(cursor, key=itemgetter(0)):
+            siparis, kalem = next(satirlar)
+            # Kalemi olmayan siparişte LEFT JOIN tek bir boş kalem satırı döndürür
+            kalemler = [kalem] if kalem is not None else []
+            kalemler.extend(kalem for _, kalem in satirlar)
+            siparisler.append(MusteriSiparisi(*siparis, *musteri, kalemler))
+        return siparisler
 
     def son_siparis_no_getir(self) -> str:
         """
-        Veritabanından son sipariş numarasını getirir.
+        Sayaçtan son ayrılan sipariş numarasını getirir.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT siparis_no FROM siparisler ORDER BY CAST(siparis_no AS INTEGER) DESC LIMIT 1")
+            cursor.execute("SELECT deger FROM sayaclar WHERE ad = 'siparis_no'")
             son_no = cursor.fetchone()
             if son_no:
-                return str(int(son_no[0]))
+                return str(son_no[0])
             return "0"  # Hiç sipariş yoksa 0 döndür
 
-    def tum_siparisleri_getir(self) -> List[Dict[str, Any]]:
+    def _siparis_numaralari_ayir(self, cursor: sqlite3.Cursor, adet: int) -> List[str]:
+        """
+        Sayacı adet kadar artırarak ardışık sipariş numaralarını ayırır.
+        Yazma işlemi içinde çağrılmalıdır; kilit işlem sonuna kadar tutulduğu
+        için eşzamanlı istasyonlara aynı numara verilmez.
+        """
+        cursor.execute("UPDATE sayaclar SET deger = deger + ? WHERE ad = 'siparis_no'", (adet,))
+        cursor.execute("SELECT deger FROM sayaclar WHERE ad = 'siparis_no'")
+        son = cursor.fetchone()[0]
+        return [str(no).zfill(self.SIPARIS_NO_HANE) for no in range(son - adet + 1, son + 1)]
+
+    def _siparis_sayacini_ilerlet(self, cursor: sqlite3.Cursor, siparis_no: int) -> None:
         """
-        Tüm siparişleri müşteri bilgileriyle birlikte getirir.
+        Dışarıdan verilen numaralı siparişlerden sonra sayacın geride kalmamasını sağlar.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        cursor.execute("UPDATE sayaclar SET deger = MAX(deger, ?) WHERE ad = 'siparis_no'", (siparis_no,))
+
+    def tum_siparisleri_getir(self) -> List[Siparis]:
+        """
+        Tüm siparişleri müşteri bilgileriyle birlikte getirir; arşivlenmiş siparişler dahil değildir.
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    s.siparis_no,
-                    s.siparis_tarihi,
-                    m.ad || ' ' || m.soyad AS musteri_adi,
-                    s.toplam_tutar,
-                    s.teslim_tarihi
+            cursor.row_factory = satir_fabrikasi(Siparis)
+            cursor.execute(f'''
+                SELECT {self.SIPARIS_SECIMI}
                 FROM siparisler s
                 JOIN musteriler m ON s.musteri_id = m.id
                 ORDER BY s.siparis_tarihi DESC
             ''')
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return cursor.fetchall()
+
+    def siparisleri_sayfali_getir(self, siralama: str = 'siparis_tarihi', son_anahtar: Optional[Tuple] = None,
+                                  sayfa_boyutu: int = 500, azalan: bool = True) -> Tuple[List[Siparis], Optional[Tuple]]:
+        """
+        Sipariş listesinin bir sayfasını ve sonraki sayfanın anahtarını getirir.
+        Liste yalnızca ana dosyadaki (arşivlenmemiş) siparişleri okur.
+        """
+        return self._sayfa_getir(
+            Siparis, self.SIPARIS_SECIMI,
+            "siparisler s JOIN musteriler m ON s.musteri_id = m.id",
+            self.SIPARIS_SIRALAMALARI, siralama, son_anahtar, sayfa_boyutu, azalan
+        )
+
+    def siparis_detaylarini_getir(self, siparis_id: int) -> List[SiparisDetay]:
+        """
+        Siparişin detay satırlarını eklenme sırasıyla getirir.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = satir_fabrikasi(SiparisDetay)
+            cursor.execute(f'''
+                SELECT {sutunlar(SiparisDetay)} FROM siparis_detaylari
+                WHERE siparis_id = ?
+                ORDER BY id
+            ''', (siparis_id,))
+            return cursor.fetchall()
 
     def siparis_sil(self, siparis_no: str) -> None:
         """
-        Belirtilen sipariş numarasına ait siparişi ve detaylarını siler.
+        Belirtilen sipariş numarasına ait siparişi siler; detaylar yabancı anahtarla birlikte silinir.
+        """
+        with self.transaction(yazma=True) as conn, \
+                ozetlerden_dusulerek(conn, "s.siparis_no = ?", (siparis_no,)):
+            conn.execute('DELETE FROM siparisler WHERE siparis_no = ?', (siparis_no,))
+
+    def siparisleri_sil(self, siparis_nolar: Iterable[str]) -> int:
+        """
+        Verilen sipariş numaralarına ait siparişleri tek bir işlemde siler ve silinen sipariş sayısını döndürür.
+
+        Numaralar geçici bir tabloya yazılır; böylece binlerce sipariş parametre sınırına
+        takılmadan tek bir DELETE ile silinir. Hata olursa hiçbir sipariş silinmez.
+        """
+        kosul = "s.siparis_no IN (SELECT siparis_no FROM temp.silinecek_siparisler)"
+        with self.transaction(yazma=True) as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS silinecek_siparisler (siparis_no TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.silinecek_siparisler")
+            conn.executemany("INSERT OR IGNORE INTO temp.silinecek_siparisler VALUES (?)",
+                             ((siparis_no,) for siparis_no in siparis_nolar))
+            with ozetlerden_dusulerek(conn, kosul, ()):
+                silinen = conn.execute(f"DELETE FROM siparisler AS s WHERE {kosul}").rowcount
+            conn.execute("DELETE FROM temp.silinecek_siparisler")
+        return silinen
+
+    # Satış özetleri
+
+    def musteri_ozeti_getir(self, musteri_id: int) -> Optional[MusteriOzeti]:
         """
-        with sqlite3.connect(self.db_file) as conn:
+        Müşterinin sipariş sayısını, cirosunu ve son sipariş tarihini özet tablosundan getirir.
+        Siparişi olmayan müşteri için None döner.
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                DELETE FROM siparis_detaylari 
-                WHERE siparis_id IN (
-                    SELECT id FROM siparisler WHERE siparis_no = ?
-                )
-            ''', (siparis_no,))
-            cursor.execute('DELETE FROM siparisler WHERE siparis_no = ?', (siparis_no,))
-            conn.commit()
+            cursor.row_factory = satir_fabrikasi(MusteriOzeti)
+            cursor.execute(f"SELECT {sutunlar(MusteriOzeti)} FROM musteri_ozetleri WHERE musteri_id = ?",
+                           (musteri_id,))
+            return cursor.fetchone()
+
+    def urun_ozeti_getir(self, urun_id: int) -> Optional[UrunOzeti]:
+        """
+        Ürünün satılan adedini ve cirosunu özet tablosundan getirir; hiç satılmamışsa None döner.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = satir_fabrikasi(UrunOzeti)
+            cursor.execute(f"SELECT {sutunlar(UrunOzeti)} FROM urun_ozetleri WHERE urun_id = ?", (urun_id,))
+            return cursor.fetchone()
+
+    def gunluk_satislari_getir(self, baslangic: Optional[str] = None,
+                               bitis: Optional[str] = None) -> List[GunlukSatis]:
+        """
+        Tarih aralığındaki (dahil) günlük satış özetlerini tarih sırasıyla getirir.
+        """
+        kosul, parametreler = self._tarih_kosulu(baslangic, bitis, 'tarih')
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = satir_fabrikasi(GunlukSatis)
+            cursor.execute(f'''
+                SELECT {sutunlar(GunlukSatis)} FROM gunluk_satislar
+                WHERE 1 = 1 {kosul}
+                ORDER BY tarih
+            ''', parametreler)
+            return cursor.fetchall()
+
+    def ozetleri_yeniden_olustur(self) -> Dict[str, int]:
+        """
+        Özet tablolarını arşivler dahil tüm siparişlerden yeniden hesaplayıp uzlaştırır
+        ve tablo başına düzeltilen satır sayısını döndürür.
+        """
+        with self.transaction(yazma=True) as conn:
+            return ozetleri_yeniden_olustur(conn, ['main', *self.arsivler])
 
     def musteri_urun_fiyati_getir(self, musteri_id: int, urun_id: int) -> float:
         """
         Müşteriye özel fiyatı; yoksa ürünün varsayılan fiyatını getirir.
         """
-        with sqlite3.connect(self.db_file) as conn:
+        return self.musteri_urun_fiyatlari_getir(musteri_id, [urun_id])[urun_id]
+
+    def musteri_urun_fiyatlari_getir(self, musteri_id: Optional[int], urun_idler: Iterable[int]) -> Dict[int, float]:
+        """
+        Birden fazla ürünün müşteriye göre fiyatını tek sorguda getirir.
+
+        Özel fiyatı olmayan ürünler için varsayılan fiyat, bulunamayan ürünler için 0.0 döner.
+        """
+        urun_idler = list(dict.fromkeys(urun_idler))
+        fiyatlar, eksikler, nesil = self.fiyat_onbellegi.getir(musteri_id, urun_idler)
+        if not eksikler:
+            return fiyatlar
+
+        okunanlar: Dict[int, float] = {}
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            # SQLite parametre sınırını aşmamak için parçalar halinde sorgulanır
+            for i in range(0, len(eksikler), self.SORGU_PARCA_BOYUTU):
+                parca = eksikler[i:i + self.SORGU_PARCA_BOYUTU]
+                yer_tutucular = ", ".join("?" * len(parca))
+                cursor.execute(f'''
+                    SELECT u.id, COALESCE(mf.ozel_fiyat, u.fiyat)
+                    FROM urunler u
+                    LEFT JOIN musteri_fiyatlari mf
+                           ON mf.urun_id = u.id AND mf.musteri_id = ?
+                    WHERE u.id IN ({yer_tutucular})
+                ''', (musteri_id, *parca))
+                for urun_id, fiyat in cursor.fetchall():
+                    okunanlar[urun_id] = float(fiyat)
+        self.fiyat_onbellegi.ekle(musteri_id, okunanlar, nesil)
+
+        fiyatlar.update(okunanlar)
+        for urun_id in eksikler:
+            fiyatlar.setdefault(urun_id, 0.0)
+        return fiyatlar
+
+    def musteri_ozel_fiyat_kaydet(self, musteri_id: int, urun_id: int, ozel_fiyat: float) -> None:
+        """
+        Müşteriye özel ürün fiyatını ekler veya günceller.
+        """
+        with self.transaction(yazma=True) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT ozel_fiyat 
-                FROM musteri_fiyatlari 
-                WHERE musteri_id = ? AND urun_id = ?
-            ''', (musteri_id, urun_id))
-            ozel_fiyat = cursor.fetchone()
-            if ozel_fiyat:
-                return float(ozel_fiyat[0])
-            
-            # Özel fiyat yoksa, ürünün normal fiyatını getir
-            cursor.execute('SELECT fiyat FROM urunler WHERE id = ?', (urun_id,))
-            normal_fiyat = cursor.fetchone()
-            return float(normal_fiyat[0]) if normal_fiyat else 0.0
\ No newline at end of file
+                INSERT INTO musteri_fiyatlari (musteri_id, urun_id, ozel_fiyat)
+                VALUES (?, ?, ?)
+                ON CONFLICT (musteri_id, urun_id) DO UPDATE SET ozel_fiyat = excluded.ozel_fiyat
+            ''', (musteri_id, urun_id, ozel_fiyat))
+        self.fiyat_onbellegi.musteri_urununu_gecersiz_kil(musteri_id, urun_id)
+
+    def musteri_ozel_fiyat_sil(self, musteri_id: int, urun_id: int) -> None:
+        """
+        Müşteriye özel ürün fiyatını siler; ürünün varsayılan fiyatı geçerli olur.
+        """
+        with self.transaction(yazma=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM musteri_fiyatlari WHERE musteri_id = ? AND urun_id = ?',
+                           (musteri_id, urun_id))
+        self.fiyat_onbellegi.musteri_urununu_gecersiz_kil(musteri_id, urun_id)
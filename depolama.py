@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Depolama profilleri: PRAGMA ayarları ve bakım zamanlayıcısının aralıkları.
+# Aralıklar saniye cinsindendir; 0 verilen görev çalıştırılmaz.
+DEPOLAMA_PROFILLERI: Dict[str, Dict[str, Any]] = {
+    'varsayilan': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,          # KiB cinsinden (~16 MB)
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,    # sayfa
+        'checkpoint_araligi': 60,
+        'optimize_araligi': 3600,
+        'wal_sinir_mb': 64,
+    },
+    'performans': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 4000,
+        'checkpoint_araligi': 30,
+        'optimize_araligi': 3600,
+        'wal_sinir_mb': 256,
+    },
+    'guvenli': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,
+        'checkpoint_araligi': 60,
+        'optimize_araligi': 3600,
+        'wal_sinir_mb': 32,
+    },
+    # Eski davranış: geri alma günlüğü, zamanlayıcı kapalı
+    'klasik': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'wal_autocheckpoint': 1000,
+        'checkpoint_araligi': 0,
+        'optimize_araligi': 0,
+        'wal_sinir_mb': 0,
+    },
+}
+
+PRAGMA_ANAHTARLARI = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size',
+                      'temp_store', 'wal_autocheckpoint')
+
+
+def depolama_ayarlari(profil: str = 'varsayilan', degisiklikler: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Profil ayarlarını, varsa kullanıcı değişiklikleriyle birleştirerek döndürür.
+    """
+    if profil not in DEPOLAMA_PROFILLERI:
+        raise ValueError(f"Bilinmeyen depolama profili: {profil}")
+    ayarlar = dict(DEPOLAMA_PROFILLERI[profil])
+    for anahtar, deger in (degisiklikler or {}).items():
+        if anahtar not in ayarlar:
+            raise ValueError(f"Bilinmeyen depolama ayarı: {anahtar}")
+        ayarlar[anahtar] = deger
+    return ayarlar
+
+
+def ayarlardan_depolama_ayarlari(ayarlar: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ayarlar.json içeriğindeki "veritabani" bölümünü depolama ayarlarına çevirir.
+
+    Örnek: {"veritabani": {"profil": "performans", "cache_size": -32000}}
+    """
+    bolum = dict(ayarlar.get('veritabani', {}))
+    profil = bolum.pop('profil', 'varsayilan')
+    return depolama_ayarlari(profil, bolum)
+
+
+def pragma_listesi(ayarlar: Dict[str, Any]) -> List[str]:
+    """
+    Depolama ayarlarından bağlantı başına uygulanacak PRAGMA ifadelerini üretir.
+    """
+    return [f"{anahtar} = {ayarlar[anahtar]}" for anahtar in PRAGMA_ANAHTARLARI]
+
+
+class BakimZamanlayicisi(threading.Thread):
+    """
+    WAL dosyasını düzenli aralıklarla veritabanına aktarır (checkpoint)
+    ve sorgu planlayıcı istatistiklerini günceller (PRAGMA optimize).
+
+    Sürekli sipariş girişi sırasında WAL dosyasının sınırsız büyümesini önler.
+    """
+
+    def __init__(self, havuz, ayarlar: Dict[str, Any]) -> None:
+        super().__init__(name="BakimZamanlayicisi", daemon=True)
+        self.havuz = havuz
+        self.checkpoint_araligi = ayarlar['checkpoint_araligi']
+        self.optimize_araligi = ayarlar['optimize_araligi']
+        self.wal_sinir_bayt = ayarlar['wal_sinir_mb'] * 1024 * 1024
+        self._durdur = threading.Event()
+
+    def run(self) -> None:
+        gorevler = [(aralik, gorev) for aralik, gorev in
+                     ((self.checkpoint_araligi, self.checkpoint), (self.optimize_araligi, self.optimize))
+                     if aralik]
+        if not gorevler:
+            return
+        sonraki = [time.monotonic() + aralik for aralik, _ in gorevler]
+        while not self._durdur.wait(max(0.0, min(sonraki) - time.monotonic())):
+            simdi = time.monotonic()
+            for i, (aralik, gorev) in enumerate(gorevler):
+                if simdi >= sonraki[i]:
+                    try:
+                        gorev()
+                    except Exception:
+                        logger.exception("Veritabanı bakım hatası")
+                    sonraki[i] = simdi + aralik
+
+    def wal_boyutu(self) -> int:
+        wal_dosyasi = f"{self.havuz.db_file}-wal"
+        return os.path.getsize(wal_dosyasi) if os.path.exists(wal_dosyasi) else 0
+
+    def checkpoint(self) -> None:
+        """
+        Okuyucuları bekletmeden WAL içeriğini aktarır; WAL sınırı aşıldıysa dosyayı kırpar.
+        """
+        kip = "TRUNCATE" if self.wal_sinir_bayt and self.wal_boyutu() > self.wal_sinir_bayt else "PASSIVE"
+        with self.havuz.baglanti() as conn:
+            conn.execute(f"PRAGMA wal_checkpoint({kip})").fetchone()
+
+    def optimize(self) -> None:
+        with self.havuz.baglanti() as conn:
+            conn.execute("PRAGMA optimize")
+
+    def durdur(self) -> None:
+        self._durdur.set()
+        if self.is_alive():
+            self.join()
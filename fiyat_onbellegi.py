@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FiyatOnbellegi:
+    """
+    (müşteri, ürün) -> fiyat eşlemesini bellekte tutar.
+
+    Her müşterinin fiyatları kendi sözlüğünde saklanır. Müşteriler en son
+    kullanılma sırasına göre tutulur ve sınır aşılınca en eski müşterinin
+    tüm fiyatları atılır (LRU). Veritabanına yazan işlemler ilgili kayıtları
+    geçersiz kılar; böylece önbellek hiçbir zaman eski fiyat döndürmez.
+
+    Her geçersiz kılma nesil sayacını artırır. Okuma sırasında bir geçersiz
+    kılma olduysa, veritabanından okunan (artık eski olabilecek) fiyatlar
+    önbelleğe yazılmaz.
+    """
+
+    def __init__(self, max_musteri: int = 256) -> None:
+        self.max_musteri = max_musteri
+        self._musteriler: "OrderedDict[Optional[int], Dict[int, float]]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self._nesil = 0
+        self.isabet = 0
+        self.iska = 0
+
+    def getir(self, musteri_id: Optional[int], urun_idler: Iterable[int]) -> Tuple[Dict[int, float], List[int], int]:
+        """
+        Önbellekteki fiyatları, önbellekte bulunmayan ürün ID'lerini ve
+        eksikler veritabanından okunduktan sonra ekle()'ye verilecek nesli döndürür.
+        """
+        bulunanlar: Dict[int, float] = {}
+        eksikler = []
+        with self._kilit:
+            fiyatlar = self._musteriler.get(musteri_id)
+            if fiyatlar is not None:
+                self._musteriler.move_to_end(musteri_id)
+            for urun_id in urun_idler:
+                fiyat = fiyatlar.get(urun_id) if fiyatlar is not None else None
+                if fiyat is None:
+                    eksikler.append(urun_id)
+                else:
+                    bulunanlar[urun_id] = fiyat
+            self.isabet += len(bulunanlar)
+            self.iska += len(eksikler)
+            return bulunanlar, eksikler, self._nesil
+
+    def ekle(self, musteri_id: Optional[int], fiyatlar: Dict[int, float], nesil: int) -> None:
+        with self._kilit:
+            if nesil != self._nesil:
+                return
+            mevcut = self._musteriler.get(musteri_id)
+            if mevcut is None:
+                mevcut = self._musteriler[musteri_id] = {}
+                while len(self._musteriler) > self.max_musteri:
+                    self._musteriler.popitem(last=False)
+            else:
+                self._musteriler.move_to_end(musteri_id)
+            mevcut.update(fiyatlar)
+
+    def urunu_gecersiz_kil(self, urun_id: int) -> None:
+        """
+        Ürünün varsayılan fiyatı değiştiğinde veya ürün silindiğinde tüm müşterilerden çıkarır.
+        """
+        with self._kilit:
+            self._nesil += 1
+            for fiyatlar in self._musteriler.values():
+                fiyatlar.pop(urun_id, None)
+
+    def musteri_urununu_gecersiz_kil(self, musteri_id: int, urun_id: int) -> None:
+        """
+        Müşteriye özel fiyat değiştiğinde yalnızca o (müşteri, ürün) kaydını çıkarır.
+        """
+        with self._kilit:
+            self._nesil += 1
+            fiyatlar = self._musteriler.get(musteri_id)
+            if fiyatlar is not None:
+                fiyatlar.pop(urun_id, None)
+
+    def musteriyi_gecersiz_kil(self, musteri_id: int) -> None:
+        with self._kilit:
+            self._nesil += 1
+            self._musteriler.pop(musteri_id, None)
+
+    def temizle(self) -> None:
+        with self._kilit:
+            self._nesil += 1
+            self._musteriler.clear()
+
+    def istatistikler(self) -> Dict[str, float]:
+        """
+        İsabet/ıska sayaçlarını ve isabet oranını döndürür.
+        """
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                'isabet': self.isabet,
+                'iska': self.iska,
+                'isabet_orani': self.isabet / toplam if toplam else 0.0,
+                'musteri_sayisi': len(self._musteriler),
+                'kayit_sayisi': sum(len(f) for f in self._musteriler.values()),
+            }
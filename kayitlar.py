@@ -0,0 +1,131 @@
+import sqlite3
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar
+
+K = TypeVar('K', bound=tuple)
+
+
+def sutunlar(kayit_tipi: Type[tuple], onek: str = '') -> str:
+    """
+    Kaydın alanlarını SELECT listesi olarak döndürür: sutunlar(Urun, 'u.') -> "u.id, u.kod, ..."
+    """
+    return ", ".join(f"{onek}{alan}" for alan in kayit_tipi._fields)
+
+
+def satir_fabrikasi(kayit_tipi: Type[K]) -> Callable[[sqlite3.Cursor, Sequence], K]:
+    """
+    İmlecin her satırı doğrudan kayıt olarak üretmesi için row_factory döndürür.
+    Sorgu, kaydın alanlarını aynı sırayla seçmelidir (bkz. sutunlar).
+    """
+    kayit_yap = kayit_tipi._make
+    return lambda _, satir: kayit_yap(satir)
+
+
+class Musteri(NamedTuple):
+    id: int
+    ad: str
+    soyad: str
+    telefon: str
+    adres: str
+    email: Optional[str]
+    grup: str
+    notlar: Optional[str]
+    olusturma_tarihi: str
+
+
+class Urun(NamedTuple):
+    id: int
+    kod: str
+    ad: str
+    fiyat: float
+    olusturma_tarihi: str
+
+
+class Siparis(NamedTuple):
+    """
+    Sipariş listesindeki bir satır; müşteri adı birleştirilen tablodan gelir.
+    """
+    id: int
+    siparis_no: str
+    musteri_id: int
+    musteri_adi: str
+    siparis_tarihi: str
+    teslim_tarihi: str
+    toplam_tutar: float
+
+
+class SiparisDetay(NamedTuple):
+    id: int
+    siparis_id: int
+    urun_id: int
+    adet: int
+    birim_fiyat: float
+    iskonto: int
+    toplam_fiyat: float
+
+
+class SiparisKalemi(NamedTuple):
+    """
+    Bir siparişteki tek ürün satırı.
+    Ürün silinmişse ürün kodu ve adı None olur.
+    """
+    id: int
+    urun_id: int
+    urun_kodu: Optional[str]
+    urun_adi: Optional[str]
+    adet: int
+    birim_fiyat: float
+    iskonto: int
+    toplam_fiyat: float
+
+    def etiket(self) -> str:
+        return f"{self.urun_kodu} - {self.urun_adi} ({self.adet} adet) Fiyat: {self.toplam_fiyat} ₺"
+
+
+
+def siparis_satiri(_: sqlite3.Cursor, satir: Sequence) -> Tuple[tuple, Optional[SiparisKalemi]]:
+    """
+    Geçmiş sorgularının row_factory'si: sipariş alanlarını ve kalemi doğrudan
+    SiparisKalemi olarak döndürür; kalemsiz siparişin boş satırında kalem None'dır.
+    Sorgu Database.SIPARIS_SATIRI_SECIMI sırasıyla seçmelidir.
+    """
+    return satir[:6], (SiparisKalemi._make(satir[6:]) if satir[6] is not None else None)
+
+class MusteriSiparisi(NamedTuple):
+    """
+    Müşterinin sipariş geçmişindeki bir sipariş ve kalemleri.
+    """
+    id: int
+    siparis_no: str
+    musteri_id: int
+    siparis_tarihi: str
+    teslim_tarihi: str
+    toplam_tutar: float
+    ad: str
+    soyad: str
+    telefon: str
+    adres: str
+    kalemler: List[SiparisKalemi]
+
+
+class MusteriOzeti(NamedTuple):
+    """
+    Müşterinin tüm siparişlerinin özeti; toplam_kurus kuruş cinsinden cirodur (bkz. ozetler.CIRO_KURUS).
+    """
+    musteri_id: int
+    siparis_sayisi: int
+    toplam_kurus: int
+    son_siparis_tarihi: Optional[str]
+
+
+class UrunOzeti(NamedTuple):
+    urun_id: int
+    kalem_sayisi: int
+    satilan_adet: int
+    toplam_kurus: int
+
+
+class GunlukSatis(NamedTuple):
+    tarih: str
+    siparis_sayisi: int
+    kalem_sayisi: int
+    toplam_kurus: int
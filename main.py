@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QTabWidget, QLabel, QHBoxLayout, QPushButton, QSpacerItem, 
                              QSizePolicy, QLineEdit, QDialog, QMessageBox, QFrame, QListWidget, QStackedWidget)
@@ -10,7 +11,11 @@ from pathlib import Path
 from musteri_yonetimi import MusteriYonetimi
 from urun_yonetimi import UrunYonetimi
 from siparis_yonetimi import SiparisYonetimi
+from raporlar import RaporYonetimi
 from database import Database
+from depolama import ayarlardan_depolama_ayarlari
+from sorgu_yurutucu import SorguYurutucu
+from yedekleme import YedeklemeZamanlayicisi, yedekleme_ayarlari
 
 # Yardımcı fonksiyon: Paketlenmiş (frozen) ortamda kaynak dosyaların konumunu belirler.
 def resource_path(relative_path):
@@ -20,6 +25,12 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")  # Paketlenmemişse mevcut çalışma dizini.
     return os.path.join(base_path, relative_path)
 
+def ayarlari_yukle(ayarlar_dosyasi):
+    if ayarlar_dosyasi.exists():
+        with open(ayarlar_dosyasi, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
 class LoginDialog(QDialog):
     def __init__(self):
         super().__init__()
@@ -85,16 +96,14 @@ class LoginDialog(QDialog):
 
     def tema_ayarlarini_yukle(self):
         self.ayarlar_dosyasi = Path("ayarlar.json")
-        if self.ayarlar_dosyasi.exists():
-            with open(self.ayarlar_dosyasi, "r", encoding="utf-8") as f:
-                ayarlar = json.load(f)
-                self.tema = ayarlar.get("tema", "light")
-        else:
-            self.tema = "light"
+        self.ayarlar = ayarlari_yukle(self.ayarlar_dosyasi)
+        self.tema = self.ayarlar.get("tema", "light")
 
     def tema_ayarlarini_kaydet(self):
+        # Dosyadaki diğer ayarlar (ör. veritabanı profili) korunur
+        self.ayarlar["tema"] = self.tema
         with open(self.ayarlar_dosyasi, "w", encoding="utf-8") as f:
-            json.dump({"tema": self.tema}, f)
+            json.dump(self.ayarlar, f)
 
     def tema_degistir(self):
         if self.tema == "light":
@@ -220,22 +229,26 @@ class AnaPencere(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowIcon(QIcon(resource_path("white.png")))
-        self.db = Database()
         self.tema_ayarlarini_yukle()
+        self.db = Database(depolama=ayarlardan_depolama_ayarlari(self.ayarlar))
+        # Ürün seçiminde kullanılan bellek dizini açılışta arka planda kurulur
+        self.yurutucu = SorguYurutucu(self.db, self)
+        self.yurutucu.calistir('urun_indeksi', self.db.urun_indeksini_olustur)
+        # Çevrimiçi yedekler ayrı bağlantılarla alınır; sipariş girişi beklemez
+        self.yedekleyici = YedeklemeZamanlayicisi(self.db.db_file, yedekleme_ayarlari(self.ayarlar))
+        self.yedekleyici.start()
         self.pencere_ayarlarini_yukle()
 
     def tema_ayarlarini_yukle(self):
         self.ayarlar_dosyasi = Path("ayarlar.json")
-        if self.ayarlar_dosyasi.exists():
-            with open(self.ayarlar_dosyasi, "r", encoding="utf-8") as f:
-                ayarlar = json.load(f)
-                self.tema = ayarlar.get("tema", "light")
-        else:
-            self.tema = "light"
+        self.ayarlar = ayarlari_yukle(self.ayarlar_dosyasi)
+        self.tema = self.ayarlar.get("tema", "light")
 
     def tema_ayarlarini_kaydet(self):
+        # Dosyadaki diğer ayarlar (ör. veritabanı profili) korunur
+        self.ayarlar["tema"] = self.tema
         with open(self.ayarlar_dosyasi, "w", encoding="utf-8") as f:
-            json.dump({"tema": self.tema}, f)
+            json.dump(self.ayarlar, f)
 
     def tema_degistir(self):
         if self.tema == "light":
@@ -287,11 +300,13 @@ class AnaPencere(QMainWindow):
         sidebar.addItem("Müşteri Yönetimi")
         sidebar.addItem("Ürün Yönetimi")
         sidebar.addItem("Sipariş Yönetimi")
+        sidebar.addItem("Satış Raporları")
         
         self.pages = QStackedWidget()
         self.pages.addWidget(self.sekme_olustur(MusteriYonetimi(self.db)))
         self.pages.addWidget(self.sekme_olustur(UrunYonetimi(self.db)))
         self.pages.addWidget(self.sekme_olustur(SiparisYonetimi(self.db)))
+        self.pages.addWidget(self.sekme_olustur(RaporYonetimi(self.db)))
         sidebar.currentRowChanged.connect(self.pages.setCurrentIndex)
         
         ana_layout.addWidget(sidebar)
@@ -306,6 +321,14 @@ class AnaPencere(QMainWindow):
         animasyon.setEasingCurve(QEasingCurve.Type.OutBounce)
         animasyon.start()
 
+    def closeEvent(self, event):
+        # Arka plandaki sorgular bitmeden bağlantılar kapatılmaz
+        SorguYurutucu.hepsini_durdur()
+        # Süren bir yedek iptal edilir; yarım yedek diskte bırakılmaz
+        self.yedekleyici.durdur()
+        self.db.kapat()
+        super().closeEvent(event)
+
     def sekme_olustur(self, modül_widget):
         sekme = QWidget()
         sekme_duzen = QVBoxLayout()
@@ -314,6 +337,8 @@ class AnaPencere(QMainWindow):
         return sekme
 
 def main():
+    # Arka plan bakım ve yedekleme işlerinin kayıtları (hatalar dahil) stderr'e yazılır
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     uygulama = QApplication(sys.argv)
     
     # Uygulamanın genel ikonunu ayarla
@@ -1,13 +1,17 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QTableWidget, QTableWidgetItem, QLineEdit, 
                            QFormLayout, QMessageBox, QComboBox, QTextEdit)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+from arama import ARAMA_GECIKMESI_MS
 from siparis_gecmisi import SiparisGecmisiDialog
+from sorgu_yurutucu import SorguYurutucu
 
 class MusteriYonetimi(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        self.yurutucu = SorguYurutucu(self.db, self)
+        self._yukleme_yarim_kaldi = False
         self.musteri_arayuzu_olustur()
         self.tabloyu_guncelle()
         
@@ -21,7 +25,12 @@ class MusteriYonetimi(QWidget):
         # Arama kutusu
         self.arama_kutusu = QLineEdit()
         self.arama_kutusu.setPlaceholderText("Müşteri Ara...")
-        self.arama_kutusu.textChanged.connect(self.musteri_ara)
+        # Her tuşta değil, yazma durunca aranır
+        self.arama_zamanlayicisi = QTimer(self)
+        self.arama_zamanlayicisi.setSingleShot(True)
+        self.arama_zamanlayicisi.setInterval(ARAMA_GECIKMESI_MS)
+        self.arama_zamanlayicisi.timeout.connect(self.tabloyu_guncelle)
+        self.arama_kutusu.textChanged.connect(self.arama_zamanlayicisi.start)
         ust_duzen.addWidget(self.arama_kutusu)
         
         # Butonlar
@@ -55,16 +64,44 @@ class MusteriYonetimi(QWidget):
         self.setLayout(ana_duzen)
     
     def tabloyu_guncelle(self):
+        """Müşterileri arka planda yükler; sonuç gelince tablo doldurulur"""
+        self._yukleme_yarim_kaldi = False
+        arama_metni = self.arama_kutusu.text().strip()
+        if arama_metni:
+            # Yalnızca en iyi eşleşmeler yüklenir
+            self.yurutucu.calistir('tablo', self.db.musteri_ara, arama_metni,
+                                   tamamlandi=self.tabloyu_doldur, hata=self.yukleme_hatasi)
+        else:
+            self.yurutucu.calistir('tablo', self.db.musterileri_getir,
+                                   tamamlandi=self.tabloyu_doldur, hata=self.yukleme_hatasi)
+
+    def tabloyu_doldur(self, musteriler):
         self.tablo.setRowCount(0)
-        musteriler = self.db.musterileri_getir()
         for musteri in musteriler:
             satir = self.tablo.rowCount()
             self.tablo.insertRow(satir)
-            self.tablo.setItem(satir, 0, QTableWidgetItem(str(musteri['id'])))
-            self.tablo.setItem(satir, 1, QTableWidgetItem(musteri['ad']))
-            self.tablo.setItem(satir, 2, QTableWidgetItem(musteri['soyad']))
-            self.tablo.setItem(satir, 3, QTableWidgetItem(musteri['telefon']))
-            self.tablo.setItem(satir, 4, QTableWidgetItem(musteri['adres']))
+            self.tablo.setItem(satir, 0, QTableWidgetItem(str(musteri.id)))
+            self.tablo.setItem(satir, 1, QTableWidgetItem(musteri.ad))
+            self.tablo.setItem(satir, 2, QTableWidgetItem(musteri.soyad))
+            self.tablo.setItem(satir, 3, QTableWidgetItem(musteri.telefon))
+            self.tablo.setItem(satir, 4, QTableWidgetItem(musteri.adres))
+            # Müşteri kaydını satırda sakla
+            self.tablo.item(satir, 0).setData(Qt.ItemDataRole.UserRole, musteri)
+
+    def yukleme_hatasi(self, hata):
+        QMessageBox.critical(self, "Hata", f"Müşteriler yüklenirken bir hata oluştu:\n{str(hata)}")
+
+    def hideEvent(self, event):
+        # Sekme değiştirilince yarım kalan yükleme iptal edilir, sekmeye dönünce yenilenir
+        if self.yurutucu.bekliyor('tablo'):
+            self.yurutucu.iptal_et('tablo')
+            self._yukleme_yarim_kaldi = True
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._yukleme_yarim_kaldi:
+            self.tabloyu_guncelle()
     
     def yeni_musteri_formu(self):
         self.musteri_form = MusteriFormu(parent=self)
@@ -73,8 +110,7 @@ class MusteriYonetimi(QWidget):
     def musteri_duzenle(self):
         secili_satir = self.tablo.currentRow()
         if secili_satir >= 0:
-            musteri_id = int(self.tablo.item(secili_satir, 0).text())
-            musteri = next((m for m in self.db.musterileri_getir() if m['id'] == musteri_id), None)
+            musteri = self.tablo.item(secili_satir, 0).data(Qt.ItemDataRole.UserRole)
             if musteri:
                 self.musteri_form = MusteriFormu(parent=self, musteri=musteri)
                 self.musteri_form.show()
@@ -86,26 +122,23 @@ class MusteriYonetimi(QWidget):
         if secili_satir >= 0:
             musteri_id = int(self.tablo.item(secili_satir, 0).text())
             cevap = QMessageBox.question(self, "Onay", 
-                                       "Bu müşteriyi silmek istediğinizden emin misiniz?",
+                                       "Bu müşteriyi silmek istediğinizden emin misiniz?\n"
+                                       "Müşterinin özel fiyatları da silinecektir. "
+                                       "Siparişi olan müşteriler silinemez.",
                                        QMessageBox.StandardButton.Yes | 
                                        QMessageBox.StandardButton.No)
             
             if cevap == QMessageBox.StandardButton.Yes:
-                self.db.musteri_sil(musteri_id)
-                self.tabloyu_guncelle()
+                self.yurutucu.calistir(
+                    f'sil-{musteri_id}', self.db.musteri_sil, musteri_id,
+                    tamamlandi=lambda _: self.tabloyu_guncelle(), hata=self.silme_hatasi
+                )
         else:
             QMessageBox.warning(self, "Uyarı", "Lütfen silinecek müşteriyi seçin!")
-    
-    def musteri_ara(self, arama_metni):
-        for i in range(self.tablo.rowCount()):
-            satir_gizle = True
-            for j in range(self.tablo.columnCount()):
-                item = self.tablo.item(i, j)
-                if item and arama_metni.lower() in item.text().lower():
-                    satir_gizle = False
-                    break
-            self.tablo.setRowHidden(i, satir_gizle)
-    
+
+    def silme_hatasi(self, hata):
+        QMessageBox.critical(self, "Hata", f"Müşteri silinirken bir hata oluştu:\n{str(hata)}")
+
     def siparis_gecmisini_goster(self):
         secili_satir = self.tablo.currentRow()
         if secili_satir >= 0:
@@ -147,18 +180,17 @@ class MusteriFormu(QWidget):
         duzen.addRow("Notlar:", self.notlar_input)
         
         if self.musteri:
-            self.ad_input.setText(self.musteri['ad'])
-            self.soyad_input.setText(self.musteri['soyad'])
-            self.telefon_input.setText(self.musteri['telefon'])
-            self.adres_input.setText(self.musteri['adres'])
-            if 'email' in self.musteri:
-                self.email_input.setText(self.musteri['email'])
-            if 'grup' in self.musteri:
-                index = self.grup_input.findText(self.musteri['grup'])
-                if index >= 0:
-                    self.grup_input.setCurrentIndex(index)
-            if 'notlar' in self.musteri:
-                self.notlar_input.setText(self.musteri['notlar'])
+            self.ad_input.setText(self.musteri.ad)
+            self.soyad_input.setText(self.musteri.soyad)
+            self.telefon_input.setText(self.musteri.telefon)
+            self.adres_input.setText(self.musteri.adres)
+            if self.musteri.email:
+                self.email_input.setText(self.musteri.email)
+            index = self.grup_input.findText(self.musteri.grup)
+            if index >= 0:
+                self.grup_input.setCurrentIndex(index)
+            if self.musteri.notlar:
+                self.notlar_input.setText(self.musteri.notlar)
         
         self.kaydet_butonu = QPushButton("Kaydet")
         self.kaydet_butonu.clicked.connect(self.kaydet)
@@ -178,7 +210,7 @@ class MusteriFormu(QWidget):
         }
         
         if self.musteri:  # Düzenleme modu
-            self.parent.db.musteri_guncelle(self.musteri['id'], musteri_bilgileri)
+            self.parent.db.musteri_guncelle(self.musteri.id, musteri_bilgileri)
         else:  # Yeni müşteri modu
             self.parent.db.musteri_ekle(musteri_bilgileri)
         
@@ -0,0 +1,162 @@
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Müşteri, ürün ve gün bazında satış özetleri. Tutarlar tam sayı kuruştur
+# (bkz. para.py); ekleme ve silmelerde farklar toplanırken kayan nokta hatası birikmez.
+OZET_TABLOLARI: List[str] = [
+    '''
+    CREATE TABLE IF NOT EXISTS musteri_ozetleri (
+        musteri_id INTEGER PRIMARY KEY,
+        siparis_sayisi INTEGER NOT NULL,
+        toplam_kurus INTEGER NOT NULL,
+        son_siparis_tarihi DATE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS urun_ozetleri (
+        urun_id INTEGER PRIMARY KEY,
+        kalem_sayisi INTEGER NOT NULL,
+        satilan_adet INTEGER NOT NULL,
+        toplam_kurus INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS gunluk_satislar (
+        tarih DATE PRIMARY KEY,
+        siparis_sayisi INTEGER NOT NULL,
+        kalem_sayisi INTEGER NOT NULL,
+        toplam_kurus INTEGER NOT NULL
+    )
+    ''',
+]
+
+# Ciro, kalemlerin toplam_fiyat toplamıdır: satır iskontosu düşülmüş, genel iskonto ve
+# KDV hariç tutar. Özetler ve satış analizi (satis_analizi.py) aynı tanımı kullanır;
+# genel iskonto ve KDV içeren siparisler.toplam_tutar ciroya katılmaz.
+CIRO_KURUS = "CAST(round(sd.toplam_fiyat * 100) AS INTEGER)"
+
+# Her özetin kaynak tablolardan hesaplanışı. {kosul} siparisler s üzerinde bir filtredir,
+# {isaret} satırların eklenmesi için 1, silinmesi için -1 olur. {sema} okunan şemadır;
+# arşiv dosyaları da aynı tabloları taşır. Kalemsiz siparişler de sayılsın diye kalemler
+# LEFT JOIN ile eklenir; siparişler kalemlerle çoğaldığından DISTINCT sayılır.
+_OZET_SORGULARI: Dict[str, str] = {
+    'musteri_ozetleri': f'''
+        SELECT s.musteri_id, {{isaret}} * COUNT(DISTINCT s.id),
+               {{isaret}} * COALESCE(SUM({CIRO_KURUS}), 0), MAX(s.siparis_tarihi)
+        FROM {{sema}}.siparisler s
+        LEFT JOIN {{sema}}.siparis_detaylari sd ON sd.siparis_id = s.id
+        WHERE {{kosul}}
+        GROUP BY s.musteri_id
+    ''',
+    'urun_ozetleri': f'''
+        SELECT sd.urun_id, {{isaret}} * COUNT(*), {{isaret}} * SUM(sd.adet),
+               {{isaret}} * SUM({CIRO_KURUS})
+        FROM {{sema}}.siparisler s
+        JOIN {{sema}}.siparis_detaylari sd ON sd.siparis_id = s.id
+        WHERE {{kosul}}
+        GROUP BY sd.urun_id
+    ''',
+    'gunluk_satislar': f'''
+        SELECT s.siparis_tarihi, {{isaret}} * COUNT(DISTINCT s.id), {{isaret}} * COUNT(sd.id),
+               {{isaret}} * COALESCE(SUM({CIRO_KURUS}), 0)
+        FROM {{sema}}.siparisler s
+        LEFT JOIN {{sema}}.siparis_detaylari sd ON sd.siparis_id = s.id
+        WHERE {{kosul}}
+        GROUP BY s.siparis_tarihi
+    ''',
+}
+
+_OZET_BIRLESTIRMELERI: Dict[str, str] = {
+    'musteri_ozetleri': '''
+        ON CONFLICT (musteri_id) DO UPDATE SET
+            siparis_sayisi = siparis_sayisi + excluded.siparis_sayisi,
+            toplam_kurus = toplam_kurus + excluded.toplam_kurus,
+            son_siparis_tarihi = MAX(son_siparis_tarihi, excluded.son_siparis_tarihi)
+    ''',
+    'urun_ozetleri': '''
+        ON CONFLICT (urun_id) DO UPDATE SET
+            kalem_sayisi = kalem_sayisi + excluded.kalem_sayisi,
+            satilan_adet = satilan_adet + excluded.satilan_adet,
+            toplam_kurus = toplam_kurus + excluded.toplam_kurus
+    ''',
+    'gunluk_satislar': '''
+        ON CONFLICT (tarih) DO UPDATE SET
+            siparis_sayisi = siparis_sayisi + excluded.siparis_sayisi,
+            kalem_sayisi = kalem_sayisi + excluded.kalem_sayisi,
+            toplam_kurus = toplam_kurus + excluded.toplam_kurus
+    ''',
+}
+
+# Özetlerin anahtar sütunu ve satırın boşaldığını gösteren sayaç sütunu
+_OZET_SUTUNLARI: Dict[str, Tuple[str, str]] = {
+    'musteri_ozetleri': ('musteri_id', 'siparis_sayisi'),
+    'urun_ozetleri': ('urun_id', 'kalem_sayisi'),
+    'gunluk_satislar': ('tarih', 'siparis_sayisi'),
+}
+
+
+def _farklari_isle(conn: sqlite3.Connection, kosul: str, parametreler: Sequence, isaret: int,
+                   sema: str = 'main') -> None:
+    for tablo, sorgu in _OZET_SORGULARI.items():
+        conn.execute(f"INSERT INTO {tablo} {sorgu.format(kosul=kosul, isaret=isaret, sema=sema)} "
+                     f"{_OZET_BIRLESTIRMELERI[tablo]}", parametreler)
+
+
+def ozetlere_ekle(conn: sqlite3.Connection, kosul: str, parametreler: Sequence = ()) -> None:
+    """
+    Koşula uyan (yeni eklenmiş) siparişleri özetlere ekler.
+    Siparişlerle aynı yazma işlemi içinde çağrılmalıdır.
+    """
+    _farklari_isle(conn, kosul, parametreler, 1)
+
+
+@contextmanager
+def ozetlerden_dusulerek(conn: sqlite3.Connection, kosul: str, parametreler: Sequence = ()) -> Iterator[None]:
+    """
+    Koşula uyan siparişleri silmeden önce özetlerden düşer; blok içinde siparişler silinir.
+
+    Son sipariş tarihi farkla güncellenemediği için blok bittikten sonra
+    etkilenen müşteriler için indeksten, arşivler dahil yeniden okunur.
+    Boşalan özet satırları silinir.
+    """
+    musteri_idler = [satir[0] for satir in conn.execute(
+        f"SELECT DISTINCT s.musteri_id FROM main.siparisler s WHERE {kosul}", parametreler)]
+    _farklari_isle(conn, kosul, parametreler, -1)
+    yield
+    conn.executemany('''
+        UPDATE musteri_ozetleri
+        SET son_siparis_tarihi = (SELECT MAX(siparis_tarihi) FROM tum_siparisler WHERE musteri_id = ?)
+        WHERE musteri_id = ?
+    ''', ((musteri_id, musteri_id) for musteri_id in musteri_idler))
+    for tablo, (_, sayac) in _OZET_SUTUNLARI.items():
+        conn.execute(f"DELETE FROM {tablo} WHERE {sayac} <= 0")
+
+
+def ozetleri_yeniden_olustur(conn: sqlite3.Connection, semalar: Sequence[str] = ('main',)) -> Dict[str, int]:
+    """
+    Özetleri verilen şemalardaki siparişlerden yeniden hesaplar ve tablo başına
+    düzeltilen (eksik, fazla veya farklı) satır sayısını döndürür.
+
+    Arşivlenmiş siparişler özetlerde kalır; arşivler bağlıysa şemaları da verilmelidir.
+    """
+    for tablo in _OZET_SORGULARI:
+        conn.execute(f"DROP TABLE IF EXISTS temp.{tablo}_eski")
+        conn.execute(f"CREATE TEMP TABLE {tablo}_eski AS SELECT * FROM main.{tablo}")
+        conn.execute(f"DELETE FROM main.{tablo}")
+    for sema in semalar:
+        _farklari_isle(conn, '1 = 1', (), 1, sema)
+
+    duzeltmeler = {}
+    for tablo in _OZET_SORGULARI:
+        anahtar = _OZET_SUTUNLARI[tablo][0]
+        eski = f"temp.{tablo}_eski"
+        duzeltmeler[tablo] = conn.execute(f'''
+            SELECT COUNT(*) FROM (
+                SELECT {anahtar} FROM (SELECT * FROM main.{tablo} EXCEPT SELECT * FROM {eski})
+                UNION
+                SELECT {anahtar} FROM (SELECT * FROM {eski} EXCEPT SELECT * FROM main.{tablo})
+            )
+        ''').fetchone()[0]
+        conn.execute(f"DROP TABLE {eski}")
+    return duzeltmeler
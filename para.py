@@ -0,0 +1,143 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, List, NamedTuple, Union
+
+# Tutarlar bellekte tam sayı kuruş olarak tutulur; veritabanına ve ekrana
+# yalnızca sınırda çevrilir. Böylece toplamlar kayan nokta hatası biriktirmez.
+KURUS = 100
+
+
+def kurus_yap(tutar: Union[int, float, str, Decimal]) -> int:
+    """
+    TL tutarını en yakın kuruşa yuvarlayarak tam sayı kuruşa çevirir (yarım yukarı).
+    Kayan nokta değerler önce ondalık gösterimlerinden okunur: 0.285 -> 29 kuruş.
+    """
+    if isinstance(tutar, float):
+        tutar = repr(tutar)
+    return int((Decimal(tutar) * KURUS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def metinden_kurus(metin: str) -> int:
+    """
+    "1.234,50 ₺", "1234.50 ₺" veya "1234,5" gibi kullanıcı metnini kuruşa çevirir.
+    Geçersiz metinde ValueError yükseltir.
+    """
+    temiz = metin.replace("₺", "").replace(" ", "").strip()
+    if "," in temiz:
+        # Virgül varsa ondalık ayırıcıdır, noktalar binlik ayırıcıdır
+        temiz = temiz.replace(".", "").replace(",", ".")
+    try:
+        return kurus_yap(temiz)
+    except InvalidOperation:
+        raise ValueError(f"Geçersiz tutar: {metin}") from None
+
+
+def tl(kurus: int) -> float:
+    """
+    Kuruşu veritabanına yazılacak iki ondalıklı TL değerine çevirir.
+    """
+    return kurus / KURUS
+
+
+def bicimle(kurus: int) -> str:
+    isaret = "-" if kurus < 0 else ""
+    lira, kalan = divmod(abs(kurus), KURUS)
+    return f"{isaret}{lira}.{kalan:02d} ₺"
+
+
+def yuzde_uygula(kurus: int, yuzde: int) -> int:
+    """
+    Tutarın yüzdesini kuruşa yarım yukarı yuvarlayarak döndürür; tam sayı işlemiyle hesaplanır.
+    """
+    pay = abs(kurus) * yuzde
+    sonuc = (pay * 2 + 100) // 200
+    return -sonuc if kurus < 0 else sonuc
+
+
+def satir_toplami(birim_fiyat: int, adet: int, iskonto: int) -> int:
+    """
+    Satır tutarı: birim fiyat x adet, satır iskontosu düşülmüş ve kuruşa yuvarlanmış.
+    """
+    brut = birim_fiyat * adet
+    return brut - yuzde_uygula(brut, iskonto)
+
+
+class HesapSatiri(NamedTuple):
+    urun_id: int
+    adet: int
+    iskonto: int
+    birim_fiyat: int
+    # Müşteri fiyatından gelen birim fiyat; elle değiştirilmiş satırları ayırt etmek için
+    liste_fiyati: int
+    toplam: int
+
+
+class SiparisHesabi:
+    """
+    Siparişin bellekteki tutar modeli.
+
+    Satırlar kuruş cinsinden tutulur ve ara toplam her değişiklikte yalnızca
+    değişen satırın farkıyla güncellenir. Genel iskonto, KDV ve genel toplam
+    ara toplamdan hesaplandığı için her düzenleme satır sayısından bağımsızdır.
+
+    Yuvarlama sırası sabittir: satır toplamı, genel iskonto ve KDV ayrı ayrı
+    kuruşa yuvarlanır; genel toplam bu yuvarlanmış tutarların toplamıdır.
+    """
+
+    def __init__(self, kdv_orani: int = 20, genel_iskonto_orani: int = 0) -> None:
+        self.satirlar: List[HesapSatiri] = []
+        self.ara_toplam = 0
+        self.kdv_orani = kdv_orani
+        self.genel_iskonto_orani = genel_iskonto_orani
+
+    def __len__(self) -> int:
+        return len(self.satirlar)
+
+    def satir_ekle(self, urun_id: int, birim_fiyat: int, adet: int = 1, iskonto: int = 0) -> HesapSatiri:
+        satir = HesapSatiri(urun_id, adet, iskonto, birim_fiyat, birim_fiyat,
+                            satir_toplami(birim_fiyat, adet, iskonto))
+        self.satirlar.append(satir)
+        self.ara_toplam += satir.toplam
+        return satir
+
+    def satiri_guncelle(self, indeks: int, **degisiklikler: int) -> HesapSatiri:
+        """
+        Satırın adet, iskonto, birim_fiyat veya liste_fiyati alanlarını değiştirir
+        ve satır toplamını yeniden hesaplar.
+        """
+        eski = self.satirlar[indeks]
+        satir = eski._replace(**degisiklikler)
+        satir = satir._replace(toplam=satir_toplami(satir.birim_fiyat, satir.adet, satir.iskonto))
+        self.satirlar[indeks] = satir
+        self.ara_toplam += satir.toplam - eski.toplam
+        return satir
+
+    def fiyatlari_uygula(self, fiyatlar: Dict[int, int]) -> List[int]:
+        """
+        Birim fiyatı elle değiştirilmemiş satırlara ürün ID'si -> kuruş eşlemesindeki
+        fiyatları tek geçişte uygular ve değişen satırların indekslerini döndürür.
+        """
+        degisenler = []
+        for indeks, satir in enumerate(self.satirlar):
+            yeni_fiyat = fiyatlar.get(satir.urun_id)
+            if satir.birim_fiyat != satir.liste_fiyati or yeni_fiyat is None or yeni_fiyat == satir.birim_fiyat:
+                continue
+            toplam = satir_toplami(yeni_fiyat, satir.adet, satir.iskonto)
+            self.satirlar[indeks] = satir._replace(birim_fiyat=yeni_fiyat, liste_fiyati=yeni_fiyat, toplam=toplam)
+            self.ara_toplam += toplam - satir.toplam
+            degisenler.append(indeks)
+        return degisenler
+
+    def satir_sil(self, indeks: int) -> None:
+        self.ara_toplam -= self.satirlar.pop(indeks).toplam
+
+    @property
+    def genel_iskonto(self) -> int:
+        return yuzde_uygula(self.ara_toplam, self.genel_iskonto_orani)
+
+    @property
+    def kdv(self) -> int:
+        return yuzde_uygula(self.ara_toplam - self.genel_iskonto, self.kdv_orani)
+
+    @property
+    def genel_toplam(self) -> int:
+        return self.ara_toplam - self.genel_iskonto + self.kdv
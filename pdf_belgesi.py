@@ -0,0 +1,353 @@
+import math
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from PIL import Image
+from reportlab import rl_config
+from reportlab.lib.colors import Color
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm, inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from kayitlar import MusteriSiparisi
+
+TEMEL_DIZIN = os.path.dirname(os.path.abspath(__file__))
+LOGO_DOSYASI = "black.png"
+LOGO_BOYUTU = 3 * cm
+LOGO_DPI = 200
+
+BASLIK_METNI = "DUA&MİSS SİPARİŞ FORMU"
+SUTUNLAR: Sequence[Tuple[str, float]] = (
+    ("Kalem", 6 * cm),
+    ("Sipariş Tarihi", 3 * cm),
+    ("Teslim Tarihi", 3 * cm),
+    ("Adet", 2 * cm),
+    ("Birim Fiyat", 3 * cm),
+    ("Toplam", 3 * cm),
+)
+TABLO_X = 1 * cm
+TABLO_GENISLIGI = sum(genislik for _, genislik in SUTUNLAR)
+SATIR_YUKSEKLIGI = 0.7 * cm
+BASLIK_SATIRI_YUKSEKLIGI = 0.9 * cm
+HUCRE_BOSLUGU = 5
+# Tablonun ilk sayfada ve sonraki sayfalarda başladığı yükseklik; altta alt bilgi çizgisinin üstünde biter
+ILK_SAYFA_TABLO_UST = A4[1] - 10 * cm
+DIGER_SAYFA_TABLO_UST = A4[1] - 3 * cm
+TABLO_ALT = 2 * cm
+
+LACIVERT = Color(0.2, 0.3, 0.4)
+KOYU_LACIVERT = Color(0.1, 0.2, 0.4)
+CIZGI = Color(0.8, 0.8, 0.8)
+SATIR_ZEMINLERI = (Color(1, 1, 1), Color(0.97, 0.98, 1.0))
+
+Satir = Tuple[str, str, str, str, str, str]
+
+# Görüntü akışları ikili yazılır. ASCII85 kodlaması yalnızca 7 bitlik aktarım için
+# gerekir; reportlab'in saf Python kodlayıcısı belge başına sürenin çoğunu alıyordu.
+rl_config.useA85 = 0
+
+
+@lru_cache(maxsize=None)
+def fontlari_kaydet() -> None:
+    """
+    Belgede kullanılan Roboto yazı tiplerini reportlab'e tanıtır.
+    Yazı tipi dosyaları süreç başına bir kez okunur; sonraki çağrılar önbellekten döner.
+    """
+    for ad, dosya in (("Roboto-Bold", "Roboto-Bold.ttf"), ("Roboto", "Roboto-Regular.ttf")):
+        yol = os.path.join(TEMEL_DIZIN, dosya)
+        if not os.path.exists(yol):
+            raise FileNotFoundError(f"Font dosyası bulunamadı: {yol}")
+        pdfmetrics.registerFont(TTFont(ad, yol))
+
+
+@lru_cache(maxsize=None)
+def _logo_goruntusu() -> Optional[ImageReader]:
+    """
+    Logoyu süreç başına bir kez okur; logo dosyası yoksa None döner.
+    Çözülmüş görüntü ImageReader içinde tutulur ve her belgede yeniden okunmaz.
+    """
+    yol = os.path.join(TEMEL_DIZIN, LOGO_DOSYASI)
+    if not os.path.exists(yol):
+        return None
+    goruntu = Image.open(yol)
+    # Logo basılacağı boyuttan büyükse çözünürlüğü düşürülür; her belgede daha az piksel sıkıştırılır
+    piksel = round(LOGO_BOYUTU / inch * LOGO_DPI)
+    goruntu.thumbnail((piksel, piksel))
+    return ImageReader(goruntu)
+
+
+def _sayfa_kapasitesi(tablo_ust: float) -> int:
+    return int((tablo_ust - BASLIK_SATIRI_YUKSEKLIGI - TABLO_ALT) // SATIR_YUKSEKLIGI)
+
+
+ILK_SAYFA_KAPASITESI = _sayfa_kapasitesi(ILK_SAYFA_TABLO_UST)
+DIGER_SAYFA_KAPASITESI = _sayfa_kapasitesi(DIGER_SAYFA_TABLO_UST)
+
+
+def sayfa_sayisi(satir_sayisi: int) -> int:
+    """
+    Satır sayısı bilinen bir ekstrenin kaç sayfa tutacağını döndürür.
+    Satır yüksekliği sabit olduğundan sayfalar çizilmeden önce hesaplanabilir.
+    """
+    if satir_sayisi <= ILK_SAYFA_KAPASITESI:
+        return 1
+    return 1 + math.ceil((satir_sayisi - ILK_SAYFA_KAPASITESI) / DIGER_SAYFA_KAPASITESI)
+
+
+def ekstre_satirlari(siparisler: Iterable[MusteriSiparisi]) -> Iterator[Satir]:
+    """
+    Siparişlerin kalemlerini tablo satırlarına çevirir; siparişler tükendikçe okunur.
+    """
+    for siparis in siparisler:
+        for kalem in siparis.kalemler:
+            yield (
+                f"{kalem.urun_kodu} - {kalem.urun_adi}",
+                siparis.siparis_tarihi,
+                siparis.teslim_tarihi,
+                str(kalem.adet),
+                f"{float(kalem.birim_fiyat):.2f} ₺",
+                f"{float(kalem.toplam_fiyat):.2f} ₺",
+            )
+
+
+class EkstreBelgesi:
+    """
+    Müşteri sipariş ekstresini sayfa sayfa çizen belge oluşturucu.
+
+    Satırlar bir yineleyiciden okunur ve doğrudan sayfaya yazılır; tablo
+    bellekte kurulmaz. Her sayfada tablo başlığı tekrarlanır ve satır
+    yüksekliği sabit olduğundan toplam sayfa sayısı önceden bilinir.
+    Sayfa içerikleri sıkıştırılarak tutulur. Zemin, ilk sayfa başlığı ve logo
+    belgeye bir kez form olarak eklenir; logo ve yazı tipleri süreç boyunca
+    önbellekte tutulduğundan belgeler arasında yeniden okunmaz.
+    """
+
+    def __init__(self, hedef: Union[str, BinaryIO], musteri, belge_no: str, satir_sayisi: int) -> None:
+        fontlari_kaydet()
+        self.pdf = canvas.Canvas(hedef, pagesize=A4, pageCompression=1)
+        self.pdf.setTitle(f"Sipariş Ekstresi {belge_no}")
+        self.musteri = musteri
+        self.belge_no = belge_no
+        self.toplam_sayfa = sayfa_sayisi(satir_sayisi)
+        self.sayfa_no = 0
+        self._y = 0.0
+        self._satir_no = 0
+        self._metin = None
+        self._sablonlari_olustur()
+
+    def olustur(self, satirlar: Iterable[Satir]) -> int:
+        """
+        Satırları yazar, belgeyi kaydeder ve sayfa sayısını döndürür.
+        """
+        self._sayfa_ac()
+        for satir in satirlar:
+            # Sayfa sonu, sayfa_sayisi ile aynı kapasitelere göre satır sayılarak belirlenir
+            kapasite = ILK_SAYFA_KAPASITESI if self.sayfa_no == 1 else DIGER_SAYFA_KAPASITESI
+            if self._satir_no >= kapasite:
+                self._sayfa_kapat()
+                self._sayfa_ac()
+            self._satir_ciz(satir)
+        self._sayfa_kapat()
+        self.pdf.save()
+        return self.sayfa_no
+
+    def _sablonlari_olustur(self) -> None:
+        """
+        Sayfalarda değişmeyen çizimleri belgeye bir kez form (XObject) olarak ekler.
+        Sayfalar bu formlara yalnızca başvurur; zemin her sayfada yeniden çizilmez.
+        """
+        genislik, yukseklik = A4
+        pdf = self.pdf
+
+        pdf.beginForm("SayfaZemini")
+        pdf.setFillColor(Color(0.98, 0.98, 1.0))
+        pdf.rect(0, 0, genislik, yukseklik, fill=True, stroke=False)
+        pdf.setStrokeColor(CIZGI)
+        pdf.setLineWidth(0.5)
+        pdf.line(1.5 * cm, 1.5 * cm, genislik - 1.5 * cm, 1.5 * cm)
+        pdf.endForm()
+
+        pdf.beginForm("IlkSayfaSablonu")
+        # Üst Banner
+        banner_height = 4.5 * cm
+        pdf.setFillColor(Color(0.85, 0.92, 1.0))
+        pdf.rect(0, yukseklik - banner_height, genislik, banner_height, fill=True, stroke=False)
+        # Banner altı için gradient benzeri efekt
+        pdf.setFillColor(Color(0.7, 0.7, 0.7, 0.3))
+        pdf.rect(0, yukseklik - banner_height - 0.2 * cm, genislik, 0.2 * cm, fill=True, stroke=False)
+
+        # Logo (varsa)
+        # Şablon form olduğundan görüntü belgeye bir kez eklenir
+        logo = _logo_goruntusu()
+        if logo is not None:
+            pdf.drawImage(logo, 1 * cm, yukseklik - 4 * cm, width=LOGO_BOYUTU, height=LOGO_BOYUTU, mask='auto')
+
+        # Başlık
+        pdf.setFillColor(KOYU_LACIVERT)
+        pdf.setFont("Roboto-Bold", 26)
+        pdf.drawCentredString(genislik / 2, yukseklik - 2.5 * cm, BASLIK_METNI)
+
+        # Müşteri Bilgileri Kartı
+        card_x, card_y, card_width, card_height = self._kart_alani()
+        pdf.setFillColor(Color(0.95, 0.98, 1.0))
+        pdf.roundRect(card_x, card_y, card_width, card_height, 10, fill=True, stroke=False)
+
+        pdf.setFillColor(KOYU_LACIVERT)
+        pdf.setFont("Roboto-Bold", 14)
+        pdf.drawString(card_x + 0.5 * cm, card_y + card_height - 1 * cm, "MÜŞTERİ BİLGİLERİ")
+        pdf.setStrokeColor(Color(0.7, 0.7, 0.7))
+        pdf.setLineWidth(0.5)
+        pdf.line(card_x + 0.5 * cm, card_y + card_height - 1.2 * cm,
+                 card_x + card_width - 0.5 * cm, card_y + card_height - 1.2 * cm)
+
+        pdf.setFont("Roboto-Bold", 11)
+        pdf.setFillColor(Color(0.3, 0.3, 0.3))
+        y_pos = card_y + card_height - 1.5 * cm
+        for etiket in ("Ad Soyad:", "Telefon:", "Adres:"):
+            pdf.drawString(card_x + 0.5 * cm, y_pos, etiket)
+            y_pos -= 0.7 * cm
+
+        # Sipariş Detayları Başlığı
+        pdf.setFillColor(LACIVERT)
+        pdf.setFont("Roboto-Bold", 16)
+        pdf.drawString(1.5 * cm, yukseklik - 9 * cm, "SİPARİŞ DETAYLARI")
+        pdf.endForm()
+
+        pdf.beginForm("DevamSablonu")
+        pdf.setFillColor(KOYU_LACIVERT)
+        pdf.setFont("Roboto-Bold", 14)
+        pdf.drawString(1.5 * cm, yukseklik - 1.8 * cm, BASLIK_METNI)
+        pdf.endForm()
+
+    @staticmethod
+    def _kart_alani() -> Tuple[float, float, float, float]:
+        genislik, yukseklik = A4
+        return 1.5 * cm, yukseklik - 8 * cm, genislik - 3 * cm, 3 * cm
+
+    def _sayfa_ac(self) -> None:
+        self.sayfa_no += 1
+        genislik, yukseklik = A4
+        pdf = self.pdf
+        pdf.doForm("SayfaZemini")
+        # Tablo metinleri sayfa boyunca tek bir metin nesnesinde toplanır ve sayfa kapanırken çizilir
+        self._metin = pdf.beginText()
+        if self.sayfa_no == 1:
+            pdf.doForm("IlkSayfaSablonu")
+            self._ilk_sayfa_bilgileri()
+            self._y = ILK_SAYFA_TABLO_UST
+        else:
+            pdf.doForm("DevamSablonu")
+            pdf.setFillColor(Color(0.3, 0.3, 0.3))
+            pdf.setFont("Roboto", 10)
+            pdf.drawRightString(genislik - 1.5 * cm, yukseklik - 1.8 * cm,
+                                f"{self.musteri.ad} {self.musteri.soyad}")
+            self._y = DIGER_SAYFA_TABLO_UST
+        self._tablo_basligi()
+
+    def _ilk_sayfa_bilgileri(self) -> None:
+        """
+        İlk sayfa şablonunun üzerine belgeye özgü tarih ve müşteri bilgilerini yazar.
+        """
+        genislik, yukseklik = A4
+        pdf = self.pdf
+
+        # Tarih
+        pdf.setFillColor(Color(0.3, 0.3, 0.3))
+        pdf.setFont("Roboto", 12)
+        pdf.drawRightString(genislik - 1.5 * cm, yukseklik - 3.7 * cm,
+                            f"Tarih: {datetime.now().strftime('%d.%m.%Y')}")
+
+        card_x, card_y, _, card_height = self._kart_alani()
+        pdf.setFont("Roboto", 11)
+        pdf.setFillColor(Color(0.2, 0.2, 0.2))
+        y_pos = card_y + card_height - 1.5 * cm
+        for deger in (f"{self.musteri.ad} {self.musteri.soyad}", self.musteri.telefon, self.musteri.adres):
+            pdf.drawString(card_x + 3 * cm, y_pos, deger)
+            y_pos -= 0.7 * cm
+
+    def _tablo_basligi(self) -> None:
+        ust = self._y
+        self._y -= BASLIK_SATIRI_YUKSEKLIGI
+        self.pdf.setFillColor(LACIVERT)
+        self.pdf.rect(TABLO_X, self._y, TABLO_GENISLIGI, BASLIK_SATIRI_YUKSEKLIGI, fill=True, stroke=False)
+        self._metin.setFillColor(Color(1, 1, 1))
+        self._hucreleri_yaz([ad for ad, _ in SUTUNLAR], self._y, ust, "Roboto-Bold", 12)
+        self._metin.setFillColor(LACIVERT)
+        self._satir_no = 0
+
+    def _satir_ciz(self, satir: Satir) -> None:
+        ust = self._y
+        self._y -= SATIR_YUKSEKLIGI
+        self.pdf.setFillColor(SATIR_ZEMINLERI[self._satir_no % 2])
+        self.pdf.rect(TABLO_X, self._y, TABLO_GENISLIGI, SATIR_YUKSEKLIGI, fill=True, stroke=False)
+        self._hucreleri_yaz(satir, self._y, ust, "Roboto", 11)
+        self._satir_no += 1
+
+    def _hucreleri_yaz(self, degerler: Sequence[str], alt: float, ust: float, font: str, boyut: int) -> None:
+        metin = self._metin
+        metin.setFont(font, boyut)
+        # Metin satırın dikey ortasına yerleştirilir
+        taban = alt + (ust - alt - boyut * 0.7) / 2
+        x = TABLO_X
+        for sutun, ((_, genislik), deger) in enumerate(zip(SUTUNLAR, degerler)):
+            deger, metin_genisligi = self._sigdir(deger, genislik - 2 * HUCRE_BOSLUGU, font, boyut)
+            if sutun == 0:
+                metin.setTextOrigin(x + HUCRE_BOSLUGU, taban)
+            else:
+                metin.setTextOrigin(x + (genislik - metin_genisligi) / 2, taban)
+            metin.textOut(deger)
+            x += genislik
+
+    @staticmethod
+    def _sigdir(metin: str, genislik: float, font: str, boyut: int) -> Tuple[str, float]:
+        """
+        Hücreye sığmayan metni sonuna üç nokta koyarak kısaltır; satır yüksekliği sabit kalır.
+        Metni ve çizim genişliğini döndürür.
+        """
+        metin_genisligi = pdfmetrics.stringWidth(metin, font, boyut)
+        if metin_genisligi <= genislik:
+            return metin, metin_genisligi
+        while metin and pdfmetrics.stringWidth(metin + "…", font, boyut) > genislik:
+            metin = metin[:-1]
+        return metin + "…", pdfmetrics.stringWidth(metin + "…", font, boyut)
+
+    def _sayfa_kapat(self) -> None:
+        pdf = self.pdf
+        genislik, _ = A4
+        pdf.drawText(self._metin)
+        # Tablo ızgarası yalnızca bu sayfada çizilen satırları kapsar
+        ust = ILK_SAYFA_TABLO_UST if self.sayfa_no == 1 else DIGER_SAYFA_TABLO_UST
+        pdf.setStrokeColor(CIZGI)
+        pdf.setLineWidth(0.5)
+        x_konumlari = [TABLO_X]
+        for _, sutun_genisligi in SUTUNLAR:
+            x_konumlari.append(x_konumlari[-1] + sutun_genisligi)
+        for x in x_konumlari:
+            pdf.line(x, self._y, x, ust)
+        y_konumlari = [ust, ust - BASLIK_SATIRI_YUKSEKLIGI]
+        y_konumlari.extend(ust - BASLIK_SATIRI_YUKSEKLIGI - (i + 1) * SATIR_YUKSEKLIGI
+                           for i in range(self._satir_no))
+        for y in y_konumlari:
+            pdf.line(x_konumlari[0], y, x_konumlari[-1], y)
+
+        pdf.setFont("Roboto", 9)
+        pdf.setFillColor(Color(0.5, 0.5, 0.5))
+        pdf.drawRightString(genislik - 1.5 * cm, 1 * cm,
+                            f"Sayfa {self.sayfa_no}/{self.toplam_sayfa} • Belge No: {self.belge_no}")
+        pdf.showPage()
+
+
+def ekstre_olustur(hedef: Union[str, BinaryIO], musteri, siparisler: Iterable[MusteriSiparisi],
+                   satir_sayisi: int, belge_no: str) -> int:
+    """
+    Siparişlerin kalemlerinden çok sayfalı bir ekstre PDF'i oluşturur ve sayfa sayısını döndürür.
+
+    siparisler bir yineleyici olabilir (ör. db.sayfalari_akit ile sayfa sayfa okunan
+    siparişler); satir_sayisi toplam kalem sayısıdır ve "Sayfa n/N" için kullanılır.
+    """
+    return EkstreBelgesi(hedef, musteri, belge_no, satir_sayisi).olustur(ekstre_satirlari(siparisler))
@@ -0,0 +1,39 @@
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QPointF, QRectF, Qt
+from PyQt6.QtGui import QPainter
+from PyQt6.QtPdf import QPdfDocument
+from PyQt6.QtPrintSupport import QPrinter
+
+
+def bellekten_pdf_yukle(veri: bytes, parent: QObject = None) -> QPdfDocument:
+    """
+    Bellekteki PDF verisini diske yazmadan QPdfDocument olarak açar.
+
+    QPdfDocument sayfaları okudukça tampondan okur; bu yüzden tampon belgenin
+    alt nesnesi yapılır ve belgeyle birlikte silinir.
+    """
+    belge = QPdfDocument(parent)
+    tampon = QBuffer(belge)
+    tampon.setData(QByteArray(veri))
+    tampon.open(QIODevice.OpenModeFlag.ReadOnly)
+    belge.load(tampon)
+    return belge
+
+
+def belgeyi_yazdir(belge: QPdfDocument, printer: QPrinter) -> None:
+    """
+    Belgenin sayfalarını yazıcı çözünürlüğünde çizerek yazıcıya gönderir.
+    """
+    painter = QPainter()
+    if not painter.begin(printer):
+        raise RuntimeError("Yazıcı başlatılamadı")
+    try:
+        for sayfa in range(belge.pageCount()):
+            if sayfa:
+                printer.newPage()
+            alan = printer.pageRect(QPrinter.Unit.DevicePixel)
+            # Sayfa, oranı korunarak yazdırılabilir alana sığdırılır
+            boyut = belge.pagePointSize(sayfa).scaled(alan.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            goruntu = belge.render(sayfa, boyut.toSize())
+            painter.drawImage(QRectF(QPointF(0, 0), boyut), goruntu)
+    finally:
+        painter.end()
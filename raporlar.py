@@ -0,0 +1,147 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox,
+                             QTableWidget, QTableWidgetItem, QLabel, QDateEdit, QCheckBox,
+                             QHeaderView, QMessageBox)
+from PyQt6.QtCore import Qt, QDate
+from para import bicimle
+from satis_analizi import (ISKONTO_BANDI_ETIKETLERI, RAPOR_BOYUTLARI, satis_verisi_yukle)
+from sorgu_yurutucu import SorguYurutucu
+
+# Ciroya göre sıralanan boyutlarda tabloda gösterilen en fazla satır
+RAPOR_SATIR_SINIRI = 200
+
+
+# ------------------------- Satış Raporları -------------------------
+class RaporYonetimi(QWidget):
+    def __init__(self, db):
+        super().__init__()
+        self.db = db
+        self.veri = None
+        self.yurutucu = SorguYurutucu(self.db, self)
+        self.rapor_arayuzu_olustur()
+
+    def rapor_arayuzu_olustur(self):
+        ana_duzen = QVBoxLayout()
+
+        # Tarih aralığı ve rapor boyutu
+        ust_duzen = QHBoxLayout()
+        self.tum_zamanlar = QCheckBox("Tüm zamanlar")
+        self.tum_zamanlar.toggled.connect(self.tarih_secimi_degisti)
+        ust_duzen.addWidget(self.tum_zamanlar)
+
+        bugun = QDate.currentDate()
+        self.baslangic_tarihi = QDateEdit(QDate(bugun.year(), 1, 1))
+        self.baslangic_tarihi.setCalendarPopup(True)
+        self.bitis_tarihi = QDateEdit(bugun)
+        self.bitis_tarihi.setCalendarPopup(True)
+        ust_duzen.addWidget(QLabel("Başlangıç:"))
+        ust_duzen.addWidget(self.baslangic_tarihi)
+        ust_duzen.addWidget(QLabel("Bitiş:"))
+        ust_duzen.addWidget(self.bitis_tarihi)
+
+        self.yukle_butonu = QPushButton("Verileri Yükle")
+        self.yukle_butonu.clicked.connect(self.verileri_yukle)
+        ust_duzen.addWidget(self.yukle_butonu)
+        ust_duzen.addStretch()
+
+        ust_duzen.addWidget(QLabel("Gruplama:"))
+        self.boyut_combo = QComboBox()
+        for ad, (baslik, _) in RAPOR_BOYUTLARI.items():
+            self.boyut_combo.addItem(baslik, ad)
+        self.boyut_combo.currentIndexChanged.connect(self.raporu_hesapla)
+        ust_duzen.addWidget(self.boyut_combo)
+        ana_duzen.addLayout(ust_duzen)
+
+        # Rapor tablosu
+        self.tablo = QTableWidget()
+        self.tablo.setColumnCount(5)
+        self.tablo.setHorizontalHeaderLabels(["", "Ciro", "Adet", "Kalem Sayısı", "Pay"])
+        self.tablo.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        ana_duzen.addWidget(self.tablo)
+
+        self.ozet_label = QLabel("Rapor için tarih aralığını seçip verileri yükleyin.")
+        self.ozet_label.setStyleSheet("font-weight: bold;")
+        ana_duzen.addWidget(self.ozet_label)
+
+        self.setLayout(ana_duzen)
+
+    def tarih_secimi_degisti(self, tum_zamanlar):
+        self.baslangic_tarihi.setEnabled(not tum_zamanlar)
+        self.bitis_tarihi.setEnabled(not tum_zamanlar)
+
+    def verileri_yukle(self):
+        """Satış kalemlerini arka planda analiz dizilerine yükler"""
+        if self.tum_zamanlar.isChecked():
+            baslangic = bitis = None
+        else:
+            baslangic = self.baslangic_tarihi.date().toString("yyyy-MM-dd")
+            bitis = self.bitis_tarihi.date().toString("yyyy-MM-dd")
+        self.ozet_label.setText("Satış verileri yükleniyor...")
+        self.yukle_butonu.setEnabled(False)
+        self.yurutucu.iptal_et('rapor')
+        self.yurutucu.calistir('veri', satis_verisi_yukle, self.db, baslangic, bitis,
+                               tamamlandi=self.veri_yuklendi, hata=self.rapor_hatasi)
+
+    def veri_yuklendi(self, veri):
+        self.veri = veri
+        self.yukle_butonu.setEnabled(True)
+        self.raporu_hesapla()
+
+    def rapor_hatasi(self, hata):
+        self.yukle_butonu.setEnabled(True)
+        self.ozet_label.setText("Rapor hazırlanamadı.")
+        QMessageBox.critical(self, "Hata", f"Rapor hazırlanırken bir hata oluştu:\n{str(hata)}")
+
+    def raporu_hesapla(self):
+        """Yüklü veriyi seçili boyuta göre arka planda gruplar; veritabanı yeniden okunmaz"""
+        if self.veri is None:
+            return
+        boyut = self.boyut_combo.currentData()
+        self.yurutucu.calistir('rapor', self.rapor_satirlari, self.veri, boyut,
+                               tamamlandi=self.raporu_goster, hata=self.rapor_hatasi)
+
+    def rapor_satirlari(self, veri, boyut):
+        """Raporu hesaplar ve tabloya yazılacak (etiket, ciro, adet, kalem sayısı) satırlarını döndürür"""
+        baslik, grupla = RAPOR_BOYUTLARI[boyut]
+        rapor = grupla(veri)
+        # Dönemler tarih sırasıyla, diğer boyutlar ciroya göre en yüksekten gösterilir
+        if boyut not in ('gun', 'ay', 'yil'):
+            rapor = rapor.en_yuksek(RAPOR_SATIR_SINIRI)
+        anahtarlar = rapor.anahtar.tolist()
+
+        if boyut == 'musteri':
+            adlar = self.db.musteri_adlari_getir(anahtarlar)
+            etiketler = [adlar.get(anahtar, f"Silinmiş müşteri #{anahtar}") for anahtar in anahtarlar]
+        elif boyut == 'urun':
+            adlar = self.db.urun_etiketleri_getir(anahtarlar)
+            etiketler = [adlar.get(anahtar, f"Silinmiş ürün #{anahtar}") for anahtar in anahtarlar]
+        elif boyut == 'grup':
+            etiketler = [veri.gruplar[anahtar] for anahtar in anahtarlar]
+        elif boyut == 'iskonto':
+            etiketler = [ISKONTO_BANDI_ETIKETLERI[anahtar] for anahtar in anahtarlar]
+        else:
+            etiketler = [str(anahtar) for anahtar in rapor.anahtar]
+        satirlar = list(zip(etiketler, rapor.ciro.tolist(), rapor.adet.tolist(), rapor.kalem_sayisi.tolist()))
+        return baslik, satirlar
+
+    def raporu_goster(self, sonuc):
+        baslik, satirlar = sonuc
+        toplam_ciro = self.veri.toplam_ciro
+        self.tablo.setHorizontalHeaderItem(0, QTableWidgetItem(baslik))
+        self.tablo.setUpdatesEnabled(False)
+        self.tablo.setRowCount(len(satirlar))
+        for satir, (etiket, ciro, adet, kalem_sayisi) in enumerate(satirlar):
+            pay = ciro / toplam_ciro * 100 if toplam_ciro else 0
+            degerler = (etiket, bicimle(ciro), f"{adet:,}", f"{kalem_sayisi:,}", f"%{pay:.1f}")
+            for sutun, deger in enumerate(degerler):
+                hucre = QTableWidgetItem(deger)
+                if sutun:
+                    hucre.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tablo.setItem(satir, sutun, hucre)
+        self.tablo.setUpdatesEnabled(True)
+
+        self.ozet_label.setText(
+            f"Toplam Ciro: {bicimle(toplam_ciro)}    "
+            f"Satılan Adet: {self.veri.toplam_adet:,}    "
+            f"Kalem Sayısı: {len(self.veri):,}"
+        )
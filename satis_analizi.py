@@ -0,0 +1,181 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Analiz sütunları ve dizi tipleri; tutar kalemin kuruş cinsinden cirosudur
+# (bkz. ozetler.CIRO_KURUS), raporların cirosu özet tablolarıyla aynı tanımdadır.
+# Adet ve tutar, bincount ağırlığı olarak her seferinde dönüştürülmemeleri için
+# float64 tutulur; tam sayı değerler 2**53'e kadar kesindir.
+SUTUN_TIPLERI: Sequence[Tuple[str, type]] = (
+    ('gun', np.int32),         # 1970-01-01'den bu yana gün
+    ('musteri_id', np.int32),
+    ('urun_id', np.int32),
+    ('adet', np.float64),
+    ('iskonto', np.int16),
+    ('tutar', np.float64),
+)
+_KALEM_TIPI = np.dtype(list(SUTUN_TIPLERI))
+
+# İskonto bantlarının alt sınırları (yüzde) ve etiketleri
+ISKONTO_BANTLARI = (0, 1, 6, 11, 21)
+ISKONTO_BANDI_ETIKETLERI = ("İskontosuz", "%1-5", "%6-10", "%11-20", "%21 ve üzeri")
+
+TANIMSIZ_GRUP = "Tanımsız"
+
+
+class SatisVerisi:
+    """
+    Satış kalemlerinin sütun sütun NumPy dizileri.
+
+    Her kalem tüm dizilerde aynı indekstedir. Müşteri grubu kalem başına
+    tutulmaz; grup_kodlari dizisi müşteri ID'sinden grup koduna bakılır.
+    """
+
+    def __init__(self, sutunlar: Dict[str, np.ndarray], gruplar: List[str], grup_kodlari: np.ndarray) -> None:
+        self.gun = sutunlar['gun']
+        self.musteri_id = sutunlar['musteri_id']
+        self.urun_id = sutunlar['urun_id']
+        self.adet = sutunlar['adet']
+        self.iskonto = sutunlar['iskonto']
+        self.tutar = sutunlar['tutar']
+        self.gruplar = gruplar
+        self.grup_kodlari = grup_kodlari
+
+    def __len__(self) -> int:
+        return len(self.tutar)
+
+    @property
+    def toplam_ciro(self) -> int:
+        return int(round(self.tutar.sum()))
+
+    @property
+    def toplam_adet(self) -> int:
+        return int(round(self.adet.sum()))
+
+
+class Rapor(NamedTuple):
+    """
+    Bir boyuta göre gruplanmış satışlar; diziler aynı uzunluktadır.
+    anahtar boyuta göre tarih, ID veya kod dizisidir.
+    """
+    anahtar: np.ndarray
+    ciro: np.ndarray
+    adet: np.ndarray
+    kalem_sayisi: np.ndarray
+
+    def en_yuksek(self, n: int) -> "Rapor":
+        """
+        Ciroya göre en yüksek n satırı azalan sırayla döndürür.
+        """
+        if len(self.ciro) > n:
+            secilen = np.argpartition(-self.ciro, n - 1)[:n]
+        else:
+            secilen = np.arange(len(self.ciro))
+        secilen = secilen[np.argsort(-self.ciro[secilen], kind='stable')]
+        return Rapor(*(dizi[secilen] for dizi in self))
+
+
+def satis_verisi_olustur(parcalar, musteri_gruplari: Dict[int, str]) -> SatisVerisi:
+    """
+    (gün, müşteri_id, ürün_id, adet, iskonto, tutar) satır parçalarını sütun dizilerine çevirir.
+    """
+    parca_dizileri = [np.array(parca, dtype=_KALEM_TIPI) for parca in parcalar]
+    if parca_dizileri:
+        kalemler = np.concatenate(parca_dizileri)
+    else:
+        kalemler = np.empty(0, dtype=_KALEM_TIPI)
+    del parca_dizileri
+    sutunlar = {ad: np.ascontiguousarray(kalemler[ad]) for ad, _ in SUTUN_TIPLERI}
+    del kalemler
+
+    gruplar = sorted(set(musteri_gruplari.values())) + [TANIMSIZ_GRUP]
+    grup_indeksi = {grup: kod for kod, grup in enumerate(gruplar)}
+    # Silinmiş müşterilerin kalemleri "Tanımsız" grubuna düşer
+    en_buyuk_id = max(max(musteri_gruplari, default=0), int(sutunlar['musteri_id'].max(initial=0)))
+    grup_kodlari = np.full(en_buyuk_id + 1, len(gruplar) - 1, dtype=np.int32)
+    for musteri_id, grup in musteri_gruplari.items():
+        grup_kodlari[musteri_id] = grup_indeksi[grup]
+    return SatisVerisi(sutunlar, gruplar, grup_kodlari)
+
+
+def satis_verisi_yukle(db, baslangic: Optional[str] = None, bitis: Optional[str] = None) -> SatisVerisi:
+    """
+    Tarih aralığındaki (dahil) satış kalemlerini veritabanından analiz dizilerine yükler.
+    """
+    return satis_verisi_olustur(db.satis_kalemlerini_akit(baslangic, bitis), db.musteri_gruplari_getir())
+
+
+def _topla(anahtar: np.ndarray, veri: SatisVerisi) -> Rapor:
+    """
+    Negatif olmayan tam sayı anahtarlara göre ciro, adet ve kalem sayısını toplar.
+
+    Anahtarlar küçük bir aralıkta olduğundan sıralama yerine bincount kullanılır.
+    Ağırlıklı toplamlar float64 ile yapılır; 2**53 kuruşa kadar tam sayı olarak kesindir.
+    """
+    if len(anahtar) == 0:
+        bos = np.empty(0, dtype=np.int64)
+        return Rapor(bos, bos, bos, bos)
+    en_kucuk = int(anahtar.min())
+    # bincount'un istediği tipe çevirme ve ötelemeyi tek geçişte yapar
+    anahtar = np.subtract(anahtar, en_kucuk, dtype=np.intp)
+    kalem_sayisi = np.bincount(anahtar)
+    dolu = np.flatnonzero(kalem_sayisi)
+    ciro = np.bincount(anahtar, weights=veri.tutar)[dolu]
+    adet = np.bincount(anahtar, weights=veri.adet)[dolu]
+    return Rapor(dolu + en_kucuk, np.rint(ciro).astype(np.int64),
+                 np.rint(adet).astype(np.int64), kalem_sayisi[dolu])
+
+
+def donemlere_gore(veri: SatisVerisi, donem: str = 'ay') -> Rapor:
+    """
+    Ciroyu gün, ay veya yıla göre toplar; anahtar datetime64 dizisidir ve artan sıradadır.
+    """
+    birimler = {'gun': 'D', 'ay': 'M', 'yil': 'Y'}
+    if donem not in birimler:
+        raise ValueError(f"Bilinmeyen dönem: {donem}")
+    birim = birimler[donem]
+    if birim == 'D' or len(veri) == 0:
+        anahtar = veri.gun
+    else:
+        # Takvim dönüşümü kalem başına değil, aralıktaki her gün için bir kez yapılır
+        ilk_gun = int(veri.gun.min())
+        gunler = np.arange(ilk_gun, int(veri.gun.max()) + 1).astype('datetime64[D]')
+        donem_tablosu = gunler.astype(f'datetime64[{birim}]').astype(np.int32)
+        anahtar = donem_tablosu[veri.gun - ilk_gun]
+    rapor = _topla(anahtar, veri)
+    return rapor._replace(anahtar=rapor.anahtar.astype(f'datetime64[{birim}]'))
+
+
+def musterilere_gore(veri: SatisVerisi) -> Rapor:
+    return _topla(veri.musteri_id, veri)
+
+
+def urunlere_gore(veri: SatisVerisi) -> Rapor:
+    return _topla(veri.urun_id, veri)
+
+
+def gruplara_gore(veri: SatisVerisi) -> Rapor:
+    """
+    Ciroyu müşteri grubuna göre toplar; anahtar veri.gruplar içindeki grup kodudur.
+    """
+    return _topla(veri.grup_kodlari[veri.musteri_id], veri)
+
+
+def iskonto_bantlarina_gore(veri: SatisVerisi) -> Rapor:
+    """
+    Ciroyu iskonto bantlarına göre toplar; anahtar ISKONTO_BANTLARI içindeki bant sırasıdır.
+    """
+    bant_tablosu = np.searchsorted(ISKONTO_BANTLARI, np.arange(101), side='right') - 1
+    return _topla(bant_tablosu[np.clip(veri.iskonto, 0, 100)], veri)
+
+
+# Rapor boyutları: ad -> (başlık, gruplama fonksiyonu)
+RAPOR_BOYUTLARI: Dict[str, Tuple[str, Callable[[SatisVerisi], Rapor]]] = {
+    'ay': ("Ay", lambda veri: donemlere_gore(veri, 'ay')),
+    'gun': ("Gün", lambda veri: donemlere_gore(veri, 'gun')),
+    'yil': ("Yıl", lambda veri: donemlere_gore(veri, 'yil')),
+    'musteri': ("Müşteri", musterilere_gore),
+    'urun': ("Ürün", urunlere_gore),
+    'grup': ("Müşteri Grubu", gruplara_gore),
+    'iskonto': ("İskonto Bandı", iskonto_bantlarina_gore),
+}
@@ -0,0 +1,421 @@
+import os
+import sqlite3
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+from arama import fts_katlama_ifadesi
+from arsiv import arsivleri_bul
+from ozetler import OZET_TABLOLARI, ozetleri_yeniden_olustur
+from yedekleme import YEDEKLEME_VARSAYILANLARI, yedek_al
+
+# Bir geçiş adımı ya tek bir SQL ifadesi ya da bağlantıyı alan bir fonksiyondur.
+Adim = Union[str, Callable[[sqlite3.Connection], None]]
+
+
+class Gecis(NamedTuple):
+    surum: int
+    aciklama: str
+    adimlar: Sequence[Adim]
+
+
+def _fts_adimlari(tablo: str, sutunlar: Sequence[str]) -> List[str]:
+    """
+    Tablo için içeriksiz bir FTS5 dizini, onu güncel tutan tetikleyicileri ve
+    mevcut kayıtları dizine ekleyen adımları üretir.
+
+    Dizine katlanmış metin yazıldığı için içerik tablodan okunmaz (content='').
+    Silmede aynı değerler eski satırdan yeniden hesaplanarak 'delete' komutuna verilir.
+    Kısa önekler için ayrı önek dizinleri tutulur; tek harflik arama da hızlıdır.
+    """
+    fts = f"{tablo}_fts"
+    liste = ", ".join(sutunlar)
+
+    def degerler(satir: str) -> str:
+        return ", ".join(fts_katlama_ifadesi(f"{satir}.{sutun}") for sutun in sutunlar)
+
+    ekle = f"INSERT INTO {fts} (rowid, {liste}) VALUES (new.id, {degerler('new')});"
+    sil = f"INSERT INTO {fts} ({fts}, rowid, {liste}) VALUES ('delete', old.id, {degerler('old')});"
+    return [
+        f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {liste}, content='', prefix='1 2 3 4 5', tokenize="unicode61 remove_diacritics 2"
+        )
+        ''',
+        f"CREATE TRIGGER IF NOT EXISTS {tablo}_fts_ekle AFTER INSERT ON {tablo} BEGIN {ekle} END",
+        f"CREATE TRIGGER IF NOT EXISTS {tablo}_fts_sil AFTER DELETE ON {tablo} BEGIN {sil} END",
+        f"CREATE TRIGGER IF NOT EXISTS {tablo}_fts_guncelle AFTER UPDATE ON {tablo} BEGIN {sil} {ekle} END",
+        f"INSERT INTO {fts} (rowid, {liste}) SELECT id, {degerler(tablo)} FROM {tablo}",
+    ]
+
+
+# ON DELETE eylemleriyle yeniden kurulan tablolar, ebeveynlerden önce çocuklar
+# silinecek sırada. Sipariş satırları geçmiş kayıt olduğundan satılmış bir ürünün
+# silinmesi engellenir (RESTRICT); diğer bağlı satırlar ebeveynleriyle silinir
+# (müşteri -> sipariş Geçiş 8'de RESTRICT olur, bkz. _KISITLI_TABLOLAR).
+# Üçüncü alan kopyalanacak satırların koşuludur; yalnızca hiçbir siparişe ait
+# olmayan kalemler ve silinmiş kayıtların özel fiyatları dışarıda kalır.
+_BASAMAKLI_TABLOLAR: List[Tuple[str, str, str]] = [
+    ("siparis_detaylari", '''
+        CREATE TABLE siparis_detaylari (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            siparis_id INTEGER NOT NULL,
+            urun_id INTEGER NOT NULL,
+            adet INTEGER NOT NULL,
+            birim_fiyat DECIMAL(10,2) NOT NULL,
+            iskonto INTEGER NOT NULL DEFAULT 0,
+            toplam_fiyat DECIMAL(10,2) NOT NULL,
+            FOREIGN KEY (siparis_id) REFERENCES siparisler (id) ON DELETE CASCADE,
+            FOREIGN KEY (urun_id) REFERENCES urunler (id) ON DELETE RESTRICT
+        )
+    ''', "siparis_id IN (SELECT id FROM siparisler)"),
+    ("musteri_fiyatlari", '''
+        CREATE TABLE musteri_fiyatlari (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_id INTEGER NOT NULL,
+            urun_id INTEGER NOT NULL,
+            ozel_fiyat DECIMAL(10,2) NOT NULL,
+            FOREIGN KEY (musteri_id) REFERENCES musteriler (id) ON DELETE CASCADE,
+            FOREIGN KEY (urun_id) REFERENCES urunler (id) ON DELETE CASCADE,
+            UNIQUE(musteri_id, urun_id)
+        )
+    ''', "musteri_id IN (SELECT id FROM musteriler) AND urun_id IN (SELECT id FROM urunler)"),
+    ("siparisler", '''
+        CREATE TABLE siparisler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            siparis_no TEXT NOT NULL UNIQUE,
+            musteri_id INTEGER NOT NULL,
+            siparis_tarihi DATE NOT NULL,
+            teslim_tarihi DATE NOT NULL,
+            toplam_tutar DECIMAL(10,2) NOT NULL,
+            FOREIGN KEY (musteri_id) REFERENCES musteriler (id) ON DELETE CASCADE
+        )
+    ''', "1 = 1"),
+]
+
+# Geçiş 8: müşteri silinince siparişleri de silen CASCADE, satılmış ürünlerdeki gibi
+# RESTRICT olur; siparişi olan müşteri silinemez. Sipariş tablosunu yeniden kurmak
+# çocuk tablosunu da gerektirir (bkz. _tablolari_yeniden_kur).
+_KISITLI_TABLOLAR: List[Tuple[str, str, str]] = [
+    _BASAMAKLI_TABLOLAR[0],
+    ("siparisler", '''
+        CREATE TABLE siparisler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            siparis_no TEXT NOT NULL UNIQUE,
+            musteri_id INTEGER NOT NULL,
+            siparis_tarihi DATE NOT NULL,
+            teslim_tarihi DATE NOT NULL,
+            toplam_tutar DECIMAL(10,2) NOT NULL,
+            FOREIGN KEY (musteri_id) REFERENCES musteriler (id) ON DELETE RESTRICT
+        )
+    ''', "1 = 1"),
+]
+
+# Tablolar yeniden kurulurken silinen indeksler
+_SIPARIS_INDEKSLERI: List[str] = [
+    "CREATE INDEX IF NOT EXISTS idx_siparisler_musteri_tarih ON siparisler (musteri_id, siparis_tarihi)",
+    "CREATE INDEX IF NOT EXISTS idx_siparisler_tarih ON siparisler (siparis_tarihi)",
+    "CREATE INDEX IF NOT EXISTS idx_siparisler_toplam ON siparisler (toplam_tutar)",
+    "CREATE INDEX IF NOT EXISTS idx_siparisler_teslim ON siparisler (teslim_tarihi)",
+    "CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_siparis ON siparis_detaylari (siparis_id)",
+    "CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_urun ON siparis_detaylari (urun_id)",
+]
+
+# Geçiş öncesi sahipsiz satırlar: açıklama -> sayım sorgusu. Silinmiş müşteri ve
+# ürünlere ait sipariş kayıtları silinmez; tutarlar ve özetler değişmesin diye
+# yer tutucu müşteri ve ürünlere bağlanır. Diğerleri yeni tablolara kopyalanmaz.
+_SAHIPSIZ_SATIRLAR: Dict[str, str] = {
+    "silinmiş müşterilerin siparişleri (yer tutucu müşteriye bağlandı)": '''
+        SELECT COUNT(*) FROM siparisler WHERE musteri_id NOT IN (SELECT id FROM musteriler)
+    ''',
+    "silinmiş ürünlerin sipariş kalemleri (yer tutucu ürüne bağlandı)": '''
+        SELECT COUNT(*) FROM siparis_detaylari
+        WHERE urun_id NOT IN (SELECT id FROM urunler) AND siparis_id IN (SELECT id FROM siparisler)
+    ''',
+    "hiçbir siparişe ait olmayan kalemler (silindi)": '''
+        SELECT COUNT(*) FROM siparis_detaylari WHERE siparis_id NOT IN (SELECT id FROM siparisler)
+    ''',
+    "silinmiş müşteri veya ürünlerin özel fiyatları (silindi)": '''
+        SELECT COUNT(*) FROM musteri_fiyatlari
+        WHERE musteri_id NOT IN (SELECT id FROM musteriler) OR urun_id NOT IN (SELECT id FROM urunler)
+    ''',
+}
+
+_YER_TUTUCULAR: List[str] = [
+    '''
+    INSERT INTO musteriler (id, ad, soyad, telefon, adres, grup, notlar)
+    SELECT DISTINCT musteri_id, 'Silinmiş müşteri', '#' || musteri_id, '', '', 'Silinmiş',
+           'Şema geçişi 6: siparişleri korumak için oluşturuldu'
+    FROM siparisler WHERE musteri_id NOT IN (SELECT id FROM musteriler)
+    ''',
+    '''
+    INSERT INTO urunler (id, kod, ad, fiyat)
+    SELECT DISTINCT urun_id, 'SILINMIS-' || urun_id, 'Silinmiş ürün #' || urun_id, 0
+    FROM siparis_detaylari
+    WHERE urun_id NOT IN (SELECT id FROM urunler) AND siparis_id IN (SELECT id FROM siparisler)
+    ''',
+]
+
+
+def _sahipsiz_satirlari_duzenle(conn: sqlite3.Connection) -> None:
+    """
+    Yabancı anahtarlar zorlanmadan önce oluşmuş sahipsiz satırları sayar.
+
+    Varsa önce veritabanının doğrulanmış bir yedeği alınır, ardından silinmiş
+    müşteri ve ürünler için yer tutucular oluşturulur ve yapılanlar yazdırılır.
+    """
+    sayilar = {aciklama: conn.execute(sorgu).fetchone()[0] for aciklama, sorgu in _SAHIPSIZ_SATIRLAR.items()}
+    if not any(sayilar.values()):
+        return
+    db_file = next(satir[2] for satir in conn.execute("PRAGMA database_list") if satir[1] == 'main')
+    # Geçiş işlemi henüz bir şey yazmadığı için yedek geçiş öncesi hali taşır
+    yedek = yedek_al(db_file, os.path.join(os.path.dirname(db_file), YEDEKLEME_VARSAYILANLARI['dizin']))
+    for adim in _YER_TUTUCULAR:
+        conn.execute(adim)
+    print(f"Şema geçişi 6 öncesi yedek: {yedek.dizin}")
+    for aciklama, adet in sayilar.items():
+        if adet:
+            print(f"  {adet} {aciklama}")
+
+
+def _ozetleri_arsivlerle_yeniden_olustur(conn: sqlite3.Connection) -> None:
+    """
+    Özetleri arşivlenmiş siparişler dahil yeniden hesaplar.
+
+    Geçişler sırasında arşivler bağlı olmadığından burada eklenir; DETACH işlem
+    içinde yapılamadığı için bağlı kalırlar, havuz onları ilk kullanımda yeniden bağlar.
+    """
+    db_file = next(satir[2] for satir in conn.execute("PRAGMA database_list") if satir[1] == 'main')
+    arsivler = arsivleri_bul(db_file)
+    bagli = {satir[1] for satir in conn.execute("PRAGMA database_list")}
+    for sema, yol in arsivler.items():
+        if sema not in bagli:
+            conn.execute(f"ATTACH DATABASE ? AS {sema}", (yol,))
+    ozetleri_yeniden_olustur(conn, ['main', *arsivler])
+
+
+def _tablolari_yeniden_kur(conn: sqlite3.Connection, tablolar: Sequence[Tuple[str, str, str]]) -> None:
+    """
+    Tabloları yeni tanımlarıyla yeniden kurar ve koşula uyan satırları kopyalar.
+
+    SQLite yabancı anahtarı sonradan değiştiremediği için tablolar yeniden oluşturulur.
+    Yabancı anahtarlar açıkken ve işlem içinde çalışabilmek için eski tablolar önce
+    yeniden adlandırılır; böylece yeni tablolar eski satırlara bağlanmaz ve eski tablolar
+    silinirken basamaklı silme tetiklenmez. Yeniden adlandırma çocuk tabloların
+    başvurularını da değiştirdiğinden bir tablonun çocukları da listede olmalıdır.
+    """
+    for tablo, _, _ in tablolar:
+        conn.execute(f"ALTER TABLE {tablo} RENAME TO {tablo}_eski")
+    # Ebeveynler önce dolsun diye ters sırada oluşturulur ve kopyalanır
+    for tablo, tanim, kosul in reversed(tablolar):
+        conn.execute(tanim)
+        conn.execute(f"INSERT INTO {tablo} SELECT * FROM {tablo}_eski WHERE {kosul}")
+        # AUTOINCREMENT silinmiş son ID'leri yeniden kullanmasın
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (tablo,))
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) SELECT ?, seq FROM sqlite_sequence WHERE name = ?",
+                     (tablo, f"{tablo}_eski"))
+    for tablo, _, _ in tablolar:
+        conn.execute(f"DROP TABLE {tablo}_eski")
+    ihlaller = conn.execute("PRAGMA foreign_key_check").fetchall()
+    if ihlaller:
+        raise sqlite3.IntegrityError(f"Yabancı anahtar ihlalleri kaldı: {ihlaller[:5]}")
+
+
+def _basamakli_silmeye_gec(conn: sqlite3.Connection) -> None:
+    """
+    Sipariş, sipariş satırı ve özel fiyat tablolarını ON DELETE eylemleriyle yeniden kurar.
+    Sahipsiz satırlar için bkz. _SAHIPSIZ_SATIRLAR.
+    """
+    _sahipsiz_satirlari_duzenle(conn)
+    _tablolari_yeniden_kur(conn, _BASAMAKLI_TABLOLAR)
+
+
+def _musteri_silmeyi_kisitla(conn: sqlite3.Connection) -> None:
+    """
+    Siparişlerin müşteri yabancı anahtarını RESTRICT yapar; zaten öyleyse bir şey yapmaz.
+    """
+    eylemler = {satir[6] for satir in conn.execute("PRAGMA foreign_key_list(siparisler)") if satir[2] == 'musteriler'}
+    if eylemler != {'RESTRICT'}:
+        _tablolari_yeniden_kur(conn, _KISITLI_TABLOLAR)
+
+
+# Şema geçişleri sürüm sırasıyla uygulanır. Uygulanmış bir geçiş değiştirilmez;
+# yeni şema değişiklikleri listenin sonuna yeni bir sürüm olarak eklenir.
+GECISLER: List[Gecis] = [
+    Gecis(1, "Sık kullanılan yabancı anahtar ve tarih sütunlarına indeks", [
+        "CREATE INDEX IF NOT EXISTS idx_siparisler_musteri_tarih ON siparisler (musteri_id, siparis_tarihi)",
+        "CREATE INDEX IF NOT EXISTS idx_siparisler_tarih ON siparisler (siparis_tarihi)",
+        "CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_siparis ON siparis_detaylari (siparis_id)",
+        "CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_urun ON siparis_detaylari (urun_id)",
+    ]),
+    Gecis(2, "Sipariş numarası sayacı", [
+        '''
+        CREATE TABLE IF NOT EXISTS sayaclar (
+            ad TEXT PRIMARY KEY,
+            deger INTEGER NOT NULL
+        )
+        ''',
+        # Sayaç mevcut en büyük sipariş numarasından devam eder (tek seferlik tarama)
+        '''
+        INSERT OR IGNORE INTO sayaclar (ad, deger)
+        SELECT 'siparis_no', COALESCE(MAX(CAST(siparis_no AS INTEGER)), 0) FROM siparisler
+        ''',
+    ]),
+    Gecis(3, "Anahtar tabanlı sayfalama için sıralama indeksleri", [
+        "CREATE INDEX IF NOT EXISTS idx_siparisler_toplam ON siparisler (toplam_tutar)",
+        "CREATE INDEX IF NOT EXISTS idx_siparisler_teslim ON siparisler (teslim_tarihi)",
+        "CREATE INDEX IF NOT EXISTS idx_musteriler_ad_soyad ON musteriler (ad, soyad)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_ad ON urunler (ad)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_fiyat ON urunler (fiyat)",
+    ]),
+    Gecis(4, "Müşteri ve ürün araması için FTS5 dizinleri", [
+        *_fts_adimlari("musteriler", ("ad", "soyad", "telefon", "adres")),
+        *_fts_adimlari("urunler", ("kod", "ad")),
+    ]),
+    Gecis(5, "Müşteri, ürün ve günlük satış özet tabloları", [
+        *OZET_TABLOLARI,
+        ozetleri_yeniden_olustur,
+    ]),
+    Gecis(6, "Yabancı anahtarlara ON DELETE eylemleri; sahipsiz satırların düzenlenmesi", [
+        _basamakli_silmeye_gec,
+        # Eski tablolarla silinen indeksler yeniden kurulur
+        *_SIPARIS_INDEKSLERI,
+        # Ürün silinirken özel fiyatları tam tarama yapmadan bulunur
+        "CREATE INDEX IF NOT EXISTS idx_musteri_fiyatlari_urun ON musteri_fiyatlari (urun_id)",
+        ozetleri_yeniden_olustur,
+    ]),
+    # Müşteri ve günlük ciro sipariş toplamından (genel iskonto ve KDV dahil) kalem
+    # toplamına geçer; bkz. ozetler.CIRO_KURUS
+    Gecis(7, "Özet cirolarının kalem tutarlarından yeniden hesaplanması", [
+        _ozetleri_arsivlerle_yeniden_olustur,
+    ]),
+    Gecis(8, "Siparişi olan müşterinin silinmesinin engellenmesi (RESTRICT)", [
+        _musteri_silmeyi_kisitla,
+        *_SIPARIS_INDEKSLERI,
+    ]),
+]
+
+
+# Her indeksin gerçekten kullanıldığını doğrulayan sorgular: (indeks, sorgu, parametreler)
+PLAN_KONTROLLERI: List[Tuple[str, str, tuple]] = [
+    # Geçmiş sorguları arşiv görünümünden okur; koşul her şemaya indirilmeli
+    ("idx_siparisler_musteri_tarih", '''
+        SELECT k.id, k.detay_id, u.kod
+        FROM tum_siparis_satirlari k
+        LEFT JOIN urunler u ON u.id = k.urun_id
+        WHERE k.musteri_id = ?
+        ORDER BY k.siparis_tarihi DESC, k.id DESC, k.detay_id
+    ''', (1,)),
+    # Ekstre için sayfalı sipariş geçmişi: sonraki sayfa indeks aralığından başlamalı
+    ("idx_siparisler_musteri_tarih", '''
+        SELECT k.id, k.detay_id
+        FROM tum_siparis_satirlari k
+        WHERE k.musteri_id = ? AND k.id IN (
+            SELECT id FROM tum_siparisler
+            WHERE musteri_id = ? AND (siparis_tarihi, id) < (?, ?)
+            ORDER BY siparis_tarihi DESC, id DESC
+            LIMIT ?
+        )
+        ORDER BY k.siparis_tarihi DESC, k.id DESC, k.detay_id
+    ''', (1, 1, "2024-01-01", 500, 500)),
+    ("idx_siparisler_tarih", '''
+        SELECT s.siparis_no, s.siparis_tarihi, m.ad || ' ' || m.soyad AS musteri_adi,
+               s.toplam_tutar, s.teslim_tarihi
+        FROM siparisler s
+        JOIN musteriler m ON s.musteri_id = m.id
+        ORDER BY s.siparis_tarihi DESC
+    ''', ()),
+    # Sipariş silinirken basamaklı silmenin satırları bulması
+    ("idx_siparis_detaylari_siparis",
+     "DELETE FROM siparis_detaylari WHERE siparis_id = ?", (1,)),
+    ("idx_musteri_fiyatlari_urun",
+     "DELETE FROM musteri_fiyatlari WHERE urun_id = ?", (1,)),
+    ("idx_siparis_detaylari_urun",
+     "SELECT COUNT(*) FROM siparis_detaylari WHERE urun_id = ?", (1,)),
+    # Anahtar tabanlı sayfalama: derin sayfalar indeks aralığından başlamalı
+    ("idx_siparisler_toplam", '''
+        SELECT s.siparis_no, s.toplam_tutar, s.id
+        FROM siparisler s JOIN musteriler m ON s.musteri_id = m.id
+        WHERE (s.toplam_tutar, s.id) < (?, ?)
+        ORDER BY s.toplam_tutar DESC, s.id DESC
+        LIMIT ?
+    ''', (1000, 500, 500)),
+    ("idx_siparisler_teslim", '''
+        SELECT s.siparis_no, s.teslim_tarihi, s.id
+        FROM siparisler s JOIN musteriler m ON s.musteri_id = m.id
+        WHERE (s.teslim_tarihi, s.id) > (?, ?)
+        ORDER BY s.teslim_tarihi ASC, s.id ASC
+        LIMIT ?
+    ''', ("2024-01-01", 500, 500)),
+    ("idx_musteriler_ad_soyad", '''
+        SELECT *, ad, soyad, id FROM musteriler
+        WHERE (ad, soyad, id) > (?, ?, ?)
+        ORDER BY ad ASC, soyad ASC, id ASC
+        LIMIT ?
+    ''', ("Ad5", "Soyad5", 5, 500)),
+    ("idx_urunler_ad", '''
+        SELECT *, ad, id FROM urunler
+        WHERE (ad, id) > (?, ?)
+        ORDER BY ad ASC, id ASC
+        LIMIT ?
+    ''', ("Ürün 5", 5, 500)),
+    ("idx_urunler_fiyat", '''
+        SELECT *, fiyat, id FROM urunler
+        WHERE (fiyat, id) > (?, ?)
+        ORDER BY fiyat ASC, id ASC
+        LIMIT ?
+    ''', (100, 5, 500)),
+]
+
+
+def mevcut_surum(conn: sqlite3.Connection) -> int:
+    """
+    Veritabanına uygulanmış en son şema sürümünü döndürür.
+    """
+    return conn.execute("SELECT COALESCE(MAX(surum), 0) FROM schema_version").fetchone()[0]
+
+
+def gecisleri_uygula(db) -> int:
+    """
+    Bekleyen şema geçişlerini sırayla uygular ve son sürümü döndürür.
+
+    Her geçiş kendi işleminde çalışır; yarıda kalan bir geçiş geri alınır.
+    Sürüm her işlem içinde yeniden okunduğu için aynı veritabanını açan
+    birden fazla istasyon aynı geçişi iki kez uygulamaz.
+    """
+    with db.transaction(yazma=True) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                surum INTEGER PRIMARY KEY,
+                aciklama TEXT NOT NULL,
+                uygulama_tarihi TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        surum = mevcut_surum(conn)
+
+    for gecis in GECISLER:
+        if gecis.surum <= surum:
+            continue
+        with db.transaction(yazma=True) as conn:
+            if mevcut_surum(conn) >= gecis.surum:
+                continue
+            for adim in gecis.adimlar:
+                if callable(adim):
+                    adim(conn)
+                else:
+                    conn.execute(adim)
+            conn.execute("INSERT INTO schema_version (surum, aciklama) VALUES (?, ?)",
+                         (gecis.surum, gecis.aciklama))
+        surum = gecis.surum
+    return surum
+
+
+def sorgu_planlarini_dogrula(conn: sqlite3.Connection) -> List[str]:
+    """
+    PLAN_KONTROLLERI içindeki her sorgunun beklenen indeksi kullandığını
+    EXPLAIN QUERY PLAN ile denetler; kullanılmayan indekslerin hata mesajlarını döndürür.
+    """
+    hatalar = []
+    for indeks, sorgu, parametreler in PLAN_KONTROLLERI:
+        plan = [satir[-1] for satir in conn.execute(f"EXPLAIN QUERY PLAN {sorgu}", parametreler)]
+        if not any(f"INDEX {indeks}" in adim for adim in plan):
+            hatalar.append(f"{indeks} kullanılmadı: " + " | ".join(plan))
+    return hatalar
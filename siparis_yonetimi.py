@@ -2,22 +2,27 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QTableWidget, QTableWidgetItem, QLineEdit, 
     QFormLayout, QMessageBox, QLabel, QDateEdit,
-    QDialog, QComboBox, QSpinBox, QGridLayout, QMenu
+    QDialog, QComboBox, QSpinBox, QGridLayout, QMenu,
+    QTableView, QHeaderView
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
 from reportlab.pdfgen import canvas
-import tempfile
-import os
+from io import BytesIO
 import sqlite3
+from tablo_modelleri import SiparisTabloModeli
+from sorgu_yurutucu import SorguYurutucu
+from arama import ARAMA_GECIKMESI_MS
+from para import SiparisHesabi, bicimle, kurus_yap, metinden_kurus, tl
+from pdf_goruntuleme import belgeyi_yazdir, bellekten_pdf_yukle
 
 # ------------------------- Sipariş Yönetimi -------------------------
 class SiparisYonetimi(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        self.yurutucu = SorguYurutucu(self.db, self)
         self.siparis_arayuzu_olustur()
-        self.tabloyu_guncelle()
         
     def siparis_arayuzu_olustur(self):
         # Ana düzen
@@ -38,14 +43,16 @@ class SiparisYonetimi(QWidget):
         ust_duzen.addWidget(self.duzenle_butonu)
         ust_duzen.addWidget(self.sil_butonu)
         
-        # Sipariş tablosu
-        self.tablo = QTableWidget()
-        self.tablo.setColumnCount(5)
-        self.tablo.setHorizontalHeaderLabels([
-            "Sipariş No", "Tarih", "Müşteri Adı", 
-            "Toplam Tutar", "Teslim Tarihi"
-        ])
-        self.tablo.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        # Sipariş tablosu: satırlar kaydırıldıkça sayfa sayfa yüklenir
+        self.model = SiparisTabloModeli(self.db, self)
+        self.model.yukleme_hatasi.connect(self.yukleme_hatasi)
+        self.tablo = QTableView()
+        self.tablo.setModel(self.model)
+        self.tablo.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.tablo.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
+        self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tablo.setSortingEnabled(True)
+        self.tablo.sortByColumn(1, Qt.SortOrder.DescendingOrder)
         
         ana_duzen.addLayout(ust_duzen)
         ana_duzen.addWidget(self.tablo)
@@ -53,53 +60,58 @@ class SiparisYonetimi(QWidget):
         self.setLayout(ana_duzen)
     
     def tabloyu_guncelle(self):
-        """Tüm siparişleri veritabanından çekip tabloya ekler"""
-        self.tablo.setRowCount(0)
-        siparisler = self.db.tum_siparisleri_getir()
-        
-        for siparis in siparisler:
-            satir = self.tablo.rowCount()
-            self.tablo.insertRow(satir)
-            
-            self.tablo.setItem(satir, 0, QTableWidgetItem(siparis['siparis_no']))
-            self.tablo.setItem(satir, 1, QTableWidgetItem(siparis['siparis_tarihi']))
-            self.tablo.setItem(satir, 2, QTableWidgetItem(siparis['musteri_adi']))
-            self.tablo.setItem(satir, 3, QTableWidgetItem(f"{float(siparis['toplam_tutar']):.2f} ₺"))
-            self.tablo.setItem(satir, 4, QTableWidgetItem(siparis['teslim_tarihi']))
-        
-        self.tablo.resizeColumnsToContents()
+        """Sipariş listesini veritabanından yeniden yükler"""
+        self.model.yenile()
     
+    def yukleme_hatasi(self, hata):
+        QMessageBox.critical(self, "Hata", f"Siparişler yüklenirken bir hata oluştu:\n{str(hata)}")
+
     def yeni_siparis_formu(self):
         dialog = SiparisFormu(parent=self)
         dialog.exec()
     
     def siparis_duzenle(self):
-        secili_satir = self.tablo.currentRow()
+        secili_satir = self.tablo.currentIndex().row()
         if secili_satir >= 0:
-            siparis_no = self.tablo.item(secili_satir, 0).text()
+            siparis_no = self.model.siparis_no(secili_satir)
             dialog = SiparisFormu(parent=self, siparis_no=siparis_no)
             dialog.exec()
         else:
             QMessageBox.warning(self, "Uyarı", "Lütfen düzenlenecek siparişi seçin!")
     
     def siparis_sil(self):
-        secili_satir = self.tablo.currentRow()
-        if secili_satir >= 0:
-            siparis_no = self.tablo.item(secili_satir, 0).text()
-            cevap = QMessageBox.question(
-                self, "Onay", 
-                "Bu siparişi silmek istediğinizden emin misiniz?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        """Seçili siparişlerin tümünü tek işlemde siler"""
+        secili_satirlar = sorted(indeks.row() for indeks in self.tablo.selectionModel().selectedRows())
+        if not secili_satirlar:
+            QMessageBox.warning(self, "Uyarı", "Lütfen silinecek siparişi seçin!")
+            return
+        siparis_nolar = [self.model.siparis_no(satir) for satir in secili_satirlar]
+        if len(siparis_nolar) == 1:
+            soru = "Bu siparişi silmek istediğinizden emin misiniz?"
+        else:
+            soru = f"Seçili {len(siparis_nolar)} siparişi silmek istediğinizden emin misiniz?"
+        cevap = QMessageBox.question(
+            self, "Onay", soru,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if cevap == QMessageBox.StandardButton.Yes:
+            self.sil_butonu.setEnabled(False)
+            self.yurutucu.calistir(
+                'sil', self.db.siparisleri_sil, siparis_nolar,
+                tamamlandi=self.siparis_silindi, hata=self.silme_hatasi,
+                # İstek iptal edilse de (ör. hepsini_durdur) buton yeniden açılır
+                sonunda=lambda: self.sil_butonu.setEnabled(True)
             )
-            if cevap == QMessageBox.StandardButton.Yes:
-                try:
-                    self.db.siparis_sil(siparis_no)
-                    self.tabloyu_guncelle()
-                    QMessageBox.information(self, "Başarılı", "Sipariş başarıyla silindi.")
-                except Exception as e:
-                    QMessageBox.critical(self, "Hata", f"Sipariş silinirken bir hata oluştu:\n{str(e)}")
+
+    def siparis_silindi(self, silinen):
+        self.tabloyu_guncelle()
+        if silinen == 1:
+            QMessageBox.information(self, "Başarılı", "Sipariş başarıyla silindi.")
         else:
-            QMessageBox.warning(self, "Uyarı", "Lütfen silinecek siparişi seçin!")
+            QMessageBox.information(self, "Başarılı", f"{silinen} sipariş başarıyla silindi.")
+
+    def silme_hatasi(self, hata):
+        QMessageBox.critical(self, "Hata", f"Sipariş silinirken bir hata oluştu:\n{str(hata)}")
 
 # ------------------------- Sipariş Formu -------------------------
 class SiparisFormu(QDialog):
@@ -109,6 +121,8 @@ class SiparisFormu(QDialog):
         self.siparis_no = siparis_no
         self.db = self.parent.db
         self.kdv_orani = 20
+        # Satır tutarları kuruş olarak burada tutulur; tablo yalnızca gösterimdir
+        self.hesap = SiparisHesabi(kdv_orani=self.kdv_orani)
         self._updating = False  # Programatik güncelleme sırasında sinyali yoksaymak için
         self.form_olustur()
         self.musteri_listesini_yukle()
@@ -183,7 +197,7 @@ class SiparisFormu(QDialog):
         
         self.kdv_spin = QSpinBox()
         self.kdv_spin.setRange(0, 100)
-        self.kdv_spin.setValue(20)
+        self.kdv_spin.setValue(self.kdv_orani)
         self.kdv_spin.setSuffix("%")
         self.kdv_spin.valueChanged.connect(self.genel_toplam_guncelle)
         
@@ -221,8 +235,8 @@ class SiparisFormu(QDialog):
         self.musteri_combo.clear()
         self.musteri_combo.addItem("Müşteri Seçin", None)
         for musteri in musteriler:
-            musteri_text = f"{musteri['ad']} {musteri['soyad']} - {musteri['telefon']}"
-            self.musteri_combo.addItem(musteri_text, musteri['id'])
+            musteri_text = f"{musteri.ad} {musteri.soyad} - {musteri.telefon}"
+            self.musteri_combo.addItem(musteri_text, musteri.id)
     
     def musteri_secildi(self, index):
         """Müşteri seçildiğinde bilgileri göster ve sipariş tablosundaki ürün fiyatlarını güncelle"""
@@ -232,46 +246,42 @@ class SiparisFormu(QDialog):
             
         musteri_id = self.musteri_combo.currentData()
         musteriler = self.db.musterileri_getir()
-        musteri = next((m for m in musteriler if m['id'] == musteri_id), None)
+        musteri = next((m for m in musteriler if m.id == musteri_id), None)
         if musteri:
-            bilgi_text = (f"Adres: {musteri['adres']}\n"
-                          f"Telefon: {musteri['telefon']}\n")
+            bilgi_text = (f"Adres: {musteri.adres}\n"
+                          f"Telefon: {musteri.telefon}\n")
             self.musteri_bilgileri.setText(bilgi_text)
             # Müşteri değiştiğinde, ürünlerin birim fiyatlarını da güncelleyelim:
             self.guncelle_urun_fiyatlari()
     
     def guncelle_urun_fiyatlari(self):
-        """Müşteri değişikliğinde, sipariş tablosundaki her ürün için yeni birim fiyat ve satır toplamı hesaplanır."""
+        """
+        Müşteri değişikliğinde, birim fiyatı elle değiştirilmemiş satırlara yeni müşterinin fiyatı uygulanır.
+        Fiyatlar tek sorguda okunur, hesap tek geçişte güncellenir ve tablo bir kez yeniden çizilir.
+        """
         musteri_id = self.musteri_combo.currentData()
-        if not musteri_id:
+        if not musteri_id or not len(self.hesap):
             return
-        for row in range(self.urun_tablosu.rowCount()):
-            urun_id = self.urun_tablosu.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            if not urun_id:
-                continue
-            new_price = self.db.musteri_urun_fiyati_getir(musteri_id, urun_id)
-            # Eğer kullanıcı tarafından el ile değiştirilmemişse
-            current_price_text = self.urun_tablosu.item(row, 4).text()
-            try:
-                current_price = float(current_price_text.replace("₺", "").strip())
-            except Exception:
-                current_price = new_price
-            if abs(current_price - new_price) < 0.01:
-                self.urun_tablosu.item(row, 4).setText(f"{new_price:.2f} ₺")
-                try:
-                    adet = int(self.urun_tablosu.item(row, 3).text())
-                    iskonto = int(self.urun_tablosu.item(row, 2).text())
-                    row_total = (new_price * adet) * (1 - iskonto/100)
-                    self.urun_tablosu.item(row, 5).setText(f"{row_total:.2f} ₺")
-                except Exception:
-                    continue
+        yeni_fiyatlar = self.db.musteri_urun_fiyatlari_getir(
+            musteri_id, {satir.urun_id for satir in self.hesap.satirlar})
+        degisenler = self.hesap.fiyatlari_uygula(
+            {urun_id: kurus_yap(fiyat) for urun_id, fiyat in yeni_fiyatlar.items()})
+        self.urun_tablosu.setUpdatesEnabled(False)
+        try:
+            for row in degisenler:
+                self.satiri_goster(row)
+        finally:
+            self.urun_tablosu.setUpdatesEnabled(True)
         self.genel_toplam_guncelle()
     
     def yeni_siparis_no_olustur(self):
-        """Son sipariş numarasına göre yeni numara oluşturur"""
+        """
+        Sayaçtaki son numaraya göre bir sonraki sipariş numarasını gösterir.
+        Kesin numara kayıt sırasında siparis_ekle tarafından ayrılır.
+        """
         try:
             son_no = self.db.son_siparis_no_getir()
-            yeni_no = str(int(son_no) + 1).zfill(6)
+            yeni_no = str(int(son_no) + 1).zfill(self.db.SIPARIS_NO_HANE)
             return yeni_no
         except:
             return "000001"
@@ -286,25 +296,27 @@ class SiparisFormu(QDialog):
             return
         try:
             siparis_bilgileri = {
-                'siparis_no': self.siparis_no_input.text(),
+                # Yeni siparişlerde numara kayıt işlemi içinde sayaçtan ayrılır
+                'siparis_no': self.siparis_no,
                 'musteri_id': self.musteri_combo.currentData(),
                 'siparis_tarihi': self.siparis_tarihi.date().toString("yyyy-MM-dd"),
                 'teslim_tarihi': self.teslim_tarihi.date().toString("yyyy-MM-dd"),
-                'toplam_tutar': float(self.toplam_label.text().split(":")[1].strip().replace("₺", "").strip())
+                'toplam_tutar': tl(self.hesap.genel_toplam)
             }
-            siparis_detaylari = []
-            for row in range(self.urun_tablosu.rowCount()):
-                detay = {
-                    'urun_id': int(self.urun_tablosu.item(row, 0).data(Qt.ItemDataRole.UserRole)),
-                    'adet': int(self.urun_tablosu.item(row, 3).text()),
-                    'birim_fiyat': float(self.urun_tablosu.item(row, 4).text().replace("₺", "").strip()),
-                    'iskonto': int(self.urun_tablosu.item(row, 2).text()),
-                    'toplam_fiyat': float(self.urun_tablosu.item(row, 5).text().replace("₺", "").strip())
+            siparis_detaylari = [
+                {
+                    'urun_id': satir.urun_id,
+                    'adet': satir.adet,
+                    'birim_fiyat': tl(satir.birim_fiyat),
+                    'iskonto': satir.iskonto,
+                    'toplam_fiyat': tl(satir.toplam)
                 }
-                siparis_detaylari.append(detay)
+                for satir in self.hesap.satirlar
+            ]
             
-            self.db.siparis_ekle(siparis_bilgileri, siparis_detaylari)
-            QMessageBox.information(self, "Başarılı", "Sipariş başarıyla kaydedildi.")
+            _, siparis_no = self.db.siparis_ekle(siparis_bilgileri, siparis_detaylari)
+            self.siparis_no_input.setText(siparis_no)
+            QMessageBox.information(self, "Başarılı", f"Sipariş {siparis_no} numarasıyla kaydedildi.")
             self.parent.tabloyu_guncelle()
             self.close()
         except Exception as e:
@@ -316,102 +328,61 @@ class SiparisFormu(QDialog):
             self.urun_tabloya_ekle(dialog.secilen_urun)
     
     def urun_tabloya_ekle(self, urun, adet=1, iskonto=0):
+        musteri_id = self.musteri_combo.currentData()
+        birim_fiyat = kurus_yap(self.db.musteri_urun_fiyatlari_getir(musteri_id, [urun.id])[urun.id])
+        self.hesap.satir_ekle(urun.id, birim_fiyat, adet, iskonto)
+
         satir = self.urun_tablosu.rowCount()
+        self._updating = True
         self.urun_tablosu.insertRow(satir)
-        
-        musteri_id = self.musteri_combo.currentData()
-        birim_fiyat = self.db.musteri_urun_fiyati_getir(musteri_id, urun['id'])
-        
-        # Ürün kodu ve adı düzenlenemez olarak ayarlanabilir
-        item0 = QTableWidgetItem(urun['kod'])
-        item0.setFlags(item0.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.urun_tablosu.setItem(satir, 0, item0)
-        
-        item1 = QTableWidgetItem(urun['ad'])
-        item1.setFlags(item1.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.urun_tablosu.setItem(satir, 1, item1)
-        
-        # İskonto ve adet hücreleri (değişiklik yapılmayacak)
-        item2 = QTableWidgetItem(str(iskonto))
-        item2.setFlags(item2.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.urun_tablosu.setItem(satir, 2, item2)
-        
-        item3 = QTableWidgetItem(str(adet))
-        item3.setFlags(item3.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.urun_tablosu.setItem(satir, 3, item3)
-        
-        # Birim fiyat hücresini düzenlenebilir bırakıyoruz:
-        item4 = QTableWidgetItem(f"{birim_fiyat:.2f} ₺")
-        self.urun_tablosu.setItem(satir, 4, item4)
-        
-        # Satır toplamı hesapla
-        toplam = (birim_fiyat * adet) * (1 - iskonto/100)
-        item5 = QTableWidgetItem(f"{toplam:.2f} ₺")
-        item5.setFlags(item5.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.urun_tablosu.setItem(satir, 5, item5)
-        
+        # Birim fiyat dışındaki hücreler düzenlenemez
+        for sutun, metin in enumerate((urun.kod, urun.ad, "", "", "", "")):
+            item = QTableWidgetItem(metin)
+            if sutun != 4:
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.urun_tablosu.setItem(satir, sutun, item)
         # Ürün verisini saklamak için (ürün id'si)
-        self.urun_tablosu.item(satir, 0).setData(Qt.ItemDataRole.UserRole, urun['id'])
+        self.urun_tablosu.item(satir, 0).setData(Qt.ItemDataRole.UserRole, urun.id)
+        self._updating = False
+
+        self.satiri_goster(satir)
         self.genel_toplam_guncelle()
+
+    def satiri_goster(self, row):
+        """Hesaptaki satırın iskonto, adet, birim fiyat ve toplam hücrelerini yazar"""
+        satir = self.hesap.satirlar[row]
+        self._updating = True
+        self.urun_tablosu.item(row, 2).setText(str(satir.iskonto))
+        self.urun_tablosu.item(row, 3).setText(str(satir.adet))
+        self.urun_tablosu.item(row, 4).setText(bicimle(satir.birim_fiyat))
+        self.urun_tablosu.item(row, 5).setText(bicimle(satir.toplam))
+        self._updating = False
     
     def hucre_degisti(self, row, column):
         """
-        Kullanıcı tarafından düzenlenen hücrede değişiklik olduğunda (özellikle Birim Fiyat sütununda)
-        o satırın toplamı ve genel toplam yeniden hesaplanır.
+        Kullanıcı birim fiyatı düzenlediğinde yalnızca o satırın toplamı ve
+        ara toplam güncellenir. Geçersiz girişte hücre eski değerine döner.
         """
-        if self._updating:
+        if self._updating or column != 4:
             return
 
-        if column == 4:
-            try:
-                unit_price_text = self.urun_tablosu.item(row, 4).text()
-                yeni_birim_fiyat = float(unit_price_text.replace("₺", "").strip())
-            except Exception:
-                return
-
-            try:
-                adet = int(self.urun_tablosu.item(row, 3).text())
-            except Exception:
-                adet = 1
-
-            try:
-                iskonto = int(self.urun_tablosu.item(row, 2).text())
-            except Exception:
-                iskonto = 0
-
-            yeni_toplam = (yeni_birim_fiyat * adet) * (1 - iskonto/100)
-            self._updating = True
-
-            # Eğer sütun 5'teki hücre oluşturulmamışsa, yeni bir hücre oluştur
-            total_item = self.urun_tablosu.item(row, 5)
-            if total_item is None:
-                total_item = QTableWidgetItem()
-                self.urun_tablosu.setItem(row, 5, total_item)
-            total_item.setText(f"{yeni_toplam:.2f} ₺")
-
-            self._updating = False
-
-            self.genel_toplam_guncelle()
+        try:
+            yeni_birim_fiyat = metinden_kurus(self.urun_tablosu.item(row, 4).text())
+        except ValueError:
+            yeni_birim_fiyat = None
+        if yeni_birim_fiyat is not None and yeni_birim_fiyat >= 0:
+            self.hesap.satiri_guncelle(row, birim_fiyat=yeni_birim_fiyat)
+        self.satiri_goster(row)
+        self.genel_toplam_guncelle()
         
     def genel_toplam_guncelle(self):
-        ara_toplam = 0
-        for row in range(self.urun_tablosu.rowCount()):
-            try:
-                ara_toplam += float(self.urun_tablosu.item(row, 5).text().replace("₺", "").strip())
-            except Exception:
-                continue
-        
-        genel_iskonto_orani = self.genel_iskonto_spin.value() / 100
-        iskonto_tutari = ara_toplam * genel_iskonto_orani
-        iskonto_sonrasi = ara_toplam - iskonto_tutari
-        kdv_orani = self.kdv_spin.value()
-        kdv_tutari = iskonto_sonrasi * (kdv_orani / 100)
-        genel_toplam = iskonto_sonrasi + kdv_tutari
-        
-        self.ara_toplam_label.setText(f"Ara Toplam: {ara_toplam:.2f} ₺")
-        self.iskonto_label.setText(f"Genel İskonto: {iskonto_tutari:.2f} ₺")
-        self.kdv_label.setText(f"KDV (%{kdv_orani}): {kdv_tutari:.2f} ₺")
-        self.toplam_label.setText(f"Genel Toplam: {genel_toplam:.2f} ₺")
+        self.hesap.genel_iskonto_orani = self.genel_iskonto_spin.value()
+        self.hesap.kdv_orani = self.kdv_spin.value()
+        
+        self.ara_toplam_label.setText(f"Ara Toplam: {bicimle(self.hesap.ara_toplam)}")
+        self.iskonto_label.setText(f"Genel İskonto: {bicimle(self.hesap.genel_iskonto)}")
+        self.kdv_label.setText(f"KDV (%{self.hesap.kdv_orani}): {bicimle(self.hesap.kdv)}")
+        self.toplam_label.setText(f"Genel Toplam: {bicimle(self.hesap.genel_toplam)}")
     
     def urun_menu_goster(self, position):
         secili_satir = self.urun_tablosu.currentRow()
@@ -430,89 +401,90 @@ class SiparisFormu(QDialog):
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
                 )
                 if cevap == QMessageBox.StandardButton.Yes:
+                    self.hesap.satir_sil(secili_satir)
                     self.urun_tablosu.removeRow(secili_satir)
                     self.genel_toplam_guncelle()
             elif action == duzenle_action:
                 self.urunu_duzenle(secili_satir)
     
     def urunu_duzenle(self, satir):
-        adet = int(self.urun_tablosu.item(satir, 3).text())
-        iskonto = int(self.urun_tablosu.item(satir, 2).text())
+        hesap_satiri = self.hesap.satirlar[satir]
         
-        dialog = UrunDuzenleDialog(self, adet=adet, iskonto=iskonto)
+        dialog = UrunDuzenleDialog(self, adet=hesap_satiri.adet, iskonto=hesap_satiri.iskonto)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.urun_tablosu.item(satir, 2).setText(str(dialog.iskonto))
-            self.urun_tablosu.item(satir, 3).setText(str(dialog.adet))
-            
-            try:
-                birim_fiyat = float(self.urun_tablosu.item(satir, 4).text().replace("₺", "").strip())
-            except Exception:
-                birim_fiyat = 0
-            toplam = (birim_fiyat * dialog.adet) * (1 - dialog.iskonto/100)
-            self.urun_tablosu.item(satir, 5).setText(f"{toplam:.2f} ₺")
+            self.hesap.satiri_guncelle(satir, adet=dialog.adet, iskonto=dialog.iskonto)
+            self.satiri_goster(satir)
             self.genel_toplam_guncelle()
     
     def pdf_olustur(self):
+        """PDF'i bellekte oluşturur ve içeriğini döndürür; hata olursa None döner"""
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-                pdf = canvas.Canvas(tmp.name)
-                pdf.setFont("Helvetica-Bold", 16)
-                pdf.drawString(50, 800, "SİPARİŞ FORMU")
-                pdf.setFont("Helvetica", 12)
-                pdf.drawString(50, 750, f"Sipariş No: {self.siparis_no_input.text()}")
-                pdf.drawString(50, 730, f"Tarih: {self.siparis_tarihi.date().toString()}")
-                
-                musteri_id = self.musteri_combo.currentData()
-                musteri = next((m for m in self.db.musterileri_getir() if m['id'] == musteri_id), None)
-                if musteri:
-                    pdf.drawString(50, 700, f"Müşteri: {musteri['ad']} {musteri['soyad']}")
-                    pdf.drawString(50, 680, f"Adres: {musteri['adres']}")
-                    pdf.drawString(50, 660, f"Telefon: {musteri['telefon']}")
-                
-                y = 600
-                pdf.setFont("Helvetica-Bold", 10)
-                pdf.drawString(50, y, "Ürün Kodu")
-                pdf.drawString(150, y, "Özellikler")
-                pdf.drawString(300, y, "İsk.")
-                pdf.drawString(350, y, "Adet")
-                pdf.drawString(400, y, "Br.Fiyat")
-                pdf.drawString(480, y, "Toplam")
-                
-                pdf.setFont("Helvetica", 10)
-                y -= 20
-                for row in range(self.urun_tablosu.rowCount()):
-                    pdf.drawString(50, y, self.urun_tablosu.item(row, 0).text())
-                    pdf.drawString(150, y, self.urun_tablosu.item(row, 1).text())
-                    pdf.drawString(300, y, self.urun_tablosu.item(row, 2).text())
-                    pdf.drawString(350, y, self.urun_tablosu.item(row, 3).text())
-                    pdf.drawString(400, y, self.urun_tablosu.item(row, 4).text())
-                    pdf.drawString(480, y, self.urun_tablosu.item(row, 5).text())
-                    y -= 20
-                
-                y -= 40
-                pdf.setFont("Helvetica-Bold", 10)
-                pdf.drawRightString(400, y, self.ara_toplam_label.text())
-                y -= 20
-                pdf.drawRightString(400, y, self.iskonto_label.text())
-                y -= 20
-                pdf.drawRightString(400, y, self.kdv_label.text())
+            tampon = BytesIO()
+            pdf = canvas.Canvas(tampon)
+            pdf.setFont("Helvetica-Bold", 16)
+            pdf.drawString(50, 800, "SİPARİŞ FORMU")
+            pdf.setFont("Helvetica", 12)
+            pdf.drawString(50, 750, f"Sipariş No: {self.siparis_no_input.text()}")
+            pdf.drawString(50, 730, f"Tarih: {self.siparis_tarihi.date().toString()}")
+            
+            musteri_id = self.musteri_combo.currentData()
+            musteri = next((m for m in self.db.musterileri_getir() if m.id == musteri_id), None)
+            if musteri:
+                pdf.drawString(50, 700, f"Müşteri: {musteri.ad} {musteri.soyad}")
+                pdf.drawString(50, 680, f"Adres: {musteri.adres}")
+                pdf.drawString(50, 660, f"Telefon: {musteri.telefon}")
+            
+            y = 600
+            pdf.setFont("Helvetica-Bold", 10)
+            pdf.drawString(50, y, "Ürün Kodu")
+            pdf.drawString(150, y, "Özellikler")
+            pdf.drawString(300, y, "İsk.")
+            pdf.drawString(350, y, "Adet")
+            pdf.drawString(400, y, "Br.Fiyat")
+            pdf.drawString(480, y, "Toplam")
+            
+            pdf.setFont("Helvetica", 10)
+            y -= 20
+            for row in range(self.urun_tablosu.rowCount()):
+                pdf.drawString(50, y, self.urun_tablosu.item(row, 0).text())
+                pdf.drawString(150, y, self.urun_tablosu.item(row, 1).text())
+                pdf.drawString(300, y, self.urun_tablosu.item(row, 2).text())
+                pdf.drawString(350, y, self.urun_tablosu.item(row, 3).text())
+                pdf.drawString(400, y, self.urun_tablosu.item(row, 4).text())
+                pdf.drawString(480, y, self.urun_tablosu.item(row, 5).text())
                 y -= 20
-                pdf.setFont("Helvetica-Bold", 12)
-                pdf.drawRightString(400, y, self.toplam_label.text())
-                
-                pdf.save()
-                return tmp.name
+            
+            y -= 40
+            pdf.setFont("Helvetica-Bold", 10)
+            pdf.drawRightString(400, y, self.ara_toplam_label.text())
+            y -= 20
+            pdf.drawRightString(400, y, self.iskonto_label.text())
+            y -= 20
+            pdf.drawRightString(400, y, self.kdv_label.text())
+            y -= 20
+            pdf.setFont("Helvetica-Bold", 12)
+            pdf.drawRightString(400, y, self.toplam_label.text())
+            
+            pdf.save()
+            return tampon.getvalue()
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"PDF oluşturulurken bir hata oluştu:\n{str(e)}")
             return None
     
     def pdf_yazdir(self):
-        pdf_dosyasi = self.pdf_olustur()
-        if pdf_dosyasi:
+        pdf_verisi = self.pdf_olustur()
+        if pdf_verisi:
             printer = QPrinter(QPrinter.PrinterMode.HighResolution)
             dialog = QPrintDialog(printer, self)
             if dialog.exec() == QDialog.DialogCode.Accepted:
-                os.startfile(pdf_dosyasi, 'print')
+                # Belge bellekten açılıp yazıcıya doğrudan çizilir; geçici dosya kullanılmaz
+                belge = bellekten_pdf_yukle(pdf_verisi, self)
+                try:
+                    belgeyi_yazdir(belge, printer)
+                except Exception as e:
+                    QMessageBox.critical(self, "Hata", f"Yazdırma sırasında bir hata oluştu:\n{str(e)}")
+                finally:
+                    belge.deleteLater()
 
 # ------------------------- Ürün Seçim Dialogu -------------------------
 class UrunSecimDialog(QDialog):
@@ -521,6 +493,7 @@ class UrunSecimDialog(QDialog):
         self.parent = parent
         self.db = self.parent.db
         self.secilen_urun = None
+        self.yurutucu = SorguYurutucu(self.db, self)
         self.dialog_olustur()
         
     def dialog_olustur(self):
@@ -530,7 +503,11 @@ class UrunSecimDialog(QDialog):
         duzen = QVBoxLayout()
         self.arama_kutusu = QLineEdit()
         self.arama_kutusu.setPlaceholderText("Ürün Ara (Kod veya İsim)")
-        self.arama_kutusu.textChanged.connect(self.urun_ara)
+        self.arama_zamanlayicisi = QTimer(self)
+        self.arama_zamanlayicisi.setSingleShot(True)
+        self.arama_zamanlayicisi.setInterval(ARAMA_GECIKMESI_MS)
+        self.arama_zamanlayicisi.timeout.connect(self.urunleri_yukle)
+        self.arama_kutusu.textChanged.connect(self.arama_metni_degisti)
         duzen.addWidget(self.arama_kutusu)
         
         self.tablo = QTableWidget()
@@ -552,27 +529,34 @@ class UrunSecimDialog(QDialog):
         self.setLayout(duzen)
         self.urunleri_yukle()
         
+    def arama_metni_degisti(self):
+        # Bellek dizini hazırsa her tuşta anında aranır, değilse FTS sorgusu geciktirilir
+        if self.db.urun_indeksi.hazir:
+            self.urunleri_yukle()
+        else:
+            self.arama_zamanlayicisi.start()
+
     def urunleri_yukle(self):
-        self.tablo.setRowCount(0)
-        urunler = self.db.urunleri_getir()
-        for urun in urunler:
-            satir = self.tablo.rowCount()
-            self.tablo.insertRow(satir)
-            self.tablo.setItem(satir, 0, QTableWidgetItem(urun['kod']))
-            self.tablo.setItem(satir, 1, QTableWidgetItem(urun['ad']))
-            self.tablo.setItem(satir, 2, QTableWidgetItem(f"{urun['fiyat']:.2f} ₺"))
+        """Eşleşen ilk ürünleri bellek dizininden, dizin henüz hazır değilse veritabanından yükler"""
+        arama_metni = self.arama_kutusu.text().strip()
+        if self.db.urun_indeksi.hazir:
+            self.tabloyu_doldur(self.db.urun_indeksi.ara(arama_metni, self.db.ARAMA_SONUC_SINIRI))
+        elif arama_metni:
+            self.yurutucu.calistir('urunler', self.db.urun_ara, arama_metni,
+                                   tamamlandi=self.tabloyu_doldur)
+        else:
+            self.yurutucu.calistir('urunler', self.db.urunleri_sayfali_getir,
+                                   sayfa_boyutu=self.db.ARAMA_SONUC_SINIRI,
+                                   tamamlandi=lambda sonuc: self.tabloyu_doldur(sonuc[0]))
+
+    def tabloyu_doldur(self, urunler):
+        self.tablo.setRowCount(len(urunler))
+        for satir, urun in enumerate(urunler):
+            self.tablo.setItem(satir, 0, QTableWidgetItem(urun.kod))
+            self.tablo.setItem(satir, 1, QTableWidgetItem(urun.ad))
+            self.tablo.setItem(satir, 2, QTableWidgetItem(f"{urun.fiyat:.2f} ₺"))
             self.tablo.item(satir, 0).setData(Qt.ItemDataRole.UserRole, urun)
     
-    def urun_ara(self, arama_metni):
-        for i in range(self.tablo.rowCount()):
-            satir_gizle = True
-            for j in range(2):  # Ürün kodu ve adı
-                item = self.tablo.item(i, j)
-                if item and arama_metni.lower() in item.text().lower():
-                    satir_gizle = False
-                    break
-            self.tablo.setRowHidden(i, satir_gizle)
-    
     def urun_sec(self):
         secili_satir = self.tablo.currentRow()
         if secili_satir >= 0:
@@ -621,82 +605,4 @@ class UrunDuzenleDialog(QDialog):
     def kaydet(self):
         self.adet = self.adet_spin.value()
         self.iskonto = self.iskonto_spin.value()
-        self.accept() 
-
-# ------------------------- Sipariş Geçmişi Dialogu -------------------------
-class SiparisGecmisiDialog(QDialog):
-    def __init__(self, parent=None, musteri_id=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.db = self.parent.db
-        self.musteri_id = musteri_id
-        self.dialog_olustur()
-        self.siparisleri_yukle()
-        
-    def dialog_olustur(self):
-        self.setWindowTitle("Sipariş Geçmişi")
-        self.setGeometry(100, 100, 900, 600)
-        
-        ana_duzen = QVBoxLayout()
-        self.musteri_bilgi_label = QLabel()
-        self.musteri_bilgi_label.setStyleSheet("font-weight: bold; font-size: 12pt;")
-        ana_duzen.addWidget(self.musteri_bilgi_label)
-        
-        self.tablo = QTableWidget()
-        self.tablo.setColumnCount(6)
-        self.tablo.setHorizontalHeaderLabels([
-            "Sipariş No", "Sipariş Tarihi", "Teslim Tarihi", 
-            "Toplam Tutar", "Durum", "Ürünler"
-        ])
-        self.tablo.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.tablo.setColumnWidth(5, 300)
-        ana_duzen.addWidget(self.tablo)
-        
-        self.istatistik_label = QLabel()
-        self.istatistik_label.setStyleSheet("font-weight: bold;")
-        ana_duzen.addWidget(self.istatistik_label)
-        
-        self.kapat_butonu = QPushButton("Kapat")
-        self.kapat_butonu.clicked.connect(self.close)
-        ana_duzen.addWidget(self.kapat_butonu)
-        
-        self.setLayout(ana_duzen)
-    
-    def siparisleri_yukle(self):
-        if not self.musteri_id:
-            return
-            
-        siparisler = self.db.musteri_siparisleri_getir(self.musteri_id)
-        if not siparisler:
-            self.musteri_bilgi_label.setText("Bu müşteriye ait sipariş bulunamadı.")
-            return
-            
-        ilk_siparis = siparisler[0]
-        self.musteri_bilgi_label.setText(
-            f"Müşteri: {ilk_siparis['ad']} {ilk_siparis['soyad']}\n"
-            f"Telefon: {ilk_siparis['telefon']}\n"
-            f"Adres: {ilk_siparis['adres']}"
-        )
-        
-        self.tablo.setRowCount(0)
-        toplam_tutar = 0
-        for siparis in siparisler:
-            satir = self.tablo.rowCount()
-            self.tablo.insertRow(satir)
-            
-            self.tablo.setItem(satir, 0, QTableWidgetItem(siparis['siparis_no']))
-            self.tablo.setItem(satir, 1, QTableWidgetItem(siparis['siparis_tarihi']))
-            self.tablo.setItem(satir, 2, QTableWidgetItem(siparis['teslim_tarihi']))
-            self.tablo.setItem(satir, 3, QTableWidgetItem(f"{siparis['toplam_tutar']:.2f} ₺"))
-            self.tablo.setItem(satir, 4, QTableWidgetItem(siparis['durum']))
-            
-            urunler_item = QTableWidgetItem(siparis['urunler'].replace(',', '\n'))
-            urunler_item.setToolTip(siparis['urunler'].replace(',', '\n'))
-            self.tablo.setItem(satir, 5, urunler_item)
-            
-            toplam_tutar += float(siparis['toplam_tutar'])
-        
-        self.istatistik_label.setText(
-            f"Toplam Sipariş Sayısı: {len(siparisler)}\n"
-            f"Toplam Harcama: {toplam_tutar:.2f} ₺"
-        )
\ No newline at end of file
+        self.accept()
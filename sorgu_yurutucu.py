@@ -0,0 +1,171 @@
+import threading
+import weakref
+from itertools import count
+from typing import Any, Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Çalışan görevler burada tutulur; yürütücü silinse bile görev nesnesi
+# iş parçacığında çalışırken çöp toplayıcı tarafından serbest bırakılmaz.
+_canli_gorevler = set()
+
+
+class _GorevSinyalleri(QObject):
+    tamamlandi = pyqtSignal(int, object)
+    hata = pyqtSignal(int, object)
+    bitti = pyqtSignal(int)
+
+
+class _SorguGorevi(QRunnable):
+    """
+    Tek bir veritabanı çağrısını iş parçacığı havuzunda çalıştırır.
+
+    Sinyal nesnesi arayüz iş parçacığında oluşturulduğu için sonuçlar
+    arayüz iş parçacığına kuyruklu bağlantıyla ulaşır.
+    """
+
+    def __init__(self, istek_no: int, havuz, fonksiyon: Callable[..., Any],
+                 args: tuple, kwargs: dict) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.istek_no = istek_no
+        self.havuz = havuz
+        self.fonksiyon = fonksiyon
+        self.args = args
+        self.kwargs = kwargs
+        self.iptal = threading.Event()
+        self.sinyaller = _GorevSinyalleri()
+
+    def run(self) -> None:
+        try:
+            if self.iptal.is_set():
+                return
+            try:
+                with self.havuz.iptal_edilebilir(self.iptal.is_set):
+                    sonuc = self.fonksiyon(*self.args, **self.kwargs)
+            except Exception as e:
+                # İptal edilen sorgunun "interrupted" hatası bildirilmez
+                if not self.iptal.is_set():
+                    self.sinyaller.hata.emit(self.istek_no, e)
+            else:
+                if not self.iptal.is_set():
+                    self.sinyaller.tamamlandi.emit(self.istek_no, sonuc)
+        finally:
+            self.sinyaller.bitti.emit(self.istek_no)
+            _canli_gorevler.discard(self)
+
+
+class SorguYurutucu(QObject):
+    """
+    Veritabanı çağrılarını arayüz iş parçacığı dışında çalıştırır ve
+    sonuçları arayüz iş parçacığında geri çağırma fonksiyonlarına iletir.
+
+    Her istek bir kanala aittir ve bir kanalda yalnızca en son istek geçerlidir.
+    Aynı kanala yeni bir istek gelince önceki istek iptal edilir: henüz
+    başlamamışsa kuyruktan çıkarılır, çalışıyorsa SQLite sorgusu kesilir ve
+    sonucu hiçbir zaman teslim edilmez. sonunda verilen geri çağırma ise istek
+    tamamlansa da, hata verse de, iptal edilse de bir kez çağrılır.
+    """
+    _yurutuculer: "weakref.WeakSet[SorguYurutucu]" = weakref.WeakSet()
+
+    def __init__(self, db, parent: Optional[QObject] = None,
+                 is_havuzu: Optional[QThreadPool] = None) -> None:
+        super().__init__(parent)
+        self.db = db
+        self.is_havuzu = is_havuzu or QThreadPool.globalInstance()
+        self._istek_sayaci = count(1)
+        self._gorevler: Dict[int, _SorguGorevi] = {}
+        self._geri_cagirmalar: Dict[int, tuple] = {}
+        self._kanallar: Dict[str, int] = {}
+        SorguYurutucu._yurutuculer.add(self)
+
+    def calistir(self, kanal: str, fonksiyon: Callable[..., Any], *args,
+                 tamamlandi: Optional[Callable[[Any], None]] = None,
+                 hata: Optional[Callable[[Exception], None]] = None,
+                 sonunda: Optional[Callable[[], None]] = None, **kwargs) -> int:
+        """
+        fonksiyon(*args, **kwargs) çağrısını arka planda başlatır ve istek numarasını döndürür.
+        """
+        self.iptal_et(kanal)
+        istek_no = next(self._istek_sayaci)
+        gorev = _SorguGorevi(istek_no, self.db.havuz, fonksiyon, args, kwargs)
+        gorev.sinyaller.tamamlandi.connect(self._tamamlandi)
+        gorev.sinyaller.hata.connect(self._hata)
+        gorev.sinyaller.bitti.connect(self._bitti)
+        self._gorevler[istek_no] = gorev
+        self._geri_cagirmalar[istek_no] = (kanal, tamamlandi, hata, sonunda)
+        self._kanallar[kanal] = istek_no
+        _canli_gorevler.add(gorev)
+        self.is_havuzu.start(gorev)
+        return istek_no
+
+    def bekliyor(self, kanal: str) -> bool:
+        """
+        Kanalda sonucu henüz teslim edilmemiş bir istek olup olmadığını döndürür.
+        """
+        return kanal in self._kanallar
+
+    def iptal_et(self, kanal: str) -> None:
+        istek_no = self._kanallar.pop(kanal, None)
+        if istek_no is None:
+            return
+        geri_cagirma = self._geri_cagirmalar.pop(istek_no, None)
+        gorev = self._gorevler.get(istek_no)
+        if gorev is not None:
+            gorev.iptal.set()
+            # Henüz başlamamış görev kuyruktan alınır; çalışan görev bitti sinyaliyle temizlenir
+            if self.is_havuzu.tryTake(gorev):
+                del self._gorevler[istek_no]
+                _canli_gorevler.discard(gorev)
+        if geri_cagirma is not None and geri_cagirma[3] is not None:
+            geri_cagirma[3]()
+
+    def tumunu_iptal_et(self) -> None:
+        for kanal in list(self._kanallar):
+            self.iptal_et(kanal)
+
+    @classmethod
+    def hepsini_durdur(cls, bekleme_ms: int = 5000) -> bool:
+        """
+        Tüm yürütücülerin isteklerini iptal eder ve çalışan görevlerin bitmesini bekler.
+        Veritabanı kapatılmadan önce çağrılır.
+        """
+        havuzlar = set()
+        for yurutucu in list(cls._yurutuculer):
+            yurutucu.tumunu_iptal_et()
+            havuzlar.add(yurutucu.is_havuzu)
+        return all(havuz.waitForDone(bekleme_ms) for havuz in havuzlar)
+
+    def _teslim_al(self, istek_no: int):
+        geri_cagirma = self._geri_cagirmalar.pop(istek_no, None)
+        if geri_cagirma is None:
+            return None
+        kanal = geri_cagirma[0]
+        if self._kanallar.get(kanal) == istek_no:
+            del self._kanallar[kanal]
+        return geri_cagirma
+
+    def _tamamlandi(self, istek_no: int, sonuc: Any) -> None:
+        geri_cagirma = self._teslim_al(istek_no)
+        if geri_cagirma is None:
+            return
+        try:
+            if geri_cagirma[1] is not None:
+                geri_cagirma[1](sonuc)
+        finally:
+            if geri_cagirma[3] is not None:
+                geri_cagirma[3]()
+
+    def _hata(self, istek_no: int, hata: Exception) -> None:
+        geri_cagirma = self._teslim_al(istek_no)
+        if geri_cagirma is None:
+            return
+        try:
+            if geri_cagirma[2] is not None:
+                geri_cagirma[2](hata)
+        finally:
+            if geri_cagirma[3] is not None:
+                geri_cagirma[3]()
+
+    def _bitti(self, istek_no: int) -> None:
+        self._gorevler.pop(istek_no, None)
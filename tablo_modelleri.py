@@ -0,0 +1,103 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from sorgu_yurutucu import SorguYurutucu
+
+
+class SiparisTabloModeli(QAbstractTableModel):
+    """
+    Sipariş listesini veritabanından sayfa sayfa yükleyen tablo modeli.
+
+    Görünüm aşağı kaydırıldıkça fetchMore ile bir sonraki sayfa anahtar tabanlı
+    sayfalamayla istenir; yalnızca yüklenen satırlar bellekte tutulur.
+    Sayfalar arka planda okunur ve geldiklerinde eklenir; aynı anda tek sayfa istenir.
+    Sıralama veritabanında yapılır.
+    """
+    yukleme_hatasi = pyqtSignal(object)
+
+    SUTUNLAR = [
+        ('siparis_no', "Sipariş No"),
+        ('siparis_tarihi', "Tarih"),
+        ('musteri_adi', "Müşteri Adı"),
+        ('toplam_tutar', "Toplam Tutar"),
+        ('teslim_tarihi', "Teslim Tarihi"),
+    ]
+    SAYFA_BOYUTU = 500
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._satirlar = []
+        self._son_anahtar = None
+        self._daha_var = True
+        self._siralama = 'siparis_tarihi'
+        self._azalan = True
+        self.yurutucu = SorguYurutucu(db, self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.SUTUNLAR)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        anahtar = self.SUTUNLAR[index.column()][0]
+        if role == Qt.ItemDataRole.DisplayRole:
+            deger = getattr(self._satirlar[index.row()], anahtar)
+            if anahtar == 'toplam_tutar':
+                return f"{float(deger):.2f} ₺"
+            return deger
+        if role == Qt.ItemDataRole.TextAlignmentRole and anahtar == 'toplam_tutar':
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.SUTUNLAR[section][1]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._daha_var and not self.yurutucu.bekliyor('sayfa')
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self.yurutucu.calistir(
+            'sayfa', self.db.siparisleri_sayfali_getir,
+            siralama=self._siralama, son_anahtar=self._son_anahtar,
+            sayfa_boyutu=self.SAYFA_BOYUTU, azalan=self._azalan,
+            tamamlandi=self._sayfa_geldi, hata=self._sayfa_hatasi
+        )
+
+    def _sayfa_geldi(self, sonuc):
+        sayfa, self._son_anahtar = sonuc
+        self._daha_var = self._son_anahtar is not None
+        if not sayfa:
+            return
+        ilk = len(self._satirlar)
+        self.beginInsertRows(QModelIndex(), ilk, ilk + len(sayfa) - 1)
+        self._satirlar.extend(sayfa)
+        self.endInsertRows()
+
+    def _sayfa_hatasi(self, hata):
+        # Aynı hata her kaydırmada tekrarlanmasın diye yükleme durdurulur; yenile ile yeniden başlar
+        self._daha_var = False
+        self.yukleme_hatasi.emit(hata)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._siralama = self.SUTUNLAR[column][0]
+        self._azalan = order == Qt.SortOrder.DescendingOrder
+        self.yenile()
+
+    def yenile(self):
+        """Yüklenen satırları atar; görünüm ilk sayfayı yeniden ister."""
+        # Eski sıralamayla istenmiş sayfa artık eklenmez
+        self.yurutucu.iptal_et('sayfa')
+        self.beginResetModel()
+        self._satirlar = []
+        self._son_anahtar = None
+        self._daha_var = True
+        self.endResetModel()
+
+    def siparis_no(self, satir):
+        return self._satirlar[satir].siparis_no
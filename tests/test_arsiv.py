@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from arsiv import ESKI_SEMA, YILLIK_ARSIV_SINIRI, arsiv_semasi, siparisleri_arsivle
+from database import Database
+from yedekleme import yedek_al
+
+YILLAR = range(2008, 2025)
+
+
+def siparis(musteri_id, urun_id, tarih):
+    return ({'musteri_id': musteri_id, 'siparis_tarihi': tarih, 'teslim_tarihi': tarih, 'toplam_tutar': 12.0},
+            [{'urun_id': urun_id, 'adet': 1, 'birim_fiyat': 10.0, 'iskonto': 0, 'toplam_fiyat': 10.0}])
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    On yedi yıllık sipariş geçmişi olan iki müşterili veritabanı.
+    """
+    db = Database(str(tmp_path / "gecmis.db"))
+    musteriler = [db.musteri_ekle({'ad': f"Ad{i}", 'soyad': "Soyad", 'telefon': "", 'adres': "",
+                                   'grup': "Standart"}) for i in range(2)]
+    urun_id = db.urun_ekle({'kod': "U1", 'ad': "Ürün", 'fiyat': 10.0})
+    db.siparisleri_toplu_ekle([siparis(musteriler[ay % 2], urun_id, f"{yil}-{ay:02d}-15")
+                               for yil in YILLAR for ay in range(1, 4)])
+    yield db
+    db.kapat()
+
+
+def siparis_sayilari(db):
+    with db.transaction() as conn:
+        return conn.execute("SELECT musteri_id, COUNT(*) FROM tum_siparisler GROUP BY musteri_id").fetchall()
+
+
+def test_ondan_fazla_yil_arsivlenebilir(db, tmp_path):
+    once = siparis_sayilari(db)
+    gecmis = len(db.musteri_siparisleri_getir(1))
+
+    siparisleri_arsivle(db, "2012-01-01")
+    tasinanlar = siparisleri_arsivle(db, "2025-01-01")
+    assert sorted(tasinanlar) == list(range(2012, 2025))
+    # Sınırı aşan en eski yıllar tek dosyada birleşir; dosyaları silinir
+    yillik = [arsiv_semasi(yil) for yil in range(2024 - YILLIK_ARSIV_SINIRI + 1, 2025)]
+    assert list(db.arsivler) == [*reversed(yillik), ESKI_SEMA]
+    assert sorted(ad for ad in os.listdir(tmp_path) if "_arsiv_" in ad) == sorted(
+        f"gecmis_{sema}.db" for sema in [*yillik, ESKI_SEMA])
+    assert siparis_sayilari(db) == once
+    assert len(db.musteri_siparisleri_getir(1)) == gecmis
+
+    # Yıllık dosyası kalmamış bir yıla geç girilen sipariş eski arşive gider
+    db.siparisleri_toplu_ekle([siparis(1, 1, "2009-06-01")])
+    assert siparisleri_arsivle(db, "2025-01-01") == {2009: 1}
+    assert ESKI_SEMA in db.arsivler and len(db.arsivler) == YILLIK_ARSIV_SINIRI + 1
+
+    yedek = yedek_al(db.db_file, str(tmp_path / "yedekler"))
+    assert len(os.listdir(yedek.dizin)) == YILLIK_ARSIV_SINIRI + 2
+    assert sum(db.ozetleri_yeniden_olustur().values()) == 0
+
+    db.kapat()
+    db = Database(db.db_file)
+    try:
+        assert len(db.musteri_siparisleri_getir(1)) == gecmis + 1
+    finally:
+        db.kapat()
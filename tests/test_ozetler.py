@@ -0,0 +1,45 @@
+import pytest
+
+from arsiv import siparisleri_arsivle
+from database import Database
+
+pytest.importorskip("numpy")
+from satis_analizi import satis_verisi_yukle  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Sipariş toplamı (genel iskonto ve KDV dahil) kalem toplamından farklı siparişler.
+    """
+    db = Database(str(tmp_path / "ozet.db"))
+    musteriler = [db.musteri_ekle({'ad': f"Ad{i}", 'soyad': "Soyad", 'telefon': "", 'adres': "",
+                                   'grup': "Standart"}) for i in range(3)]
+    urunler = [db.urun_ekle({'kod': f"U{i}", 'ad': f"Ürün {i}", 'fiyat': 12.5}) for i in range(4)]
+    for i in range(30):
+        detaylar = [{'urun_id': urunler[(i + j) % 4], 'adet': j + 1, 'birim_fiyat': 12.5,
+                     'iskonto': 10, 'toplam_fiyat': round((j + 1) * 12.5 * 0.9, 2)} for j in range(i % 3)]
+        db.siparis_ekle({'musteri_id': musteriler[i % 3], 'siparis_tarihi': f"{2022 + i % 3}-03-{i % 28 + 1:02d}",
+                         'teslim_tarihi': "2025-01-01", 'toplam_tutar': 999.99}, detaylar)
+    yield db
+    db.kapat()
+
+
+def ozet_cirolari(db):
+    with db.transaction() as conn:
+        return tuple(conn.execute(f"SELECT COALESCE(SUM(toplam_kurus), 0) FROM {tablo}").fetchone()[0]
+                     for tablo in ('musteri_ozetleri', 'urun_ozetleri', 'gunluk_satislar'))
+
+
+def test_ozet_cirosu_analiz_cirosuyla_ayni(db):
+    ciro = satis_verisi_yukle(db).toplam_ciro
+    assert ciro > 0
+    assert ozet_cirolari(db) == (ciro,) * 3
+
+    siparisleri_arsivle(db, "2024-01-01")
+    for siparis in db.tum_siparisleri_getir()[:2]:
+        db.siparis_sil(siparis.siparis_no)
+    assert satis_verisi_yukle(db).toplam_ciro < ciro
+    ciro = satis_verisi_yukle(db).toplam_ciro
+    assert ozet_cirolari(db) == (ciro,) * 3
+    assert sum(db.ozetleri_yeniden_olustur().values()) == 0
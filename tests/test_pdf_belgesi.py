@@ -0,0 +1,31 @@
+import re
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from kayitlar import Musteri
+from pdf_belgesi import (DIGER_SAYFA_KAPASITESI, ILK_SAYFA_KAPASITESI, EkstreBelgesi,
+                         sayfa_sayisi)
+
+MUSTERI = Musteri(1, "Ada", "Yılmaz", "5550000000", "İstanbul", None, "Perakende", None, "2025-01-01")
+SATIR = ("K1 - Ürün", "2025-01-01", "2025-01-08", "1", "10.00 ₺", "10.00 ₺")
+
+SINIRLAR = sorted({
+    0, 1, ILK_SAYFA_KAPASITESI, ILK_SAYFA_KAPASITESI + 1,
+    ILK_SAYFA_KAPASITESI + DIGER_SAYFA_KAPASITESI,
+    ILK_SAYFA_KAPASITESI + DIGER_SAYFA_KAPASITESI + 1,
+    ILK_SAYFA_KAPASITESI + 2 * DIGER_SAYFA_KAPASITESI,
+    ILK_SAYFA_KAPASITESI + 2 * DIGER_SAYFA_KAPASITESI + 1,
+    58, 1000,
+})
+
+
+@pytest.mark.parametrize("satir_sayisi", SINIRLAR)
+def test_cizilen_sayfa_sayisi_onceden_hesaplananla_ayni(satir_sayisi):
+    tampon = BytesIO()
+    belge = EkstreBelgesi(tampon, MUSTERI, "S-1", satir_sayisi)
+    cizilen = belge.olustur([SATIR] * satir_sayisi)
+    pdf_sayfalari = len(re.findall(rb"/Type /Page\b(?!s)", tampon.getvalue()))
+    assert cizilen == pdf_sayfalari == sayfa_sayisi(satir_sayisi) == belge.toplam_sayfa
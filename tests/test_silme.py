@@ -0,0 +1,51 @@
+import pytest
+
+from arsiv import siparisleri_arsivle
+from database import Database
+
+
+@pytest.fixture
+def veri(tmp_path):
+    """
+    İki müşteri ve iki ürün; ilk müşterinin ilk üründen bir siparişi vardır.
+    """
+    db = Database(str(tmp_path / "silme.db"))
+    musteriler = [db.musteri_ekle({'ad': f"Ad{i}", 'soyad': "Soyad", 'telefon': "", 'adres': "",
+                                   'grup': "Standart"}) for i in range(2)]
+    urunler = [db.urun_ekle({'kod': f"U{i}", 'ad': f"Ürün {i}", 'fiyat': 10.0}) for i in range(2)]
+    db.siparis_ekle({'musteri_id': musteriler[0], 'siparis_tarihi': "2020-05-01", 'teslim_tarihi': "2020-05-02",
+                     'toplam_tutar': 12.0},
+                    [{'urun_id': urunler[0], 'adet': 1, 'birim_fiyat': 10.0, 'iskonto': 0, 'toplam_fiyat': 10.0}])
+    yield db, musteriler, urunler
+    db.kapat()
+
+
+def test_siparisi_olan_musteri_silinemez(veri):
+    db, musteriler, _ = veri
+    with pytest.raises(ValueError):
+        db.musteri_sil(musteriler[0])
+    assert len(db.musteri_siparisleri_getir(musteriler[0])) == 1
+    assert db.musteri_ozeti_getir(musteriler[0]).siparis_sayisi == 1
+
+    db.musteri_sil(musteriler[1])
+    assert [musteri.id for musteri in db.musterileri_getir()] == musteriler[:1]
+
+
+def test_satilmis_urun_silinemez(veri):
+    db, _, urunler = veri
+    with pytest.raises(ValueError):
+        db.urun_sil(urunler[0])
+    db.urun_sil(urunler[1])
+    assert [urun.id for urun in db.urunleri_getir()] == urunler[:1]
+
+
+def test_arsivdeki_siparisler_silmeyi_engeller(veri):
+    db, musteriler, urunler = veri
+    siparisleri_arsivle(db, "2021-01-01")
+    with pytest.raises(ValueError):
+        db.musteri_sil(musteriler[0])
+    with pytest.raises(ValueError):
+        db.urun_sil(urunler[0])
+    kalem, = db.musteri_siparisleri_getir(musteriler[0])[0].kalemler
+    assert (kalem.urun_kodu, kalem.urun_adi) == ("U0", "Ürün 0")
+    assert sum(db.ozetleri_yeniden_olustur().values()) == 0
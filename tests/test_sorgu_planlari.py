@@ -0,0 +1,36 @@
+import pytest
+
+from arsiv import arsiv_dosyasi, arsiv_olustur, arsiv_semasi
+from database import Database
+from sema_gecisleri import GECISLER, PLAN_KONTROLLERI, mevcut_surum, sorgu_planlarini_dogrula
+
+
+@pytest.fixture(params=[False, True], ids=["arsivsiz", "arsivli"])
+def db(request, tmp_path):
+    """
+    Boş dosyadan tüm geçişleri uygulanmış bir veritabanı; arşivli türde bir yıllık arşiv bağlıdır.
+    """
+    db = Database(str(tmp_path / "plan.db"))
+    if request.param:
+        yol = arsiv_dosyasi(db.db_file, 2020)
+        arsiv_olustur(yol)
+        db.arsiv_ekle(arsiv_semasi(2020), yol)
+    yield db
+    db.kapat()
+
+
+def test_gecisler_son_surume_kadar_uygulanir(db):
+    with db.transaction() as conn:
+        assert mevcut_surum(conn) == GECISLER[-1].surum == db.sema_surumu
+
+
+def test_her_indeksin_plan_kontrolu_var(db):
+    with db.transaction() as conn:
+        indeksler = {satir[0] for satir in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'")}
+    assert indeksler - {indeks for indeks, _, _ in PLAN_KONTROLLERI} == set()
+
+
+def test_sorgular_beklenen_indeksleri_kullanir(db):
+    with db.transaction() as conn:
+        assert sorgu_planlarini_dogrula(conn) == []
@@ -0,0 +1,24 @@
+import logging
+import sqlite3
+
+from yedekleme import YedeklemeZamanlayicisi, yedekleme_ayarlari
+
+
+def test_zamanlayici_yedekleme_hatasini_kaydeder(tmp_path, caplog):
+    # Yedek dizini yerinde bir dosya olduğu için yedek alınamaz
+    (tmp_path / "yedekler").write_text("")
+    db_file = str(tmp_path / "hata.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE t (x)")
+    conn.close()
+    ayarlar = yedekleme_ayarlari({'yedekleme': {'aralik': 3600, 'dizin': str(tmp_path / "yedekler")}})
+    zamanlayici = YedeklemeZamanlayicisi(db_file, ayarlar)
+    with caplog.at_level(logging.ERROR, logger="yedekleme"):
+        zamanlayici.start()
+        for _ in range(200):
+            if caplog.records:
+                break
+            zamanlayici._durdur.wait(0.01)
+        zamanlayici.durdur()
+    kayit, = caplog.records
+    assert kayit.getMessage() == "Veritabanı yedekleme hatası" and kayit.exc_info
@@ -0,0 +1,69 @@
+import csv
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# CSV dosyasında her satır bir sipariş kalemidir; aynı sipariş numarasına sahip
+# ardışık satırlar tek bir sipariş olarak eklenir. Numarası boş her satır ayrı
+# bir siparişin tek kalemidir; numarası ekleme sırasında sayaçtan ayrılır.
+CSV_SUTUNLARI = (
+    'siparis_no', 'musteri_id', 'siparis_tarihi', 'teslim_tarihi', 'toplam_tutar',
+    'urun_id', 'adet', 'birim_fiyat', 'iskonto', 'toplam_fiyat',
+)
+
+
+def _siparis_bilgileri(satir: Dict[str, str], siparis_no: str) -> Dict[str, Any]:
+    return {
+        'siparis_no': siparis_no or None,
+        'musteri_id': int(satir['musteri_id']),
+        'siparis_tarihi': satir['siparis_tarihi'],
+        'teslim_tarihi': satir['teslim_tarihi'],
+        'toplam_tutar': float(satir['toplam_tutar']),
+    }
+
+
+def _siparis_kalemi(satir: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        'urun_id': int(satir['urun_id']),
+        'adet': int(satir['adet']),
+        'birim_fiyat': float(satir['birim_fiyat']),
+        'iskonto': int(satir['iskonto'] or 0),
+        'toplam_fiyat': float(satir['toplam_fiyat']),
+    }
+
+
+def csv_siparisleri_oku(dosya_yolu: str, ayrac: str = ',') -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    CSV dosyasındaki siparişleri (siparis_bilgileri, siparis_detaylari) çiftleri olarak akıtır.
+
+    Bir siparişin satırları dosyada ardışık olmalıdır; kapanmış bir sipariş
+    numarası yeniden görülürse satır numarasıyla ValueError verilir.
+    """
+    with open(dosya_yolu, newline='', encoding='utf-8') as f:
+        okuyucu = csv.DictReader(f, delimiter=ayrac)
+        eksik_sutunlar = set(CSV_SUTUNLARI) - set(okuyucu.fieldnames or [])
+        if eksik_sutunlar:
+            raise ValueError(f"CSV dosyasında eksik sütunlar: {', '.join(sorted(eksik_sutunlar))}")
+
+        gorulen_numaralar: Set[str] = set()
+        siparis: Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = None
+        for satir in okuyucu:
+            siparis_no = satir['siparis_no'].strip()
+            if siparis is not None and (not siparis_no or siparis_no != siparis[0]['siparis_no']):
+                yield siparis
+                siparis = None
+            if siparis is None:
+                if siparis_no in gorulen_numaralar:
+                    raise ValueError(f"{okuyucu.line_num}. satır: {siparis_no} numaralı siparişin "
+                                     f"satırları dosyada ardışık değil")
+                if siparis_no:
+                    gorulen_numaralar.add(siparis_no)
+                siparis = (_siparis_bilgileri(satir, siparis_no), [])
+            siparis[1].append(_siparis_kalemi(satir))
+        if siparis is not None:
+            yield siparis
+
+
+def siparisleri_ice_aktar(db, dosya_yolu: str, parca_boyutu: Optional[int] = None, ayrac: str = ',') -> int:
+    """
+    CSV dosyasındaki tüm siparişleri tek bir işlemde ekler ve eklenen sipariş sayısını döndürür.
+    """
+    return len(db.siparisleri_toplu_ekle(csv_siparisleri_oku(dosya_yolu, ayrac), parca_boyutu))
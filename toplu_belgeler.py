@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from database import Database
+from pdf_belgesi import ekstre_olustur
+
+# Belge türleri: müşteri başına ekstre veya sipariş başına sipariş formu
+BELGE_TURLERI = ('ekstre', 'siparis')
+
+# İşçi sürecindeki veritabanı; havuz başlatılırken bir kez açılır
+_db: Optional[Database] = None
+
+
+class BelgeSonucu(NamedTuple):
+    hedef_id: int
+    dosya: Optional[str]
+    sayfa: int
+    sure: float
+
+
+def _isci_baslat(db_file: str, depolama: Dict[str, Any]) -> None:
+    """
+    İşçi sürecinin kendi tek bağlantılı, salt okunur veritabanını açar.
+
+    Şema ve bakım ana süreçtedir; işçiler yazma kilidi için yarışmaz.
+    Bağlantı süreç kapanırken kapatılır.
+    """
+    global _db
+    _db = Database(db_file, max_baglanti=1, depolama=depolama, salt_okunur=True)
+    # ProcessPoolExecutor işçileri atexit işleyicilerini çalıştırmadan çıkar;
+    # multiprocessing'in çıkış sonlandırıcıları ise çalışır
+    Finalize(None, _isci_kapat, exitpriority=10)
+
+
+def _isci_kapat() -> None:
+    global _db
+    if _db is not None:
+        _db.kapat()
+        _db = None
+
+
+def _ekstre_yaz(musteri_id: int, cikti_dizini: str, baslangic: Optional[str],
+                bitis: Optional[str]) -> BelgeSonucu:
+    """
+    Müşterinin tarih aralığındaki siparişlerinden ekstre yazar; siparişi yoksa dosya oluşturmaz.
+    """
+    bas = time.perf_counter()
+    siparisler = _db.sayfalari_akit(_db.musteri_siparisleri_sayfali_getir, musteri_id=musteri_id,
+                                    baslangic=baslangic, bitis=bitis)
+    ilk = next(siparisler, None)
+    if ilk is None:
+        return BelgeSonucu(musteri_id, None, 0, time.perf_counter() - bas)
+
+    satir_sayisi = _db.musteri_kalem_sayisi(musteri_id, baslangic, bitis)
+    belge_no = f"EKS-{musteri_id:06d}" + (f"-{bitis}" if bitis else "")
+    dosya = os.path.join(cikti_dizini, f"ekstre_{musteri_id:06d}.pdf")
+    sayfa = ekstre_olustur(dosya, ilk, chain([ilk], siparisler), satir_sayisi, belge_no)
+    return BelgeSonucu(musteri_id, dosya, sayfa, time.perf_counter() - bas)
+
+
+def _siparis_formu_yaz(siparis_id: int, cikti_dizini: str, baslangic: Optional[str],
+                       bitis: Optional[str]) -> BelgeSonucu:
+    """
+    Tek bir siparişin formunu yazar.
+    """
+    bas = time.perf_counter()
+    siparis = _db.siparis_getir(siparis_id)
+    if siparis is None:
+        return BelgeSonucu(siparis_id, None, 0, time.perf_counter() - bas)
+
+    dosya = os.path.join(cikti_dizini, f"siparis_{siparis.siparis_no}.pdf")
+    sayfa = ekstre_olustur(dosya, siparis, [siparis], len(siparis.kalemler), siparis.siparis_no)
+    return BelgeSonucu(siparis_id, dosya, sayfa, time.perf_counter() - bas)
+
+
+_YAZICILAR: Dict[str, Callable[..., BelgeSonucu]] = {
+    'ekstre': _ekstre_yaz,
+    'siparis': _siparis_formu_yaz,
+}
+
+
+def belge_hedefleri(db: Database, tur: str, baslangic: Optional[str] = None, bitis: Optional[str] = None,
+                    musteri_idler: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Üretilecek belgelerin ID'lerini döndürür: ekstre için müşteri, sipariş formu için sipariş ID'leri.
+    """
+    if tur == 'ekstre':
+        if musteri_idler is not None:
+            return list(musteri_idler)
+        return db.donem_musterileri(baslangic, bitis)
+    if tur == 'siparis':
+        return db.donem_siparisleri(baslangic, bitis, musteri_idler)
+    raise ValueError(f"Bilinmeyen belge türü: {tur}")
+
+
+def belgeleri_uret(db: Database, tur: str, hedef_idler: Sequence[int], cikti_dizini: str,
+                   baslangic: Optional[str] = None, bitis: Optional[str] = None,
+                   isci_sayisi: Optional[int] = None,
+                   ilerleme: Optional[Callable[[int, int, BelgeSonucu], None]] = None) -> List[BelgeSonucu]:
+    """
+    Belgeleri süreç havuzunda paralel olarak üretip cikti_dizini altına yazar.
+
+    PDF çizimi işlemci yoğun olduğundan her çekirdekte ayrı bir süreç çalışır;
+    her işçi veritabanını kendi bağlantısıyla okur. ilerleme her belge bittiğinde
+    (tamamlanan, toplam, sonuç) ile çağrılır. Sonuçlar tamamlanma sırasıyla döner.
+    """
+    yazici = _YAZICILAR.get(tur)
+    if yazici is None:
+        raise ValueError(f"Bilinmeyen belge türü: {tur}")
+    os.makedirs(cikti_dizini, exist_ok=True)
+    if not hedef_idler:
+        return []
+
+    isci_sayisi = min(isci_sayisi or os.cpu_count() or 1, len(hedef_idler))
+    # spawn: işçiler ana sürecin açık bağlantılarını ve bakım iş parçacığını devralmaz
+    baglam = multiprocessing.get_context('spawn')
+    sonuclar = []
+    with ProcessPoolExecutor(max_workers=isci_sayisi, mp_context=baglam,
+                             initializer=_isci_baslat, initargs=(db.db_file, db.depolama)) as havuz:
+        gorevler = [havuz.submit(yazici, hedef_id, cikti_dizini, baslangic, bitis) for hedef_id in hedef_idler]
+        for gorev in as_completed(gorevler):
+            sonuc = gorev.result()
+            sonuclar.append(sonuc)
+            if ilerleme is not None:
+                ilerleme(len(sonuclar), len(gorevler), sonuc)
+    return sonuclar
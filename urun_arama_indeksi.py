@@ -0,0 +1,161 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from arama import kelimelere_ayir, turkce_katla
+from kayitlar import Urun
+
+# Ürün kodunu harf/rakam geçişlerinden böler: "U004321" -> "U", "004321"
+_KOD_PARCASI = re.compile(r'[^\W\d_]+|\d+')
+
+
+def _anahtar_kelimeler(urun: Urun) -> Tuple[str, ...]:
+    """
+    Ürünün önekle aranabilecek katlanmış kelimelerini döndürür.
+
+    Kodun tamamının yanında harf ve rakam grupları da ayrı kelime sayılır,
+    rakam gruplarının baştaki sıfırları atılmış hali de eklenir; böylece
+    "4321" araması "U004321" koduna ulaşır.
+    """
+    kelimeler = set(kelimelere_ayir(urun.ad))
+    for kod_kelimesi in kelimelere_ayir(urun.kod):
+        kelimeler.add(kod_kelimesi)
+        for parca in _KOD_PARCASI.findall(kod_kelimesi):
+            kelimeler.add(parca)
+            if parca.isdigit() and parca.lstrip('0'):
+                kelimeler.add(parca.lstrip('0'))
+    return tuple(sorted(kelimeler))
+
+
+class UrunAramaIndeksi:
+    """
+    Ürün kodu ve adı üzerinde bellekte tutulan önek dizini.
+
+    Tüm ürünlerin katlanmış kelimeleri sıralı bir dizide (kelime, ürün ID)
+    çiftleri olarak tutulur; bir önekin eşleşmeleri ikili aramayla bulunan
+    bitişik bir aralıktır. Çok kelimeli aramada en dar aralık taranır, diğer
+    kelimeler yalnızca aday ürünlerde denetlenir ve sonuç sınırına ulaşılınca
+    durulur. Böylece bir arama ürün sayısından bağımsız olarak mikrosaniyeler sürer.
+
+    Dizin bir kez yukle() ile doldurulur ve sonra ekle()/sil() ile güncellenir.
+    Yükleme sürerken gelen değişiklikler bekletilir ve yüklemeden sonra uygulanır.
+    """
+
+    def __init__(self) -> None:
+        self._kilit = threading.RLock()
+        self._urunler: Dict[int, Urun] = {}
+        self._urun_kelimeleri: Dict[int, Tuple[str, ...]] = {}
+        self._kelimeler: List[Tuple[str, int]] = []
+        self._kod_sirasi: List[Tuple[str, int]] = []
+        self._bekleyenler: Optional[List[Tuple[str, Any]]] = None
+        self.hazir = False
+
+    def __len__(self) -> int:
+        return len(self._urunler)
+
+    def yukle(self, urunleri_oku: Callable[[], Iterable[Urun]]) -> None:
+        """
+        Dizini urunleri_oku() ile okunan ürünlerle baştan kurar.
+
+        Okuma sırasında ekle()/sil() ile gelen değişiklikler biriktirilir ve
+        dizin kurulduktan sonra sırayla uygulanır; böylece hiçbir değişiklik kaybolmaz.
+        """
+        with self._kilit:
+            self._bekleyenler = []
+        try:
+            urun_sozlugu = {urun.id: urun for urun in urunleri_oku()}
+        except BaseException:
+            with self._kilit:
+                self._bekleyenler = None
+            raise
+        urun_kelimeleri = {urun_id: _anahtar_kelimeler(urun) for urun_id, urun in urun_sozlugu.items()}
+        kelimeler = sorted((kelime, urun_id) for urun_id, kelime_listesi in urun_kelimeleri.items()
+                           for kelime in kelime_listesi)
+        kod_sirasi = sorted((turkce_katla(urun.kod), urun_id) for urun_id, urun in urun_sozlugu.items())
+
+        with self._kilit:
+            self._urunler = urun_sozlugu
+            self._urun_kelimeleri = urun_kelimeleri
+            self._kelimeler = kelimeler
+            self._kod_sirasi = kod_sirasi
+            bekleyenler, self._bekleyenler = self._bekleyenler, None
+            for islem, deger in bekleyenler:
+                if islem == 'ekle':
+                    self._ekle(deger)
+                else:
+                    self._sil(deger)
+            self.hazir = True
+
+    def ekle(self, urun: Urun) -> None:
+        """
+        Ürünü dizine ekler; aynı ID'li ürün varsa yerine koyar.
+        """
+        with self._kilit:
+            if self._bekleyenler is not None:
+                self._bekleyenler.append(('ekle', urun))
+            elif self.hazir:
+                self._ekle(urun)
+
+    def sil(self, urun_id: int) -> None:
+        with self._kilit:
+            if self._bekleyenler is not None:
+                self._bekleyenler.append(('sil', urun_id))
+            elif self.hazir:
+                self._sil(urun_id)
+
+    def _ekle(self, urun: Urun) -> None:
+        urun_id = urun.id
+        self._sil(urun_id)
+        kelimeler = _anahtar_kelimeler(urun)
+        self._urunler[urun_id] = urun
+        self._urun_kelimeleri[urun_id] = kelimeler
+        for kelime in kelimeler:
+            insort(self._kelimeler, (kelime, urun_id))
+        insort(self._kod_sirasi, (turkce_katla(urun.kod), urun_id))
+
+    def _sil(self, urun_id: int) -> None:
+        urun = self._urunler.pop(urun_id, None)
+        if urun is None:
+            return
+        for kelime in self._urun_kelimeleri.pop(urun_id):
+            del self._kelimeler[bisect_left(self._kelimeler, (kelime, urun_id))]
+        del self._kod_sirasi[bisect_left(self._kod_sirasi, (turkce_katla(urun.kod), urun_id))]
+
+    def _aralik(self, onek: str) -> Tuple[int, int]:
+        """
+        Öneki taşıyan kelimelerin sıralı dizideki [baş, son) aralığını döndürür.
+        """
+        bas = bisect_left(self._kelimeler, (onek,))
+        son = bisect_left(self._kelimeler, (onek + '\U0010ffff',), bas)
+        return bas, son
+
+    def ara(self, arama_metni: str, limit: int = 200) -> List[Urun]:
+        """
+        Her kelimesi ürünün kod veya ad kelimelerinden birinin öneki olan ürünleri döndürür.
+        Arama boşsa ilk ürünler koda göre sıralı döner.
+        """
+        onekler = kelimelere_ayir(arama_metni)
+        with self._kilit:
+            if not onekler:
+                return [self._urunler[urun_id] for _, urun_id in self._kod_sirasi[:limit]]
+
+            # En az kelimeyle eşleşen önek taranır, diğerleri adaylarda denetlenir
+            araliklar = sorted(((self._aralik(onek), onek) for onek in set(onekler)),
+                               key=lambda a: a[0][1] - a[0][0])
+            (bas, son), _ = araliklar[0]
+            digerleri = [onek for _, onek in araliklar[1:]]
+
+            sonuclar = []
+            gorulenler: Set[int] = set()
+            for i in range(bas, son):
+                urun_id = self._kelimeler[i][1]
+                if urun_id in gorulenler:
+                    continue
+                gorulenler.add(urun_id)
+                kelimeler = self._urun_kelimeleri[urun_id]
+                if all(any(kelime.startswith(onek) for kelime in kelimeler) for onek in digerleri):
+                    sonuclar.append(self._urunler[urun_id])
+                    if len(sonuclar) >= limit:
+                        break
+            return sonuclar
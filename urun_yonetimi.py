@@ -2,13 +2,17 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QTableWidget, QTableWidgetItem, QLineEdit, 
                            QFormLayout, QMessageBox, QComboBox, QLabel,
                            QDoubleSpinBox, QSpinBox, QDialog)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+from arama import ARAMA_GECIKMESI_MS
 import sqlite3
+from sorgu_yurutucu import SorguYurutucu
 
 class UrunYonetimi(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        self.yurutucu = SorguYurutucu(self.db, self)
+        self._yukleme_yarim_kaldi = False
         self.urun_arayuzu_olustur()
         self.tabloyu_guncelle()
         
@@ -22,7 +26,12 @@ class UrunYonetimi(QWidget):
         # Arama kutusu
         self.arama_kutusu = QLineEdit()
         self.arama_kutusu.setPlaceholderText("Ürün Ara...")
-        self.arama_kutusu.textChanged.connect(self.urun_ara)
+        # Her tuşta değil, yazma durunca aranır
+        self.arama_zamanlayicisi = QTimer(self)
+        self.arama_zamanlayicisi.setSingleShot(True)
+        self.arama_zamanlayicisi.setInterval(ARAMA_GECIKMESI_MS)
+        self.arama_zamanlayicisi.timeout.connect(self.tabloyu_guncelle)
+        self.arama_kutusu.textChanged.connect(self.arama_zamanlayicisi.start)
         ust_duzen.addWidget(self.arama_kutusu)
         
         # Butonlar
@@ -53,19 +62,44 @@ class UrunYonetimi(QWidget):
         self.setLayout(ana_duzen)
     
     def tabloyu_guncelle(self):
+        """Ürünleri arka planda yükler; sonuç gelince tablo doldurulur"""
+        self._yukleme_yarim_kaldi = False
+        arama_metni = self.arama_kutusu.text().strip()
+        if arama_metni:
+            # Yalnızca en iyi eşleşmeler yüklenir
+            self.yurutucu.calistir('tablo', self.db.urun_ara, arama_metni,
+                                   tamamlandi=self.tabloyu_doldur, hata=self.yukleme_hatasi)
+        else:
+            self.yurutucu.calistir('tablo', self.db.urunleri_getir,
+                                   tamamlandi=self.tabloyu_doldur, hata=self.yukleme_hatasi)
+
+    def tabloyu_doldur(self, urunler):
         self.tablo.setRowCount(0)
-        urunler = self.db.urunleri_getir()
-        
         for urun in urunler:
             satir = self.tablo.rowCount()
             self.tablo.insertRow(satir)
             
-            self.tablo.setItem(satir, 0, QTableWidgetItem(urun['kod']))
-            self.tablo.setItem(satir, 1, QTableWidgetItem(urun['ad']))
-            self.tablo.setItem(satir, 2, QTableWidgetItem(f"{urun['fiyat']:.2f} ₺"))
+            self.tablo.setItem(satir, 0, QTableWidgetItem(urun.kod))
+            self.tablo.setItem(satir, 1, QTableWidgetItem(urun.ad))
+            self.tablo.setItem(satir, 2, QTableWidgetItem(f"{urun.fiyat:.2f} ₺"))
             
-            # Ürün verisini satırda sakla
+            # Ürün kaydını satırda sakla
             self.tablo.item(satir, 0).setData(Qt.ItemDataRole.UserRole, urun)
+
+    def yukleme_hatasi(self, hata):
+        QMessageBox.critical(self, "Hata", f"Ürünler yüklenirken bir hata oluştu:\n{str(hata)}")
+
+    def hideEvent(self, event):
+        # Sekme değiştirilince yarım kalan yükleme iptal edilir, sekmeye dönünce yenilenir
+        if self.yurutucu.bekliyor('tablo'):
+            self.yurutucu.iptal_et('tablo')
+            self._yukleme_yarim_kaldi = True
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._yukleme_yarim_kaldi:
+            self.tabloyu_guncelle()
     
     def yeni_urun_formu(self):
         self.urun_form = UrunFormu(parent=self)
@@ -74,8 +108,7 @@ class UrunYonetimi(QWidget):
     def urun_duzenle(self):
         secili_satir = self.tablo.currentRow()
         if secili_satir >= 0:
-            urun_id = int(self.tablo.item(secili_satir, 0).text())
-            urun = next((u for u in self.db.urunleri_getir() if u['id'] == urun_id), None)
+            urun = self.tablo.item(secili_satir, 0).data(Qt.ItemDataRole.UserRole)
             if urun:
                 self.urun_form = UrunFormu(parent=self, urun=urun)
                 self.urun_form.show()
@@ -86,12 +119,12 @@ class UrunYonetimi(QWidget):
         secili_satir = self.tablo.currentRow()
         if secili_satir >= 0:
             try:
-                # UserRole'den ürün verisini al
-                urun_verisi = self.tablo.item(secili_satir, 0).data(Qt.ItemDataRole.UserRole)
-                if not urun_verisi or 'id' not in urun_verisi:
+                # UserRole'den ürün kaydını al
+                urun = self.tablo.item(secili_satir, 0).data(Qt.ItemDataRole.UserRole)
+                if urun is None:
                     raise ValueError("Ürün verisi bulunamadı")
                 
-                urun_id = urun_verisi['id']  # Ürün ID'sini al
+                urun_id = urun.id
                 
                 cevap = QMessageBox.question(
                     self,
@@ -101,9 +134,10 @@ class UrunYonetimi(QWidget):
                 )
                 
                 if cevap == QMessageBox.StandardButton.Yes:
-                    self.db.urun_sil(urun_id)
-                    self.tabloyu_guncelle()
-                    QMessageBox.information(self, "Başarılı", "Ürün başarıyla silindi.")
+                    self.yurutucu.calistir(
+                        f'sil-{urun_id}', self.db.urun_sil, urun_id,
+                        tamamlandi=self.urun_silindi, hata=self.silme_hatasi
+                    )
                     
             except ValueError as e:
                 QMessageBox.warning(self, "Uyarı", f"Ürün silinemedi: {str(e)}")
@@ -112,15 +146,12 @@ class UrunYonetimi(QWidget):
         else:
             QMessageBox.warning(self, "Uyarı", "Lütfen silinecek ürünü seçin!")
 
-    def urun_ara(self, arama_metni):
-        for i in range(self.tablo.rowCount()):
-            satir_gizle = True
-            for j in range(self.tablo.columnCount()):
-                item = self.tablo.item(i, j)
-                if item and arama_metni.lower() in item.text().lower():
-                    satir_gizle = False
-                    break
-            self.tablo.setRowHidden(i, satir_gizle)
+    def urun_silindi(self, _):
+        self.tabloyu_guncelle()
+        QMessageBox.information(self, "Başarılı", "Ürün başarıyla silindi.")
+
+    def silme_hatasi(self, hata):
+        QMessageBox.critical(self, "Hata", f"Ürün silinirken bir hata oluştu:\n{str(hata)}")
 
 class UrunFormu(QDialog):
     def __init__(self, parent=None, urun=None):
@@ -147,9 +178,9 @@ class UrunFormu(QDialog):
         
         # Eğer düzenleme modundaysa mevcut bilgileri doldur
         if self.urun:
-            self.kod_input.setText(self.urun['kod'])
-            self.ad_input.setText(self.urun['ad'])
-            self.fiyat_input.setValue(float(self.urun['fiyat']))
+            self.kod_input.setText(self.urun.kod)
+            self.ad_input.setText(self.urun.ad)
+            self.fiyat_input.setValue(float(self.urun.fiyat))
         
         # Kaydet butonu
         self.kaydet_butonu = QPushButton("Kaydet")
@@ -173,7 +204,7 @@ class UrunFormu(QDialog):
         
         try:
             if self.urun:  # Düzenleme modu
-                self.parent.db.urun_guncelle(self.urun['id'], urun_bilgileri)
+                self.parent.db.urun_guncelle(self.urun.id, urun_bilgileri)
             else:  # Yeni ürün modu
                 self.parent.db.urun_ekle(urun_bilgileri)
             
@@ -0,0 +1,326 @@
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from arsiv import arsivleri_bul
+
+logger = logging.getLogger(__name__)
+
+# Yedekleme ayarları; ayarlar.json içindeki "yedekleme" bölümüyle değiştirilebilir.
+# Aralık saniye cinsindendir; 0 verilirse zamanlayıcı yedek almaz.
+YEDEKLEME_VARSAYILANLARI: Dict[str, Any] = {
+    'aralik': 6 * 3600,
+    'dizin': "yedekler",
+    'saklanacak': 14,          # en fazla tutulacak yedek sayısı
+    'adim_sayfa': 1024,        # backup() adımı başına kopyalanan sayfa (4 KiB sayfada 4 MB)
+    'adim_beklemesi': 0.005,   # adımlar arasında saniye; diske yazan diğer işlere pay bırakır
+    'tam_dogrulama': False,    # True: integrity_check, False: quick_check
+}
+
+YEDEK_ZAMAN_BICIMI = "%Y%m%d_%H%M%S"
+_GECICI_EK = ".tmp"
+# Geri alma günlüğü kipinde yeniden başlayan kopyanın adımı bu sınırdan sonra tek adıma çıkar
+_TEK_ADIM_SINIRI = 64 * 1024
+
+
+class YedekSonucu(NamedTuple):
+    dizin: str
+    boyut: int
+    sure: float
+
+
+class YedekIptalEdildi(Exception):
+    pass
+
+
+class _YedekYenidenBasladi(Exception):
+    pass
+
+
+def yedekleme_ayarlari(ayarlar: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ayarlar.json içeriğindeki "yedekleme" bölümünü varsayılanlarla birleştirir.
+
+    Örnek: {"yedekleme": {"aralik": 3600, "dizin": "D:/yedekler", "saklanacak": 48}}
+    """
+    yedekleme = dict(YEDEKLEME_VARSAYILANLARI)
+    for anahtar, deger in ayarlar.get('yedekleme', {}).items():
+        if anahtar not in yedekleme:
+            raise ValueError(f"Bilinmeyen yedekleme ayarı: {anahtar}")
+        yedekleme[anahtar] = deger
+    return yedekleme
+
+
+def yedekleri_listele(db_file: str, yedek_dizini: str) -> List[str]:
+    """
+    Veritabanına ait tamamlanmış yedek dizinlerini eskiden yeniye döndürür.
+    """
+    if not os.path.isdir(yedek_dizini):
+        return []
+    onek = os.path.splitext(os.path.basename(db_file))[0] + "_"
+    yedekler = []
+    for ad in os.listdir(yedek_dizini):
+        if ad.startswith(onek) and yedek_zamani(ad) is not None:
+            yedekler.append(os.path.join(yedek_dizini, ad))
+    return sorted(yedekler)
+
+
+def yedek_zamani(yedek: str) -> Optional[datetime]:
+    """
+    Yedek dizininin adındaki zaman damgasını döndürür; yedek dizini değilse None.
+    """
+    try:
+        return datetime.strptime("_".join(os.path.basename(yedek).rsplit("_", 2)[-2:]), YEDEK_ZAMAN_BICIMI)
+    except ValueError:
+        return None
+
+
+def _dosyayi_yedekle(kaynak_yolu: str, hedef_yolu: str, adim_sayfa: int, adim_beklemesi: float,
+                     iptal: Optional[threading.Event]) -> None:
+    """
+    Dosyayı backup() ile adım adım kopyalar.
+
+    WAL kipinde kaynakta bir okuma işlemi açık tutulur: adımlar aynı anlık görüntüyü
+    okur, araya giren yazmalar kopyayı baştan başlatmaz ve yazanlar beklemez.
+    Geri alma günlüğü kipinde okuma kilidi yazanları durduracağı için tutulmaz;
+    araya giren her yazma kopyayı baştan başlatır. Sürekli yazılan bir dosyada
+    kopya hiç bitmeyebileceğinden her yeniden başlamada adım büyütülür; en kötü
+    durumda dosya tek adımda, yazanlar kısa bir süre bekletilerek kopyalanır.
+    """
+    kaynak = sqlite3.connect(kaynak_yolu, isolation_level=None)
+    hedef = sqlite3.connect(hedef_yolu)
+    try:
+        kaynak.execute("PRAGMA busy_timeout = 5000")
+        if kaynak.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal':
+            kaynak.execute("BEGIN")
+            kaynak.execute("SELECT COUNT(*) FROM sqlite_schema").fetchone()
+
+        while True:
+            onceki_kalan = None
+
+            def ilerleme(durum: int, kalan: int, toplam: int) -> None:
+                nonlocal onceki_kalan
+                if iptal is not None and iptal.is_set():
+                    raise YedekIptalEdildi()
+                if onceki_kalan is not None and kalan > onceki_kalan:
+                    raise _YedekYenidenBasladi()
+                onceki_kalan = kalan
+                if adim_beklemesi:
+                    time.sleep(adim_beklemesi)
+
+            try:
+                kaynak.backup(hedef, pages=adim_sayfa, progress=ilerleme)
+                break
+            except _YedekYenidenBasladi:
+                adim_sayfa = adim_sayfa * 8 if adim_sayfa < _TEK_ADIM_SINIRI else -1
+        if kaynak.in_transaction:
+            kaynak.rollback()
+        # Yedek tek dosya olarak taşınabilsin diye WAL kipinden çıkarılır
+        hedef.execute("PRAGMA journal_mode = DELETE").fetchone()
+    finally:
+        hedef.close()
+        kaynak.close()
+
+
+def yedegi_dogrula(yedek: str, tam: bool = False) -> List[str]:
+    """
+    Yedek dizinindeki her veritabanı dosyasını denetler ve bulunan sorunları döndürür.
+    Boş liste yedeğin sağlam olduğunu gösterir.
+    """
+    denetim = "integrity_check" if tam else "quick_check"
+    sorunlar = []
+    for ad in sorted(os.listdir(yedek)):
+        if not ad.endswith(".db"):
+            continue
+        conn = sqlite3.connect(f"file:{os.path.join(yedek, ad)}?mode=ro", uri=True)
+        try:
+            sonuc = [satir[0] for satir in conn.execute(f"PRAGMA {denetim}")]
+        except sqlite3.DatabaseError as e:
+            sonuc = [str(e)]
+        finally:
+            conn.close()
+        if sonuc != ['ok']:
+            sorunlar.extend(f"{ad}: {satir}" for satir in sonuc)
+    return sorunlar
+
+
+def _arsivleri_kilitle(arsivler: Dict[str, str]) -> Optional[sqlite3.Connection]:
+    """
+    Arşiv dosyalarının yazma kilidini alır ve kilidi tutan bağlantıyı döndürür.
+
+    Arşivlere yalnızca arşivleme yazar; kilit tutulduğu sürece siparişler ana
+    dosyadan arşive taşınamaz ve ayrı ayrı kopyalanan dosyalar aynı sipariş
+    kümesini taşır. Sipariş girişi ana dosyaya yazdığı için beklemez.
+    """
+    if not arsivler:
+        return None
+    # Arşiv sayısı sınırlı olduğundan (bkz. arsiv.YILLIK_ARSIV_SINIRI) tümü tek bağlantıya eklenebilir
+    yollar = list(arsivler.values())
+    conn = sqlite3.connect(yollar[0], isolation_level=None)
+    try:
+        conn.execute("PRAGMA busy_timeout = 5000")
+        for sira, yol in enumerate(yollar[1:]):
+            conn.execute(f"ATTACH DATABASE ? AS kilit_{sira}", (yol,))
+        # BEGIN IMMEDIATE bağlı tüm dosyaların yazma kilidini alır
+        conn.execute("BEGIN IMMEDIATE")
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def yedek_al(db_file: str, yedek_dizini: str, adim_sayfa: int = 1024, adim_beklemesi: float = 0.0,
+             tam_dogrulama: bool = False, saklanacak: Optional[int] = None,
+             iptal: Optional[threading.Event] = None) -> YedekSonucu:
+    """
+    Veritabanının ve arşiv dosyalarının anlık yedeğini yedek_dizini altında
+    zaman damgalı bir dizine alır, yedeği doğrular ve eski yedekleri temizler.
+
+    Yedek geçici bir dizine yazılır ve yalnızca doğrulandıktan sonra adlandırılır;
+    yarım ya da bozuk yedek hiçbir zaman tamamlanmış görünmez. Kopya süresince
+    arşivleme bekletilir (bkz. _arsivleri_kilitle); bu sırada yeni bir arşiv
+    dosyası oluşturulduysa yedek tutarlı sayılmaz ve hata verilir.
+    """
+    baslangic = time.perf_counter()
+    os.makedirs(yedek_dizini, exist_ok=True)
+    ad = f"{os.path.splitext(os.path.basename(db_file))[0]}_{datetime.now().strftime(YEDEK_ZAMAN_BICIMI)}"
+    hedef = os.path.join(yedek_dizini, ad)
+    gecici = hedef + _GECICI_EK
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+    try:
+        arsivler = arsivleri_bul(db_file)
+        kilit = _arsivleri_kilitle(arsivler)
+        try:
+            for kaynak_yolu in [db_file, *arsivler.values()]:
+                _dosyayi_yedekle(kaynak_yolu, os.path.join(gecici, os.path.basename(kaynak_yolu)),
+                                 adim_sayfa, adim_beklemesi, iptal)
+        finally:
+            if kilit is not None:
+                kilit.close()
+        if arsivleri_bul(db_file) != arsivler:
+            raise sqlite3.OperationalError("Yedek sırasında yeni bir arşiv oluşturuldu; yedek yeniden alınmalı")
+        sorunlar = yedegi_dogrula(gecici, tam_dogrulama)
+        if sorunlar:
+            raise sqlite3.DatabaseError("Yedek doğrulanamadı: " + "; ".join(sorunlar[:5]))
+        os.rename(gecici, hedef)
+    except BaseException:
+        shutil.rmtree(gecici, ignore_errors=True)
+        raise
+
+    boyut = sum(os.path.getsize(os.path.join(hedef, ad)) for ad in os.listdir(hedef))
+    if saklanacak:
+        for eski in yedekleri_listele(db_file, yedek_dizini)[:-saklanacak]:
+            shutil.rmtree(eski, ignore_errors=True)
+    return YedekSonucu(hedef, boyut, time.perf_counter() - baslangic)
+
+
+def yedekten_geri_yukle(yedek: str, db_file: str) -> List[str]:
+    """
+    Yedeği doğruladıktan sonra veritabanına ve arşivlere geri yükler; yüklenen dosyaları döndürür.
+
+    Dosyalar backup() ile yazılır. Yedekte olmayan (yedekten sonra oluşturulmuş)
+    arşivler, geri yüklenen siparişlerle çakışmasın diye ".geri_yukleme_oncesi"
+    ekiyle kenara alınır. Dosyalardan biri açıksa (bkz. _kullanimda_mi) hiçbir
+    dosyaya dokunulmadan hata verilir.
+    """
+    sorunlar = yedegi_dogrula(yedek, tam=True)
+    if sorunlar:
+        raise sqlite3.DatabaseError("Yedek bozuk, geri yüklenmedi: " + "; ".join(sorunlar[:5]))
+    for yol in [db_file, *arsivleri_bul(db_file).values()]:
+        neden = _kullanimda_mi(yol)
+        if neden:
+            raise sqlite3.OperationalError(f"{yol} kullanımda ({neden}); uygulamayı kapatıp yeniden deneyin")
+
+    ana_ad = os.path.basename(db_file)
+    dosyalar = sorted(ad for ad in os.listdir(yedek) if ad.endswith(".db"))
+    if ana_ad not in dosyalar:
+        raise ValueError(f"Yedekte {ana_ad} bulunamadı")
+    for arsiv in arsivleri_bul(db_file).values():
+        if os.path.basename(arsiv) not in dosyalar:
+            os.replace(arsiv, arsiv + ".geri_yukleme_oncesi")
+
+    hedef_dizini = os.path.dirname(os.path.abspath(db_file))
+    yuklenenler = []
+    for ad in dosyalar:
+        hedef_yolu = db_file if ad == ana_ad else os.path.join(hedef_dizini, ad)
+        kaynak = sqlite3.connect(f"file:{os.path.join(yedek, ad)}?mode=ro", uri=True)
+        hedef = sqlite3.connect(hedef_yolu)
+        try:
+            kaynak.backup(hedef)
+        finally:
+            hedef.close()
+            kaynak.close()
+        yuklenenler.append(hedef_yolu)
+    return yuklenenler
+
+
+def _kullanimda_mi(yol: str) -> Optional[str]:
+    """
+    Dosyanın başka bir bağlantı tarafından açık olup olmadığını denetler; açıksa nedenini döndürür.
+
+    WAL kipinde son bağlantı kapanınca -wal ve -shm dosyaları silinir; bunların
+    varlığı açık (ya da çökmüş) bir uygulama demektir. Geri alma günlüğü kipinde
+    kilit, özel kilit alınmaya çalışılarak denetlenir.
+    """
+    for ek in ("-wal", "-shm"):
+        if os.path.exists(yol + ek):
+            return f"{os.path.basename(yol)}{ek} dosyası var"
+    if not os.path.exists(yol):
+        return None
+    conn = sqlite3.connect(yol, isolation_level=None, timeout=0)
+    try:
+        conn.execute("BEGIN EXCLUSIVE")
+        conn.execute("ROLLBACK")
+    except sqlite3.OperationalError:
+        return "dosya kilitli"
+    finally:
+        conn.close()
+    return None
+
+
+class YedeklemeZamanlayicisi(threading.Thread):
+    """
+    Arka planda belirli aralıklarla çevrimiçi yedek alır.
+
+    Yedek, uygulamanın bağlantı havuzundan bağımsız bağlantılarla alınır;
+    sipariş girişi yedek sürerken beklemez. İlk yedek zamanı son yedeğin
+    zamanından hesaplanır, uygulama sık açılıp kapansa da aralık korunur.
+    """
+
+    def __init__(self, db_file: str, ayarlar: Dict[str, Any]) -> None:
+        super().__init__(name="YedeklemeZamanlayicisi", daemon=True)
+        self.db_file = db_file
+        self.ayarlar = ayarlar
+        self._durdur = threading.Event()
+
+    def _son_yedek_zamani(self) -> float:
+        yedekler = yedekleri_listele(self.db_file, self.ayarlar['dizin'])
+        return yedek_zamani(yedekler[-1]).timestamp() if yedekler else 0.0
+
+    def run(self) -> None:
+        aralik = self.ayarlar['aralik']
+        if not aralik:
+            return
+        sonraki = self._son_yedek_zamani() + aralik
+        while not self._durdur.wait(max(0.0, sonraki - time.time())):
+            try:
+                sonuc = yedek_al(self.db_file, self.ayarlar['dizin'], self.ayarlar['adim_sayfa'],
+                                 self.ayarlar['adim_beklemesi'], self.ayarlar['tam_dogrulama'],
+                                 self.ayarlar['saklanacak'], self._durdur)
+                logger.info("Veritabanı yedeği alındı: %s (%.1f sn)", sonuc.dizin, sonuc.sure)
+            except YedekIptalEdildi:
+                return
+            except Exception:
+                logger.exception("Veritabanı yedekleme hatası")
+            sonraki = time.time() + aralik
+
+    def durdur(self) -> None:
+        self._durdur.set()
+        if self.is_alive():
+            self.join()